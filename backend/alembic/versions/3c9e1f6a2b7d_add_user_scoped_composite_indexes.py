@@ -0,0 +1,57 @@
+"""Add user-scoped composite indexes
+
+Revision ID: 3c9e1f6a2b7d
+Revises: aa858b1e9552
+Create Date: 2026-10-19 10:12:04.512331
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1f6a2b7d'
+down_revision: Union[str, None] = 'aa858b1e9552'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns) matching the hot per-user route queries.
+INDEXES = [
+    # list_notes: WHERE user_id = ? ORDER BY updated_at DESC
+    ('ix_notes_user_id_updated_at', 'notes', ['user_id', sa.text('updated_at DESC')]),
+    # list_attempts: WHERE user_id = ? ORDER BY created_at DESC
+    ('ix_problem_attempts_user_id_created_at', 'problem_attempts', ['user_id', sa.text('created_at DESC')]),
+    # flash card generation: WHERE user_id = ? ORDER BY passed ASC, created_at DESC
+    ('ix_problem_attempts_user_id_passed_created_at', 'problem_attempts', ['user_id', 'passed', sa.text('created_at DESC')]),
+    # get_saved_flash_cards: WHERE user_id = ? ORDER BY created_at DESC
+    ('ix_saved_flashcards_user_id_created_at', 'saved_flashcards', ['user_id', sa.text('created_at DESC')]),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, and
+    # the app's create_all() may already have built the indexes on startup.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,66 @@
+"""Add full-text search vectors to notes and problems
+
+Revision ID: 5d2a8c4e9f13
+Revises: 3c9e1f6a2b7d
+Create Date: 2026-10-19 11:02:37.180244
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a8c4e9f13'
+down_revision: Union[str, None] = '3c9e1f6a2b7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Snapshot of the generated column expressions in app.models at this revision.
+NOTE_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(jsonb_to_tsvector('english', "
+    "jsonb_path_query_array(content, 'strict $.** ? (@.\"type\" == \"text\").\"text\"'), "
+    "'[\"string\"]'), 'B')"
+)
+PROBLEM_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(statement, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    # Stored generated columns: Postgres keeps them current on every write.
+    op.add_column('notes', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(NOTE_SEARCH_VECTOR_SQL, persisted=True),
+        nullable=True,
+    ))
+    op.add_column('problems', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(PROBLEM_SEARCH_VECTOR_SQL, persisted=True),
+        nullable=True,
+    ))
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_notes_search_vector', 'notes', ['search_vector'],
+            postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_problems_search_vector', 'problems', ['search_vector'],
+            postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_problems_search_vector', table_name='problems', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_notes_search_vector', table_name='notes', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('problems', 'search_vector')
+    op.drop_column('notes', 'search_vector')
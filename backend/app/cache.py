@@ -0,0 +1,126 @@
+"""In-process caching utilities.
+
+This module provides a small bounded LRU mapping used by services to keep
+hot results in memory in front of slower stores (Postgres, LLM calls), and a
+variant bounded by total size with per-entry expiry.
+"""
+
+# Built-In Imports.
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """A size-bounded least-recently-used cache.
+
+    Not thread-safe; intended for use from a single asyncio event loop.
+
+    Attributes:
+        maxsize: Maximum number of entries kept before evicting the oldest.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[K, V]" = OrderedDict()
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value and mark it as recently used, or None."""
+        if key not in self._data:
+            return None
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def set(self, key: K, value: V) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> Optional[V]:
+        """Remove and return a value, or None if absent."""
+        return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._data.clear()
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TTLByteLRUCache(Generic[K, V]):
+    """An LRU cache bounded by the total size of its values, with expiry.
+
+    Entries expire ``ttl`` seconds after they are stored. When the summed
+    size (as reported by ``sizeof``) exceeds ``maxbytes``, the least recently
+    used entries are evicted. A value larger than ``maxbytes`` is not stored.
+    Not thread-safe; intended for use from a single asyncio event loop.
+
+    Attributes:
+        maxbytes: Maximum total size of the cached values.
+        ttl: Seconds an entry stays valid after it is stored.
+    """
+
+    def __init__(self, maxbytes: int, ttl: float, sizeof: Callable[[V], int]) -> None:
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._bytes = 0
+        # key -> (expires_at on the monotonic clock, size, value)
+        self._data: "OrderedDict[K, Tuple[float, int, V]]" = OrderedDict()
+
+    def get(self, key: K) -> Optional[V]:
+        """Return an unexpired value and mark it as recently used, or None."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self.pop(key)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Store a value, evicting least recently used entries to fit."""
+        self.pop(key)
+        size = self._sizeof(value)
+        if size > self.maxbytes:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, size, value)
+        self._bytes += size
+        while self._bytes > self.maxbytes:
+            _, (_, evicted_size, _) = self._data.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def pop(self, key: K) -> Optional[V]:
+        """Remove and return a value, or None if absent."""
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return None
+        self._bytes -= entry[1]
+        return entry[2]
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._data.clear()
+        self._bytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the cached values."""
+        return self._bytes
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -5,6 +5,9 @@ parsing using Pydantic Settings. It provides a centralized configuration
 object for database credentials, security keys, and JWT settings.
 """
 
+# Built-In Imports.
+from typing import Dict, List
+
 # External Imports.
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -35,6 +38,42 @@ class Settings(BaseSettings):
     # Optional: Cerebras API key and model for AI code review (set in .env).
     CEREBRAS_API_KEY: str = ""
     CEREBRAS_MODEL: str = "qwen-3-235b-a22b-instruct-2507"
+    # Shared LLM HTTP pool: timeouts in seconds and connection limits.
+    LLM_CONNECT_TIMEOUT: float = 5.0
+    LLM_READ_TIMEOUT: float = 60.0
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    # Candidate models per AI task (JSON in .env), e.g.
+    # {"ai_review": ["qwen-3-235b-a22b-instruct-2507", "llama-3.3-70b"]}.
+    # "ai_review_stream" falls back to the "ai_review" entry; other tasks
+    # without an entry use CEREBRAS_MODEL. LLM_MODEL_QUALITY overrides
+    # the built-in quality scores checked against each task's floor.
+    LLM_TASK_MODELS: Dict[str, List[str]] = {}
+    LLM_MODEL_QUALITY: Dict[str, int] = {}
+    # Upstream LLM requests in flight per process, and the circuit breaker
+    # (consecutive failures to open, seconds before a trial call).
+    LLM_MAX_CONCURRENT_CALLS: int = 16
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    # Tavily search API: key, base URL (point at a local stub in tests),
+    # timeouts in seconds, retries and response size limit.
+    TAVILY_API_KEY: str = ""
+    TAVILY_BASE_URL: str = "https://api.tavily.com"
+    TAVILY_CONNECT_TIMEOUT: float = 5.0
+    TAVILY_READ_TIMEOUT: float = 20.0
+    TAVILY_MAX_RETRIES: int = 2
+    TAVILY_MAX_RESPONSE_BYTES: int = 5_000_000
+    # AI code review cache (Postgres, shared by all workers).
+    AI_REVIEW_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    AI_REVIEW_CACHE_MAX_ENTRIES: int = 10_000
+    # Ingested problem content per URL, shared by all users.
+    PROBLEM_INGESTION_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    # Opt-in cache of successful POST /execute results, keyed by language,
+    # code, stdin, limits and toolchain version. Only enable it if programs
+    # are deterministic; requests can still opt out with "cache": false.
+    EXECUTION_CACHE_ENABLED: bool = False
+    EXECUTION_CACHE_TTL_SECONDS: int = 3600
+    EXECUTION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
     # Allowed frontend domains for CORS (can be comma-separated in .env)
     FRONTEND_URLS: str = "http://localhost:5173,https://online-judge-bice.vercel.app"
 
@@ -5,9 +5,10 @@ and defines the declarative base for the application's ORM models.
 """
 
 # Built-In Imports.
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Sequence, TypeVar
 
 # External Imports.
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
@@ -49,3 +50,50 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     async with async_session() as session:
         yield session
+
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+
+async def insert_returning(db: AsyncSession, model: type[ModelT], **values: Any) -> ModelT:
+    """Inserts a single row and returns it as a loaded ORM instance.
+
+    Uses ``INSERT ... RETURNING`` so server-generated values (ids, defaults
+    such as ``created_at``) come back with the insert itself, replacing the
+    ``add()`` / ``commit()`` / ``refresh()`` pattern and its extra SELECT.
+    The caller still commits.
+
+    Args:
+        db: The asynchronous database session.
+        model: The ORM model class to insert into.
+        **values: Column values for the new row.
+
+    Returns:
+        The inserted row as an instance of ``model``, attached to the session.
+    """
+    result = await db.execute(insert(model).values(**values).returning(model))
+    return result.scalar_one()
+
+
+async def insert_many_returning_ids(
+    db: AsyncSession, model: type[Base], rows: Sequence[dict[str, Any]]
+) -> list[int]:
+    """Inserts many rows in one multi-row statement and returns their ids.
+
+    SQLAlchemy renders the batch as a single ``INSERT ... VALUES (...), (...)
+    RETURNING id`` (split only past the driver's parameter limit), and
+    ``sort_by_parameter_order`` guarantees the ids line up with ``rows``.
+    The caller still commits, so the whole batch shares one transaction.
+
+    Args:
+        db: The asynchronous database session.
+        model: The ORM model class to insert into.
+        rows: Column values for each new row.
+
+    Returns:
+        The primary keys of the inserted rows, in input order.
+    """
+    result = await db.execute(
+        insert(model).returning(model.id, sort_by_parameter_order=True), list(rows)
+    )
+    return list(result.scalars())
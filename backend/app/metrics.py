@@ -0,0 +1,119 @@
+"""In-process metrics registry.
+
+This module keeps simple labelled counters and latency histograms for the
+current worker process and exposes them as a JSON snapshot (see the
+``/metrics`` route). It has no external dependencies; each worker reports
+its own numbers.
+"""
+
+# Built-In Imports.
+import bisect
+from typing import Any, Dict, List, Tuple
+
+# Histogram bucket upper bounds in seconds, suited to network and LLM calls.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Turn keyword labels into a hashable, order-independent key."""
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Histogram:
+    """Cumulative bucketed histogram with count and sum.
+
+    Attributes:
+        buckets: Sorted bucket upper bounds.
+        counts: Observations per bucket, plus a final overflow bucket.
+        count: Total number of observations.
+        total: Sum of all observed values.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket containing it."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the histogram as plain data."""
+        cumulative, running = {}, 0
+        for bound, bucket_count in zip((*map(str, self.buckets), "+Inf"), self.counts):
+            running += bucket_count
+            cumulative[bound] = running
+        p50, p95 = self.quantile(0.5), self.quantile(0.95)
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            # JSON has no infinity; an overflow-bucket quantile is reported as null
+            "p50": p50 if p50 != float("inf") else None,
+            "p95": p95 if p95 != float("inf") else None,
+            "buckets": cumulative,
+        }
+
+
+_counters: Dict[str, Dict[LabelKey, float]] = {}
+_histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+
+
+def increment(name: str, value: float = 1, **labels: Any) -> None:
+    """Add to a labelled counter.
+
+    Args:
+        name: Metric name, e.g. ``llm_calls_total``.
+        value: Amount to add.
+        **labels: Label values identifying the series.
+    """
+    series = _counters.setdefault(name, {})
+    key = _label_key(labels)
+    series[key] = series.get(key, 0) + value
+
+
+def observe(name: str, value: float, **labels: Any) -> None:
+    """Record a value (usually seconds) in a labelled histogram."""
+    series = _histograms.setdefault(name, {})
+    key = _label_key(labels)
+    if key not in series:
+        series[key] = Histogram()
+    series[key].observe(value)
+
+
+def get_histogram(name: str, **labels: Any) -> Histogram | None:
+    """Return one histogram series, or None if nothing was observed yet."""
+    return _histograms.get(name, {}).get(_label_key(labels))
+
+
+def snapshot() -> Dict[str, Any]:
+    """Return every metric series as JSON-serializable data."""
+    return {
+        "counters": {
+            name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+            for name, series in _counters.items()
+        },
+        "histograms": {
+            name: [{"labels": dict(key), **hist.snapshot()} for key, hist in series.items()]
+            for name, series in _histograms.items()
+        },
+    }
@@ -8,14 +8,30 @@ which represents the 'users' table in the database.
 from typing import Optional
 
 # External Imports.
-from sqlalchemy import ForeignKey, Text, DateTime
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import ForeignKey, Text, DateTime, Index, Computed, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 # Local Imports.
 from .database import Base
 
+# JSONPath selecting every inline text run ({"type": "text", "text": ...}) in a
+# BlockNote document, at any nesting depth.
+NOTE_TEXT_JSONPATH: str = 'strict $.** ? (@."type" == "text")."text"'
+
+# Stored generated tsvector expressions. Postgres recomputes them on every
+# INSERT/UPDATE, so the GIN indexes never go stale.
+PROBLEM_SEARCH_VECTOR_SQL: str = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(statement, '')), 'B')"
+)
+NOTE_SEARCH_VECTOR_SQL: str = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(jsonb_to_tsvector('english', "
+    f"jsonb_path_query_array(content, '{NOTE_TEXT_JSONPATH}'), '[\"string\"]'), 'B')"
+)
+
 
 class User(Base):
     """SQLAlchemy model representing a user account.
@@ -68,6 +84,15 @@ class Problem(Base):
     # Relationship to the User model
     creator: Mapped["User"] = relationship(back_populates="problems")
 
+    # Full-text search document over title and statement (not loaded by default)
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, Computed(PROBLEM_SEARCH_VECTOR_SQL, persisted=True), deferred=True
+    )
+
+    __table_args__ = (
+        Index("ix_problems_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
 class Note(Base):
     """Represents a persisted note with BlockNote content."""
 
@@ -84,9 +109,38 @@ class Note(Base):
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    # Optimistic concurrency counter, bumped by the ORM on every UPDATE
+    version: Mapped[int] = mapped_column(nullable=False, server_default="1")
+
+    # Background problem ingestion: "pending", "complete" or "failed" for notes
+    # created from a problem URL, NULL for ordinary notes
+    ingestion_status: Mapped[Optional[str]] = mapped_column(nullable=True)
+    ingestion_url: Mapped[Optional[str]] = mapped_column(nullable=True)
+    # Version of the placeholder the ingestion fills; NULL for older rows
+    ingestion_base_version: Mapped[Optional[int]] = mapped_column(nullable=True)
+    # When a worker claimed the pending ingestion; expired claims are resumed
+    ingestion_claimed_at: Mapped[Optional[DateTime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
     # Relationship to the User model
     user: Mapped["User"] = relationship(back_populates="notes")
 
+    # Full-text search document over the title and text blocks (not loaded by default)
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, Computed(NOTE_SEARCH_VECTOR_SQL, persisted=True), deferred=True
+    )
+
+    __table_args__ = (
+        # Serves list_notes: WHERE user_id = ? ORDER BY updated_at DESC
+        Index("ix_notes_user_id_updated_at", "user_id", updated_at.desc()),
+        Index("ix_notes_search_vector", "search_vector", postgresql_using="gin"),
+        # Lets startup find ingestions interrupted by a restart
+        Index(
+            "ix_notes_ingestion_pending", "id",
+            postgresql_where=text("ingestion_status = 'pending'"),
+        ),
+    )
+    __mapper_args__ = {"version_id_col": version}
+
 
 class ProblemAttempt(Base):
     """Represents a user's attempt at solving a problem."""
@@ -119,6 +173,19 @@ class ProblemAttempt(Base):
     # Relationship to the User model
     user: Mapped["User"] = relationship(back_populates="attempts")
 
+    __table_args__ = (
+        # Serves list_attempts: WHERE user_id = ? ORDER BY created_at DESC
+        Index("ix_problem_attempts_user_id_created_at", "user_id", created_at.desc()),
+        # Serves flash card generation: WHERE user_id = ?
+        # ORDER BY passed ASC, created_at DESC LIMIT 10
+        Index(
+            "ix_problem_attempts_user_id_passed_created_at",
+            "user_id",
+            "passed",
+            created_at.desc(),
+        ),
+    )
+
 class SavedFlashCard(Base):
     """Represents a persisted flash card practice object."""
 
@@ -136,3 +203,160 @@ class SavedFlashCard(Base):
 
     # Relationship to the User model
     user: Mapped["User"] = relationship(back_populates="saved_flashcards")
+
+    __table_args__ = (
+        # Serves get_saved_flash_cards: WHERE user_id = ? ORDER BY created_at DESC
+        Index("ix_saved_flashcards_user_id_created_at", "user_id", created_at.desc()),
+    )
+
+
+class AITestSuite(Base):
+    """A cached AI-generated test suite (test cases, reference solution, harness).
+
+    Shared across users: the key is derived from the normalized problem
+    description, the language and the class/function signature detected in
+    the user code.
+    """
+
+    __tablename__ = "ai_test_suites"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # SHA-256 hex digest of the normalized generation inputs
+    cache_key: Mapped[str] = mapped_column(unique=True, index=True)
+
+    # GeneratedProblemTests payload as returned by the tester agent
+    suite: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    # SHA-256 of ``suite``; expected outputs are only merged into the suite they came from
+    suite_hash: Mapped[str] = mapped_column(nullable=False, server_default="")
+
+    # Reference-solution stdout per test input, filled in as runs complete
+    expected_outputs: Mapped[dict] = mapped_column(JSONB, nullable=False, server_default="{}")
+    model_name: Mapped[Optional[str]] = mapped_column(nullable=True)
+
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class AIReviewCache(Base):
+    """A cached AI code review, shared by every worker and user.
+
+    The key is derived from the normalized code, language, model and review
+    prompt version. Rows expire after a TTL and the table is size-bounded.
+    """
+
+    __tablename__ = "ai_review_cache"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # SHA-256 hex digest of the normalized review inputs
+    cache_key: Mapped[str] = mapped_column(unique=True, index=True)
+    code_review: Mapped[str] = mapped_column(Text, nullable=False)
+    model_name: Mapped[Optional[str]] = mapped_column(nullable=True)
+
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+    expires_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class DSACatalogProblem(Base):
+    """A practice problem learned from a DSA search result.
+
+    Every problem an AI search returns is kept here so later searches on the
+    same topic can be answered locally (see services/dsa_catalog.py).
+    """
+
+    __tablename__ = "dsa_catalog"
+    __table_args__ = (
+        # A problem can be returned under several topics; keep one row per pair.
+        UniqueConstraint("url", "topic", name="uq_dsa_catalog_url_topic"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # Normalized problem URL
+    url: Mapped[str] = mapped_column(index=True)
+    title: Mapped[str] = mapped_column()
+    difficulty: Mapped[str] = mapped_column()
+
+    # Topic of the search that returned the problem (e.g. "Graph Traversal")
+    topic: Mapped[str] = mapped_column()
+
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
+
+
+class ProblemIngestionCache(Base):
+    """Ingested problem content shared by every user importing the same URL.
+
+    Holds the BlockNote blocks generated from the Tavily search and LLM
+    formatting, without the per-note title heading and link.
+    """
+
+    __tablename__ = "problem_ingestion_cache"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # Normalized problem URL (see problem_ingestion.normalize_problem_url)
+    url: Mapped[str] = mapped_column(unique=True, index=True)
+    blocks: Mapped[list] = mapped_column(JSONB, nullable=False)
+    model_name: Mapped[Optional[str]] = mapped_column(nullable=True)
+
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    expires_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class GeneratedFlashCardSet(Base):
+    """A user's precomputed personalized flash cards.
+
+    Maintained in the background from failed attempts and served as-is by
+    GET /flash-cards/generate.
+    """
+
+    __tablename__ = "generated_flashcard_sets"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), unique=True, index=True)
+
+    # List of FlashCard payloads, newest first
+    cards: Mapped[list] = mapped_column(JSONB, nullable=False)
+
+    # Newest attempt already reflected in the cards
+    last_attempt_id: Mapped[Optional[int]] = mapped_column(nullable=True)
+
+    # Set when a failed attempt is saved, cleared when the cards catch up
+    stale: Mapped[bool] = mapped_column(default=False, server_default="false")
+
+    # Model that generated the newest cards
+    model_used: Mapped[Optional[str]] = mapped_column(nullable=True)
+
+    generated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class JudgeVerdict(Base):
+    """A memoized test verdict for one submission against one test-set version.
+
+    Judging is deterministic for a given source, language and test set, so
+    resubmitting unchanged code reuses the stored verdict. The test-set
+    version is a hash of the test cases; editing them yields new keys.
+    """
+
+    __tablename__ = "judge_verdicts"
+    __table_args__ = (
+        UniqueConstraint(
+            "code_hash", "language", "problem_id", "test_set_version", name="uq_judge_verdicts_key"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # sha256 of the submitted source
+    code_hash: Mapped[str] = mapped_column()
+    language: Mapped[str] = mapped_column()
+    problem_id: Mapped[int] = mapped_column()
+    test_set_version: Mapped[str] = mapped_column()
+
+    # TestExecutionResponse payload
+    verdict: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -1,17 +1,25 @@
 """API routes for the AI code review service.
 
 This module defines the POST /ai-review endpoint where clients submit source code
-and receive an AI-generated review (feedback, suggestions, best practices).
+and receive an AI-generated review (feedback, suggestions, best practices), and
+POST /ai-review/stream, which sends the review as Server-Sent Events while the
+model is still generating it.
 """
 
+# Built-In Imports.
+import json
+from typing import Any, AsyncIterator, Dict
+
 # External Imports.
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
 # Local Imports.
 from app.auth.utils import get_current_user
 from app.models import User
 from app.schemas import AICodeReviewRequest, AICodeReviewResponse
-from app.services.ai_review import run_code_review
+from app.services.llm import LLMUnavailableError, get_breaker, route
+from app.services.ai_review import get_stream_agent, run_code_review, stream_code_review
 
 router = APIRouter(prefix="/ai-review", tags=["ai-code-review"])
 
@@ -23,6 +31,7 @@ router = APIRouter(prefix="/ai-review", tags=["ai-code-review"])
     description=(
         "Submit source code and receive an AI-generated code review. "
         "The review includes feedback on correctness, style, security, and best practices. "
+        "Reviews of unchanged code are served from cache (`cached: true`). "
         "Requires CEREBRAS_API_KEY to be set in the server environment."
     ),
     responses={
@@ -33,12 +42,13 @@ router = APIRouter(prefix="/ai-review", tags=["ai-code-review"])
                     "example": {
                         "code_review": "Consider adding type hints and docstrings.",
                         "model_used": "llama-3.3-70b",
+                        "cached": False,
                     }
                 }
             },
         },
         401: {"description": "Not authenticated. Provide a valid Bearer token."},
-        503: {"description": "AI code review is unavailable (e.g. missing API key)."},
+        503: {"description": "AI code review is unavailable (missing API key, timeout or upstream outage)."},
         500: {
             "description": "Internal error during review (e.g. model or network failure)."
         },
@@ -55,21 +65,25 @@ async def ai_review_post(
         current_user: The authenticated user (required).
 
     Returns:
-        AICodeReviewResponse with `code_review` and optional `model_used`.
+        AICodeReviewResponse with `code_review`, optional `model_used` and `cached`.
 
     Raises:
-        HTTPException: 503 if CEREBRAS_API_KEY is not configured.
+        HTTPException: 503 if CEREBRAS_API_KEY is not configured, the model
+            timed out, or the AI service is failing (circuit open).
         HTTPException: 500 for model/network errors.
     """
     try:
-        review_text, model_used = await run_code_review(
+        review_text, model_used, cached = await run_code_review(
             code=request.code,
             language=request.language or "",
         )
         return AICodeReviewResponse(
             code_review=review_text,
             model_used=model_used or None,
+            cached=cached,
         )
+    except LLMUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
     except ValueError as e:
         if "CEREBRAS_API_KEY" in str(e):
             raise HTTPException(
@@ -82,3 +96,64 @@ async def ai_review_post(
             status_code=500,
             detail=f"AI code review failed: {e!s}",
         ) from e
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post(
+    "/stream",
+    summary="Stream an AI code review",
+    description=(
+        "Submit source code and receive the review as Server-Sent Events while it is "
+        "generated. Emits `delta` events with `{\"text\": ...}` chunks, then one `done` "
+        "event with `model_used` and token `usage`, or an `error` event if the model "
+        "fails or misses its deadline mid-stream."
+    ),
+    responses={
+        200: {"description": "Review stream.", "content": {"text/event-stream": {}}},
+        401: {"description": "Not authenticated. Provide a valid Bearer token."},
+        503: {"description": "AI code review is unavailable (missing API key or upstream outage)."},
+    },
+)
+async def ai_review_stream(
+    request: AICodeReviewRequest,
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream an AI code review as Server-Sent Events.
+
+    Raises:
+        HTTPException: 503 if CEREBRAS_API_KEY is not configured or the AI
+            service is failing (circuit open).
+    """
+    try:
+        model_name = route("ai_review_stream")
+        agent = get_stream_agent(model_name)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="AI code review is not configured. Set CEREBRAS_API_KEY on the server.",
+        ) from e
+    # Fail before sending headers while the upstream is known to be down.
+    if not get_breaker(model_name).available():
+        raise HTTPException(status_code=503, detail="The AI service is temporarily unavailable. Try again shortly.")
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event in stream_code_review(agent, model_name, request.code, request.language or ""):
+                kind = event.pop("type")
+                yield _sse(kind, event)
+        except LLMUnavailableError as e:
+            yield _sse("error", {"detail": str(e)})
+        except Exception as e:
+            # Headers are already sent, so failures are reported in-band.
+            yield _sse("error", {"detail": f"AI code review failed: {e!s}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Disable proxy buffering so the first chunk reaches the client immediately.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
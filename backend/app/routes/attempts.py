@@ -3,10 +3,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List
 
-from ..database import get_db
+from ..database import get_db, insert_returning, insert_many_returning_ids
 from ..models import ProblemAttempt, User
-from ..schemas import ProblemAttemptCreate, ProblemAttemptOut
+from ..schemas import ProblemAttemptCreate, ProblemAttemptOut, ProblemAttemptBatch, BatchCreateResponse
 from ..auth.utils import get_current_user
+from ..services.flash_card_service import mark_stale, schedule_update
 
 router = APIRouter(prefix="/attempts", tags=["attempts"])
 
@@ -16,16 +17,44 @@ async def save_attempt(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Save a user's problem attempt."""
-    new_attempt = ProblemAttempt(
+    """Save a user's problem attempt.
+
+    A failed attempt marks the user's flash cards stale and updates them in
+    the background.
+    """
+    new_attempt = await insert_returning(
+        db,
+        ProblemAttempt,
         **attempt_in.model_dump(),
         user_id=current_user.id
     )
-    db.add(new_attempt)
+    if not new_attempt.passed:
+        await mark_stale(db, current_user.id)
     await db.commit()
-    await db.refresh(new_attempt)
+    if not new_attempt.passed:
+        schedule_update(current_user.id)
     return new_attempt
 
+@router.post("/batch", response_model=BatchCreateResponse, status_code=status.HTTP_201_CREATED)
+async def save_attempts_batch(
+    attempts_in: ProblemAttemptBatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Save several attempts in one multi-row INSERT and one transaction."""
+    ids = await insert_many_returning_ids(
+        db,
+        ProblemAttempt,
+        [{**attempt.model_dump(), "user_id": current_user.id} for attempt in attempts_in]
+    )
+    any_failed = any(not attempt.passed for attempt in attempts_in)
+    if any_failed:
+        await mark_stale(db, current_user.id)
+    await db.commit()
+    if any_failed:
+        schedule_update(current_user.id)
+    return BatchCreateResponse(ids=ids)
+
 @router.get("/", response_model=List[ProblemAttemptOut])
 async def list_attempts(
     db: AsyncSession = Depends(get_db),
@@ -12,7 +12,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 import re
 
 # Local Imports.
-from ..database import get_db
+from ..database import get_db, insert_returning
 from ..models import User
 from ..schemas import UserCreate, UserOut, Token
 from ..auth.security import hash_password, verify_password, create_access_token
@@ -61,12 +61,10 @@ async def register(request: Request, user_data: UserCreate, db: AsyncSession = D
             status_code=status.HTTP_400_BAD_REQUEST, detail="Password must be at least 8 characters long and contain both letters and numbers."
         )
 
-    new_user = User(
-        email=user_data.email, hashed_password=hash_password(user_data.password)
+    new_user = await insert_returning(
+        db, User, email=user_data.email, hashed_password=hash_password(user_data.password)
     )
-    db.add(new_user)
     await db.commit()
-    await db.refresh(new_user)
     return new_user
 
 
@@ -12,6 +12,7 @@ from fastapi import APIRouter, HTTPException
 # Local Imports.
 from app.schemas import DSASearchRequest, DSASearchResponse
 from app.services.dsa_search import run_dsa_search
+from app.services.llm import LLMUnavailableError
 
 router = APIRouter(prefix="/api/dsa", tags=["DSA Search"])
 
@@ -27,11 +28,14 @@ async def search_dsa_problems(request: DSASearchRequest) -> DSASearchResponse:
         A structured list of problems with URLs and difficulty levels.
 
     Raises:
-        HTTPException: If the AI service fails or keys are missing.
+        HTTPException: 503 if the AI service timed out or is failing,
+            500 if it fails otherwise or keys are missing.
     """
     try:
         result = await run_dsa_search(request.query)
         return result
+    except LLMUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except ValueError as e:
         # Likely missing API keys
         raise HTTPException(status_code=500, detail=str(e))
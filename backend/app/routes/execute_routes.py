@@ -5,7 +5,9 @@ through the CodeExecutor, and returning the execution results.
 """
 
 # Built-In Imports.
+import asyncio
 import subprocess
+from typing import Any, Awaitable, Dict, Optional, Set, Tuple, TypeVar, Union
 
 # External Imports.
 from fastapi import APIRouter, Depends, HTTPException, Request
@@ -21,14 +23,96 @@ from ..schemas import (
     TestCaseResult,
     AITestExecutionRequest,
     AITestExecutionResponse,
+    ProblemAttemptCreate,
 )
 from ..services.compiler import CodeExecutor
+from ..services import attempt_writer, execution_cache, judge_verdicts
 from ..services.ai_tester import run_ai_tests
 from ..services.security_scanner import check_security_rules
 from ..limiter import limiter
+from .. import metrics
+from ..config import settings
 
 router = APIRouter(prefix="/execute", tags=["compiler"])
 
+T = TypeVar("T")
+
+
+# ---------------------------------------------------------------------------
+# Cancellation of abandoned runs
+# ---------------------------------------------------------------------------
+
+# How often a running job checks whether its client is still connected.
+DISCONNECT_POLL_SECONDS: float = 0.25
+
+# The latest run per (user id, editor id), so a new run can supersede it.
+_editor_runs: Dict[Tuple[int, str], "asyncio.Task[object]"] = {}
+_superseded: Set["asyncio.Task[object]"] = set()
+
+
+async def _run_cancellable(
+    request: Request,
+    endpoint: str,
+    user_id: int,
+    editor_id: Optional[str],
+    work: Awaitable[T],
+) -> T:
+    """Run an execution job, cancelling it if nobody is waiting for it anymore.
+
+    The job is cancelled, and its sandbox process group killed, when the
+    client disconnects or when the same user starts a newer run from the
+    same editor. Cancellations are counted in ``execution_cancelled_total``.
+
+    Raises:
+        HTTPException: 499 if the client disconnected, 409 if superseded.
+    """
+    task: "asyncio.Task[T]" = asyncio.ensure_future(work)
+    key = (user_id, editor_id) if editor_id else None
+    if key is not None:
+        previous = _editor_runs.get(key)
+        if previous is not None and not previous.done():
+            _superseded.add(previous)
+            previous.cancel()
+        _editor_runs[key] = task
+
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                break
+            if await request.is_disconnected():
+                task.cancel()
+                metrics.increment("execution_cancelled_total", endpoint=endpoint, reason="disconnect")
+                await asyncio.gather(task, return_exceptions=True)
+                raise HTTPException(status_code=499, detail="Client closed request.")
+    except asyncio.CancelledError:
+        # The handler itself was cancelled (e.g. server shutdown).
+        task.cancel()
+        raise
+    finally:
+        if key is not None and _editor_runs.get(key) is task:
+            del _editor_runs[key]
+        # Forget the mark on every path, including the 499 above.
+        superseded = task in _superseded
+        _superseded.discard(task)
+
+    if task.cancelled() and superseded:
+        metrics.increment("execution_cancelled_total", endpoint=endpoint, reason="superseded")
+        raise HTTPException(status_code=409, detail="Superseded by a newer run from the same editor.")
+    return task.result()
+
+
+async def _save_attempt(
+    user_id: int,
+    payload: Union[ExecutionRequest, TestExecutionRequest, AITestExecutionRequest],
+    **results: Any,
+) -> int:
+    """Queue the run as a problem attempt (write-behind) and return its id."""
+    attempt = ProblemAttemptCreate(
+        **payload.attempt.model_dump(), code=payload.code, language=payload.language, **results
+    )
+    return await attempt_writer.enqueue(user_id, attempt)
+
 
 # ---------------------------------------------------------------------------
 # In-memory test cases (temporary, for sum-of-two-numbers problems only)
@@ -68,17 +152,44 @@ async def run_code(
 
     Raises:
         HTTPException: 408 if execution exceeds the timeout,
+                      409 if a newer run from the same editor superseded it,
+                      499 if the client disconnected,
                       500 for internal server errors.
     """
     try:
         # Check security rules first
         check_security_rules(payload.code, payload.language)
 
-        # Pass the request data to the service layer for execution
-        result = await CodeExecutor.run(
-            payload.language, payload.code, payload.input_data
-        )
-        return result
+        input_data = payload.input_data or ""
+        cache_key = None
+        result = None
+        if settings.EXECUTION_CACHE_ENABLED and payload.cache:
+            cache_key = await execution_cache.cache_key(payload.language, payload.code, input_data)
+            result = execution_cache.get(cache_key) if cache_key else None
+
+        if result is None:
+            # Pass the request data to the service layer for execution
+            result = await _run_cancellable(
+                request,
+                "run",
+                current_user.id,
+                payload.editor_id,
+                CodeExecutor.run(payload.language, payload.code, input_data),
+            )
+            if cache_key:
+                execution_cache.store(cache_key, result)
+
+        response = ExecutionResponse(**result)
+        if payload.attempt is not None:
+            response.attempt_id = await _save_attempt(
+                current_user.id,
+                payload,
+                stdout=response.stdout,
+                stderr=response.stderr,
+                exit_code=response.exit_code,
+                passed=response.exit_code == 0,
+            )
+        return response
     except subprocess.TimeoutExpired:
         # Specifically catch execution timeouts to inform the user
         raise HTTPException(
@@ -101,14 +212,46 @@ async def run_code_with_tests(
 ) -> TestExecutionResponse:
     """Execute code against a predefined set of test cases.
 
-    For now this assumes that all problems are 'sum of two numbers' tasks.
-    The function does not modify or depend on the database; it simply uses
-    in-memory test cases and returns per-test results.
+    For now this assumes that all problems are 'sum of two numbers' tasks,
+    using in-memory test cases. Verdicts are memoized per (code, language,
+    problem, test-set version), so an unchanged resubmission is not re-run.
+    With ``attempt`` set, the run is also saved as a problem attempt.
     """
     try:
         # Check security rules first
         check_security_rules(payload.code, payload.language)
-        
+
+        test_set_version = judge_verdicts.test_set_version(SUM_TWO_NUMBERS_TEST_CASES)
+        response = await judge_verdicts.load_verdict(
+            payload.code, payload.language, payload.problem_id, test_set_version
+        )
+        if response is None:
+            response = await _run_tests(request, payload, current_user, test_set_version)
+        if payload.attempt is not None:
+            response.attempt_id = await _save_attempt(
+                current_user.id,
+                payload,
+                exit_code=next((result.exit_code for result in response.results if result.exit_code), 0),
+                test_results=[result.model_dump() for result in response.results],
+                passed=response.all_passed,
+            )
+        return response
+    except subprocess.TimeoutExpired:
+        raise HTTPException(
+            status_code=408, detail="Code execution timed out while running tests."
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _run_tests(
+    request: Request, payload: TestExecutionRequest, current_user: User, test_set_version: str
+) -> TestExecutionResponse:
+    """Judge the submission against every test case and memoize the verdict."""
+
+    async def _judge() -> TestExecutionResponse:
         results: list[TestCaseResult] = []
         passed_tests: int = 0
 
@@ -141,14 +284,14 @@ async def run_code_with_tests(
             passed_tests=passed_tests,
             all_passed=passed_tests == len(SUM_TWO_NUMBERS_TEST_CASES),
         )
-    except subprocess.TimeoutExpired:
-        raise HTTPException(
-            status_code=408, detail="Code execution timed out while running tests."
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+    response = await _run_cancellable(
+        request, "tests", current_user.id, payload.editor_id, _judge()
+    )
+    await judge_verdicts.store_verdict(
+        payload.code, payload.language, payload.problem_id, test_set_version, response
+    )
+    return response
 
 
 @router.post("/ai-tests", response_model=AITestExecutionResponse)
@@ -158,16 +301,32 @@ async def run_ai_generated_tests(
     payload: AITestExecutionRequest,
     current_user: User = Depends(get_current_user),
 ) -> AITestExecutionResponse:
-    """Run AI-generated tests against user code."""
+    """Run AI-generated tests against user code, optionally saving the attempt."""
     try:
         # Check security rules first
         check_security_rules(payload.code, payload.language)
         
-        return await run_ai_tests(
-            payload.problem_description,
-            payload.code,
-            payload.language
+        response = await _run_cancellable(
+            request,
+            "ai_tests",
+            current_user.id,
+            payload.editor_id,
+            run_ai_tests(
+                payload.problem_description,
+                payload.code,
+                payload.language,
+                regenerate=payload.regenerate
+            ),
         )
+        if payload.attempt is not None:
+            response.attempt_id = await _save_attempt(
+                current_user.id,
+                payload,
+                exit_code=next((result.exit_code for result in response.results if result.exit_code), 0),
+                test_results=[result.model_dump() for result in response.results],
+                passed=bool(response.results) and all(result.passed for result in response.results),
+            )
+        return response
     except HTTPException:
         raise
     except Exception as e:
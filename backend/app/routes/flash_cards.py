@@ -1,41 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List
 
-from ..database import get_db
-from ..models import ProblemAttempt, User, SavedFlashCard
-from ..schemas import FlashCardResponse, SavedFlashCardCreate, SavedFlashCardOut
+from ..database import get_db, insert_returning, insert_many_returning_ids
+from ..models import GeneratedFlashCardSet, User, SavedFlashCard
+from ..schemas import FlashCardResponse, SavedFlashCardCreate, SavedFlashCardOut, SavedFlashCardBatch, BatchCreateResponse
 from ..auth.utils import get_current_user
-from ..services.flash_card_service import generate_flash_cards
+from ..services.llm import LLMUnavailableError
+from ..services.flash_card_service import get_card_set, recent_attempts, regenerate_card_set, schedule_update
 
 router = APIRouter(prefix="/flash-cards", tags=["flash-cards"])
 
+def _card_set_response(card_set: GeneratedFlashCardSet) -> FlashCardResponse:
+    """Build the API response for a stored card set."""
+    return FlashCardResponse(
+        cards=card_set.cards,
+        summary=f"Generated {len(card_set.cards)} cards based on your recent activity.",
+        stale=card_set.stale,
+        generated_at=card_set.generated_at,
+        model_used=card_set.model_used,
+    )
+
 @router.get("/generate", response_model=FlashCardResponse)
 async def get_personalized_flash_cards(
+    refresh: bool = Query(False, description="Regenerate the cards now instead of serving the stored set."),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Generate personalized flash cards based on user's recent failures."""
+    """Return personalized flash cards based on user's recent failures.
+
+    Cards are precomputed in the background as failed attempts are saved and
+    served from storage; ``stale`` is true while an update is pending. The
+    first request, or one with ``refresh=true``, generates them inline.
+    """
+    if not refresh:
+        card_set = await get_card_set(db, current_user.id)
+        if card_set is not None:
+            if card_set.stale:
+                # Covers updates lost to a restart; coalesced if already running.
+                schedule_update(current_user.id)
+            return _card_set_response(card_set)
+
     # Get last 10 attempts, prioritizing failures
-    query = (
-        select(ProblemAttempt)
-        .where(ProblemAttempt.user_id == current_user.id)
-        .order_by(ProblemAttempt.passed.asc(), ProblemAttempt.created_at.desc())
-        .limit(10)
-    )
-    result = await db.execute(query)
-    attempts = result.scalars().all()
+    attempts = await recent_attempts(db, current_user.id)
     
     if not attempts:
         return FlashCardResponse(cards=[], summary="No attempts found. Try solving some problems first!")
     
     try:
-        cards = await generate_flash_cards(attempts)
-        return FlashCardResponse(
-            cards=cards,
-            summary=f"Generated {len(cards)} cards based on your recent activity."
-        )
+        card_set = await regenerate_card_set(current_user.id, attempts)
+        return _card_set_response(card_set)
+    except LLMUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Flash card generation failed: {str(e)}")
 
@@ -60,17 +77,32 @@ async def save_flash_card(
     current_user: User = Depends(get_current_user)
 ):
     """Save a flash card to the database."""
-    card = SavedFlashCard(
+    card = await insert_returning(
+        db,
+        SavedFlashCard,
         user_id=current_user.id,
         front=card_in.front,
         back=card_in.back,
         problem_context=card_in.problem_context
     )
-    db.add(card)
     await db.commit()
-    await db.refresh(card)
     return card
 
+@router.post("/batch", response_model=BatchCreateResponse, status_code=status.HTTP_201_CREATED)
+async def save_flash_cards_batch(
+    cards_in: SavedFlashCardBatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Save several flash cards in one multi-row INSERT and one transaction."""
+    ids = await insert_many_returning_ids(
+        db,
+        SavedFlashCard,
+        [{**card.model_dump(), "user_id": current_user.id} for card in cards_in]
+    )
+    await db.commit()
+    return BatchCreateResponse(ids=ids)
+
 @router.delete("/{card_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_saved_flash_card(
     card_id: int,
@@ -0,0 +1,32 @@
+"""API route exposing in-process service metrics.
+
+This module defines the GET /metrics endpoint, which returns the counters and
+latency histograms recorded by this worker (LLM calls, caches, executions).
+It requires an authenticated user, like the other non-public routes.
+"""
+
+# Built-In Imports.
+from typing import Any, Dict
+
+# External Imports.
+from fastapi import APIRouter, Depends
+
+# Local Imports.
+from app import metrics
+from app.auth.utils import get_current_user
+from app.models import User
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/", responses={401: {"description": "Not authenticated. Provide a valid Bearer token."}})
+async def get_metrics(current_user: User = Depends(get_current_user)) -> Dict[str, Any]:
+    """Return a snapshot of this worker's counters and histograms.
+
+    Args:
+        current_user: The authenticated user (required).
+
+    Returns:
+        A dictionary with ``counters`` and ``histograms`` keyed by metric name.
+    """
+    return metrics.snapshot()
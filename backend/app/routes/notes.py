@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.orm.exc import StaleDataError
 from typing import List
 
-from ..database import get_db
+from ..database import get_db, insert_returning
 from ..models import Note, User
-from ..schemas import NoteCreate, NoteUpdate, NoteOut, NoteFromProblem
+from ..schemas import NoteCreate, NoteUpdate, NoteOut, NoteFromProblem, NotePatch, NotePatchOut
 from ..auth.utils import get_current_user
-from ..services.problem_ingestion import fetch_problem_details
+from ..services import note_ingestion
+from ..services.problem_ingestion import get_cached_problem
+from ..services.note_patch import apply_block_operations
 
 router = APIRouter(prefix="/notes", tags=["notes"])
 
@@ -28,14 +33,14 @@ async def create_note(
     current_user: User = Depends(get_current_user)
 ):
     """Create a new note."""
-    new_note = Note(
+    new_note = await insert_returning(
+        db,
+        Note,
         title=note_in.title,
         content=note_in.content,
         user_id=current_user.id
     )
-    db.add(new_note)
     await db.commit()
-    await db.refresh(new_note)
     return new_note
 
 @router.get("/{note_id}", response_model=NoteOut)
@@ -70,11 +75,53 @@ async def update_note(
         note.title = note_in.title
     if note_in.content is not None:
         note.content = note_in.content
-        
-    await db.commit()
+
+    try:
+        await db.commit()
+    except StaleDataError:
+        # Raced a PATCH or a background ingestion save
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Note was modified by another save. Reload and retry.")
     await db.refresh(note)
     return note
 
+@router.patch("/{note_id}", response_model=NotePatchOut)
+async def patch_note(
+    note_id: int,
+    patch: NotePatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Apply block-level operations to a note.
+
+    The request carries only the edited blocks and the version it was made
+    against; a stale version is rejected with 409 so the client can rebase.
+    """
+    query = select(Note).where(Note.id == note_id, Note.user_id == current_user.id)
+    result = await db.execute(query)
+    note = result.scalar_one_or_none()
+    if not note:
+        raise HTTPException(status_code=404, detail="Note not found")
+    if note.version != patch.version:
+        raise HTTPException(status_code=409, detail="Note was modified by another save. Reload and retry.")
+
+    if patch.operations:
+        try:
+            note.content = apply_block_operations(note.content, patch.operations)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    if patch.title is not None:
+        note.title = patch.title
+
+    try:
+        # The UPDATE is guarded by "WHERE version = :loaded_version"
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Note was modified by another save. Reload and retry.")
+    await db.refresh(note, ["updated_at"])
+    return note
+
 @router.delete("/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_note(
     note_id: int,
@@ -99,16 +146,70 @@ async def create_note_from_problem(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Create a new note from a DSA problem URL."""
-    # Fetch problem details and format as blocks
-    blocks = await fetch_problem_details(note_in.url, note_in.title)
-    
-    new_note = Note(
+    """Create a note from a DSA problem URL.
+
+    Problems already ingested for any user are copied from the shared cache
+    (``ingestion_status="complete"``). Otherwise, or with ``refresh``, this
+    returns a placeholder note at once with ``ingestion_status="pending"``;
+    the problem description and starter code are filled in by a background
+    job. Poll GET /notes/{id} or long-poll GET /notes/{id}/ingestion.
+    """
+    if not note_in.refresh:
+        blocks = await get_cached_problem(note_in.url, note_in.title)
+        if blocks is not None:
+            new_note = await insert_returning(
+                db,
+                Note,
+                title=note_in.title,
+                content=blocks,
+                user_id=current_user.id,
+                ingestion_status="complete",
+                ingestion_url=note_in.url,
+            )
+            await db.commit()
+            return new_note
+
+    new_note = await insert_returning(
+        db,
+        Note,
         title=note_in.title,
-        content=blocks,
-        user_id=current_user.id
+        content=note_ingestion.placeholder_blocks(note_in.url, note_in.title, "Fetching problem details..."),
+        user_id=current_user.id,
+        ingestion_status="pending",
+        ingestion_url=note_in.url,
+        ingestion_claimed_at=func.now(),
+        version=note_ingestion.PLACEHOLDER_VERSION,
+        ingestion_base_version=note_ingestion.PLACEHOLDER_VERSION,
     )
-    db.add(new_note)
     await db.commit()
-    await db.refresh(new_note)
+    note_ingestion.start(new_note.id, new_note.version, note_in.url, note_in.title, note_in.refresh)
     return new_note
+
+@router.get("/{note_id}/ingestion", response_model=NoteOut)
+async def wait_for_ingestion(
+    note_id: int,
+    timeout: float = Query(25.0, ge=0, le=60, description="Seconds to wait for ingestion to finish."),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Long-poll a note created from a problem until ingestion finishes.
+
+    Returns as soon as the note is no longer pending, or the current note
+    once ``timeout`` seconds have passed.
+    """
+    deadline = time.monotonic() + timeout
+    query = (
+        select(Note)
+        .where(Note.id == note_id, Note.user_id == current_user.id)
+        .execution_options(populate_existing=True)
+    )
+    while True:
+        note = (await db.execute(query)).scalar_one_or_none()
+        # End the transaction so no pooled connection is held while waiting.
+        await db.commit()
+        if not note:
+            raise HTTPException(status_code=404, detail="Note not found")
+        remaining = deadline - time.monotonic()
+        if note.ingestion_status != "pending" or remaining <= 0:
+            return note
+        await note_ingestion.wait(note_id, min(remaining, 1.0))
@@ -11,7 +11,7 @@ from sqlalchemy import select
 from typing import List, Dict
 
 # Local Imports.
-from ..database import get_db
+from ..database import get_db, insert_returning
 from ..models import Problem, User
 from ..schemas import ProblemCreate, ProblemOut, ProblemUpdate
 from ..auth.utils import get_current_user
@@ -35,10 +35,10 @@ async def create_problem(
     Returns:
         The newly created Problem object.
     """
-    new_problem = Problem(**problem_data.model_dump(), creator_id=current_user.id)
-    db.add(new_problem)
+    new_problem = await insert_returning(
+        db, Problem, **problem_data.model_dump(), creator_id=current_user.id
+    )
     await db.commit()
-    await db.refresh(new_problem)
     return new_problem
 
 
@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, literal, literal_column, union_all, and_, case
+
+from ..database import get_db
+from ..models import Note, Problem, User, NOTE_TEXT_JSONPATH
+from ..schemas import SearchHit, SearchResponse
+from ..auth.utils import get_current_user
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = "MaxFragments=2, MinWords=5, MaxWords=20"
+
+# Plain text of a note's BlockNote content, used only to build snippets.
+NOTE_PLAIN_TEXT = literal_column(
+    "(SELECT string_agg(t #>> '{}', ' ') "
+    f"FROM jsonb_path_query(notes.content, '{NOTE_TEXT_JSONPATH}') AS t)"
+)
+
+
+@router.get("/", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Web-style search query."),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Ranked full-text search over the user's notes and all problems."""
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+    note_matches = select(
+        literal("note").label("kind"),
+        Note.id.label("id"),
+        func.ts_rank_cd(Note.search_vector, ts_query).label("rank"),
+    ).where(Note.user_id == current_user.id, Note.search_vector.bool_op("@@")(ts_query))
+
+    problem_matches = select(
+        literal("problem").label("kind"),
+        Problem.id.label("id"),
+        func.ts_rank_cd(Problem.search_vector, ts_query).label("rank"),
+    ).where(Problem.search_vector.bool_op("@@")(ts_query))
+
+    # Rank and paginate on the GIN-backed matches first, so the expensive
+    # ts_headline() only runs for the rows on the requested page.
+    page = (
+        select(union_all(note_matches, problem_matches).subquery())
+        .order_by(literal_column("rank").desc(), literal_column("kind"), literal_column("id"))
+        .limit(limit + 1)
+        .offset(offset)
+        .subquery()
+    )
+
+    query = (
+        select(
+            page.c.kind,
+            page.c.id,
+            page.c.rank,
+            func.coalesce(Note.title, Problem.title).label("title"),
+            case(
+                (page.c.kind == "note", func.ts_headline(SEARCH_CONFIG, func.coalesce(NOTE_PLAIN_TEXT, ""), ts_query, HEADLINE_OPTIONS)),
+                else_=func.ts_headline(SEARCH_CONFIG, Problem.statement, ts_query, HEADLINE_OPTIONS),
+            ).label("snippet"),
+        )
+        .select_from(page)
+        .outerjoin(Note, and_(page.c.kind == "note", Note.id == page.c.id))
+        .outerjoin(Problem, and_(page.c.kind == "problem", Problem.id == page.c.id))
+        .order_by(page.c.rank.desc(), page.c.kind, page.c.id)
+    )
+    rows = (await db.execute(query)).all()
+
+    return SearchResponse(
+        results=[
+            SearchHit(kind=row.kind, id=row.id, title=row.title, rank=row.rank, snippet=row.snippet or "")
+            for row in rows[:limit]
+        ],
+        limit=limit,
+        offset=offset,
+        has_more=len(rows) > limit,
+    )
@@ -5,7 +5,7 @@ request payloads and formatting API responses for user and token data.
 """
 
 # Built-In Imports.
-from typing import Optional, List
+from typing import Annotated, Literal, Optional, List
 
 # External Imports.
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
@@ -121,6 +121,14 @@ class ProblemOut(ProblemBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class AttemptContext(BaseModel):
+    """Problem details for saving an execution as a problem attempt."""
+
+    problem_title: str = Field(..., description="Title of the attempted problem.")
+    problem_url: Optional[str] = Field(None, description="Link to the problem.")
+    difficulty: Optional[str] = Field(None, description="Easy, Medium or Hard.")
+
+
 class ExecutionRequest(BaseModel):
     """Represents a request to execute a snippet of source code.
 
@@ -128,6 +136,12 @@ class ExecutionRequest(BaseModel):
         code: The source code string to be executed.
         language: The programming language of the code (e.g., 'python', 'cpp', 'java').
         input_data: Optional string representing standard input (stdin) for the program.
+        cache: Whether an earlier identical run's result may be returned,
+            when the execution cache is enabled.
+        attempt: Optional problem details; when set, the run is saved as a
+            problem attempt.
+        editor_id: Optional id of the editor running the code, used to
+            cancel its previous run.
     """
 
     code: str = Field(..., description="The source code to execute.")
@@ -135,6 +149,18 @@ class ExecutionRequest(BaseModel):
     input_data: Optional[str] = Field(
         default="", description="Optional stdin for the process."
     )
+    cache: bool = Field(
+        default=True,
+        description="Allow a cached result for identical code and stdin (set false if the program reads time or randomness).",
+    )
+    attempt: Optional[AttemptContext] = Field(
+        None, description="Save this run as a problem attempt; the response then carries attempt_id."
+    )
+    editor_id: Optional[str] = Field(
+        None,
+        max_length=128,
+        description="The editor (e.g. code block id) running the code; a newer run from it cancels this one.",
+    )
 
 
 class ExecutionResponse(BaseModel):
@@ -144,11 +170,15 @@ class ExecutionResponse(BaseModel):
         stdout: The standard output produced by the execution.
         stderr: The standard error produced by the execution.
         exit_code: The process exit code (0 usually indicates success).
+        attempt_id: The saved problem attempt, if one was requested.
     """
 
     stdout: str = Field(..., description="Captured standard output.")
     stderr: str = Field(..., description="Captured standard error.")
     exit_code: int = Field(..., description="The process return code.")
+    attempt_id: Optional[int] = Field(
+        None, description="Id of the saved problem attempt, if the request asked to save one."
+    )
 
 
 class TestCaseResult(BaseModel):
@@ -177,8 +207,8 @@ class TestExecutionRequest(BaseModel):
 
     Notes:
         For now, all problems are treated as 'sum of two numbers' problems.
-        The backend uses a fixed set of test cases and does not persist anything
-        to the database.
+        The backend uses a fixed set of test cases; only the resulting verdict
+        is stored, so identical resubmissions can reuse it.
     """
 
     code: str = Field(..., description="The source code to execute against test cases.")
@@ -186,6 +216,14 @@ class TestExecutionRequest(BaseModel):
     problem_id: int = Field(
         ..., description="The problem identifier (currently informational only)."
     )
+    attempt: Optional[AttemptContext] = Field(
+        None, description="Save this run as a problem attempt; the response then carries attempt_id."
+    )
+    editor_id: Optional[str] = Field(
+        None,
+        max_length=128,
+        description="The editor (e.g. code block id) running the code; a newer run from it cancels this one.",
+    )
 
 
 class TestExecutionResponse(BaseModel):
@@ -201,6 +239,12 @@ class TestExecutionResponse(BaseModel):
     all_passed: bool = Field(
         ..., description="True if and only if all test cases passed."
     )
+    memoized: bool = Field(
+        False, description="True if this verdict was reused from an earlier identical submission."
+    )
+    attempt_id: Optional[int] = Field(
+        None, description="Id of the saved problem attempt, if the request asked to save one."
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -235,6 +279,7 @@ class AICodeReviewResponse(BaseModel):
     Attributes:
         code_review: The AI-generated review text (feedback, suggestions, issues).
         model_used: Optional identifier of the model used (e.g. cerebras model name).
+        cached: True if the review was served from the review cache.
     """
 
     code_review: str = Field(
@@ -245,6 +290,10 @@ class AICodeReviewResponse(BaseModel):
         default=None,
         description="Identifier of the model used for the review, if available.",
     )
+    cached: bool = Field(
+        default=False,
+        description="True if this review was served from cache for identical code.",
+    )
 # ---------------------------------------------------------------------------
 # DSA Search schemas
 # ---------------------------------------------------------------------------
@@ -281,8 +330,8 @@ class DSAProblem(BaseModel):
     )
 
 
-class DSASearchResponse(BaseModel):
-    """Validated structured response for DSA search queries.
+class DSASearchResult(BaseModel):
+    """Validated structured output of the DSA search agent.
 
     Attributes:
         topic: The detected or user-provided topic of search.
@@ -295,6 +344,17 @@ class DSASearchResponse(BaseModel):
     )
 
 
+class DSASearchResponse(DSASearchResult):
+    """Response for DSA search queries.
+
+    Attributes:
+        model_used: The model that ran the search; None when it was answered
+            from the local problem catalog.
+    """
+
+    model_used: Optional[str] = Field(None, description="The model that ran the search, if any.")
+
+
 # ---------------------------------------------------------------------------
 # Note schemas
 # ---------------------------------------------------------------------------
@@ -326,17 +386,58 @@ class NoteOut(NoteBase):
 
     id: int
     user_id: int
+    version: int = Field(..., description="Current version, required by block patches.")
+    ingestion_status: Optional[Literal["pending", "complete", "failed"]] = Field(
+        None, description="Background problem ingestion state; null for ordinary notes."
+    )
     created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
 
+
+class BlockOperation(BaseModel):
+    """A single block-level edit applied by a note patch.
+
+    Blocks are addressed by their BlockNote ``id`` at any nesting depth.
+    ``insert`` and ``move`` place the block after ``after_id`` among the
+    children of ``parent_id`` (top level when unset), or first when
+    ``after_id`` is unset. ``update`` merges the keys of ``block`` into the
+    existing block, so unchanged children need not be resent.
+    """
+
+    op: Literal["insert", "update", "delete", "move"]
+    block_id: str = Field(..., min_length=1, description="Id of the block to edit.")
+    block: Optional[dict] = Field(None, description="New block (insert) or fields to replace (update).")
+    parent_id: Optional[str] = Field(None, description="Target parent block for insert/move.")
+    after_id: Optional[str] = Field(None, description="Sibling to place the block after for insert/move.")
+
+
+class NotePatch(BaseModel):
+    """Schema for a block-level note update with optimistic concurrency."""
+
+    version: int = Field(..., description="The note version the operations were made against.")
+    title: Optional[str] = Field(None, min_length=1, max_length=255)
+    operations: List[BlockOperation] = Field(default_factory=list, max_length=500)
+
+
+class NotePatchOut(BaseModel):
+    """Schema returned after a patch; the client already holds the content."""
+
+    id: int
+    version: int
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class NoteFromProblem(BaseModel):
     """Schema for creating a note from a DSA problem search result."""
 
     title: str = Field(..., description="The title of the problem.")
     url: str = Field(..., description="The URL of the problem statement.")
     difficulty: Optional[str] = Field(None, description="The difficulty of the problem.")
+    refresh: bool = Field(False, description="Re-ingest the problem instead of using the shared cache.")
 class AITestExecutionRequest(BaseModel):
     """Request for running AI-generated tests against user code."""
 
@@ -345,6 +446,17 @@ class AITestExecutionRequest(BaseModel):
     problem_description: str = Field(
         ..., description="The problem statement to generate tests for."
     )
+    regenerate: bool = Field(
+        False, description="Ignore the cached test suite and ask the AI for a new one."
+    )
+    attempt: Optional[AttemptContext] = Field(
+        None, description="Save this run as a problem attempt; the response then carries attempt_id."
+    )
+    editor_id: Optional[str] = Field(
+        None,
+        max_length=128,
+        description="The editor (e.g. code block id) running the code; a newer run from it cancels this one.",
+    )
 
 
 class AITestResult(BaseModel):
@@ -363,6 +475,10 @@ class AITestExecutionResponse(BaseModel):
 
     results: List[AITestResult] = Field(..., description="List of test results.")
     summary: str = Field(..., description="A short summary of the results (e.g. '3/5 Passed').")
+    model_used: Optional[str] = Field(None, description="The model that generated the test suite.")
+    attempt_id: Optional[int] = Field(
+        None, description="Id of the saved problem attempt, if the request asked to save one."
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -397,6 +513,20 @@ class ProblemAttemptOut(ProblemAttemptBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Upper bound on rows accepted by a single batch endpoint call.
+MAX_BATCH_SIZE = 100
+
+
+class BatchCreateResponse(BaseModel):
+    """Ids of the rows created by a batch endpoint, in request order."""
+    ids: List[int]
+
+
+ProblemAttemptBatch = Annotated[
+    List[ProblemAttemptCreate], Field(min_length=1, max_length=MAX_BATCH_SIZE)
+]
+
+
 # ---------------------------------------------------------------------------
 # Flash Card schemas
 # ---------------------------------------------------------------------------
@@ -412,6 +542,9 @@ class FlashCardResponse(BaseModel):
     """Response containing a set of flash cards."""
     cards: List[FlashCard]
     summary: str
+    stale: bool = Field(False, description="Newer failed attempts are not reflected yet; an update is running.")
+    generated_at: Optional[datetime] = Field(None, description="When the cards were last generated.")
+    model_used: Optional[str] = Field(None, description="The model that generated the newest cards.")
 
 
 class SavedFlashCardCreate(BaseModel):
@@ -421,6 +554,11 @@ class SavedFlashCardCreate(BaseModel):
     problem_context: Optional[str] = None
 
 
+SavedFlashCardBatch = Annotated[
+    List[SavedFlashCardCreate], Field(min_length=1, max_length=MAX_BATCH_SIZE)
+]
+
+
 class SavedFlashCardOut(BaseModel):
     """Schema for returning a saved flash card from the database."""
     id: int
@@ -432,3 +570,24 @@ class SavedFlashCardOut(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+
+
+# ---------------------------------------------------------------------------
+# Search schemas
+# ---------------------------------------------------------------------------
+
+class SearchHit(BaseModel):
+    """A single ranked full-text search match."""
+    kind: Literal["note", "problem"] = Field(..., description="Which collection the match came from.")
+    id: int = Field(..., description="The note or problem id.")
+    title: str
+    rank: float = Field(..., description="ts_rank_cd relevance score (higher is better).")
+    snippet: str = Field(..., description="Matching excerpt with terms wrapped in <b></b>.")
+
+
+class SearchResponse(BaseModel):
+    """One page of full-text search results."""
+    results: List[SearchHit]
+    limit: int
+    offset: int
+    has_more: bool = Field(..., description="True if another page is available.")
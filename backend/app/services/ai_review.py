@@ -3,21 +3,30 @@
 This module provides an async service that uses a Cerebras-backed Pydantic AI agent
 to review user-submitted code and return structured feedback. The agent is
 initialized with a configurable API key and a fixed system prompt for concise reviews.
+Reviews are cached in Postgres (with an in-process LRU in front) keyed by the
+normalized code, language, model and prompt version.
 """
 
 from __future__ import annotations
 
 # Built-In Imports.
-from typing import TYPE_CHECKING
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
 
 # External Imports.
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
-from pydantic_ai.models.cerebras import CerebrasModel
-from pydantic_ai.providers.cerebras import CerebrasProvider
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 # Local Imports.
+from app.cache import LRUCache
 from app.config import settings
+from app.database import async_session
+from app.models import AIReviewCache
+from app.services import llm
 
 if TYPE_CHECKING:
     pass
@@ -31,10 +40,9 @@ SYSTEM_PROMPT: str = (
     "style, security, and best practices. Keep your replies concise and actionable."
 )
 
-DEFAULT_MODEL_NAME: str = (
-    "llama-3.3-70b"  # Overridden by settings.CEREBRAS_MODEL when set
-)
-
+# Bump whenever SYSTEM_PROMPT or the prompt format changes so cached reviews
+# produced by the old prompt are no longer served.
+PROMPT_VERSION: int = 1
 
 class CodeReviewOutput(BaseModel):
     """Structured output from the AI code review agent.
@@ -47,42 +55,48 @@ class CodeReviewOutput(BaseModel):
     )
 
 
-def _make_agent() -> Agent[None, CodeReviewOutput]:
-    """Build the Cerebras-backed code review agent.
+def _make_agent(model_name: str) -> Agent[None, CodeReviewOutput]:
+    """Build the Cerebras-backed code review agent on the shared LLM client.
 
-    Uses CEREBRAS_API_KEY from settings. Raises ValueError if the key is missing.
+    Raises ValueError if CEREBRAS_API_KEY is missing.
+
+    Args:
+        model_name: The Cerebras model the agent calls.
 
     Returns:
         A configured Agent that returns CodeReviewOutput.
     """
-    api_key: str = getattr(settings, "CEREBRAS_API_KEY", "") or ""
-    if not api_key:
-        raise ValueError(
-            "CEREBRAS_API_KEY is not set. Add it to your .env to use AI code review."
-        )
-
-    model_name: str = getattr(settings, "CEREBRAS_MODEL", "") or DEFAULT_MODEL_NAME
-    model = CerebrasModel(
-        model_name,
-        provider=CerebrasProvider(api_key=api_key),
-    )
     return Agent(
-        model,
+        llm.build_model(model_name),
         output_type=CodeReviewOutput,
         system_prompt=SYSTEM_PROMPT,
     )
 
 
-# Lazy singleton: create agent on first use so missing API key doesn't break app startup.
-_agent: Agent[None, CodeReviewOutput] | None = None
+def get_agent(model_name: Optional[str] = None) -> Agent[None, CodeReviewOutput]:
+    """Return the shared code review agent for a model, creating it on first call."""
+    return llm.get_agent("ai_review", _make_agent, model_name)
+
 
+def _make_stream_agent(model_name: str) -> Agent[None, str]:
+    """Build a plain-text review agent for streaming.
 
-def get_agent() -> Agent[None, CodeReviewOutput]:
-    """Return the shared code review agent, creating it on first call."""
-    global _agent
-    if _agent is None:
-        _agent = _make_agent()
-    return _agent
+    Structured output only validates once the whole response has arrived, so
+    the streaming endpoint uses a str-output agent with the same prompt.
+
+    Returns:
+        A configured Agent that returns the review as text.
+    """
+    return Agent(llm.build_model(model_name), output_type=str, system_prompt=SYSTEM_PROMPT)
+
+
+def get_stream_agent(model_name: Optional[str] = None) -> Agent[None, str]:
+    """Return the shared streaming review agent for a model, creating it on first call.
+
+    Raises:
+        ValueError: If CEREBRAS_API_KEY is not configured.
+    """
+    return llm.get_agent("ai_review_stream", _make_stream_agent, model_name)
 
 
 def _format_review_prompt(code: str, language: str) -> str:
@@ -99,23 +113,168 @@ def _format_review_prompt(code: str, language: str) -> str:
     return f"Review the following code{lang_part}:\n\n```\n{code}\n```"
 
 
-async def run_code_review(code: str, language: str = "") -> tuple[str, str]:
-    """Run the AI code review on the given code.
+# ---------------------------------------------------------------------------
+# Review cache
+# ---------------------------------------------------------------------------
+
+@dataclass
+class CachedReview:
+    """A cached review and when it stops being served."""
+
+    code_review: str
+    model_name: str
+    expires_at: datetime
+
+
+_review_cache: LRUCache[str, CachedReview] = LRUCache(512)
+
+
+def _normalize_code(code: str) -> str:
+    """Normalize line endings and trailing/surrounding whitespace.
+
+    Indentation is kept because it is significant in several languages.
+    """
+    lines = code.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip("\n")
+
+
+def review_cache_key(code: str, language: str, model_name: str) -> str:
+    """Derive the cache key for a review of ``code``."""
+    parts = (_normalize_code(code), language.strip().lower(), model_name, str(PROMPT_VERSION))
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+async def _load_review(cache_keys: List[str]) -> Optional[CachedReview]:
+    """Return an unexpired cached review for any of the keys, or None.
+
+    There is one key per candidate model, so a review by any model the task
+    may be routed to counts as a hit.
+    """
+    now = datetime.now(timezone.utc)
+    for cache_key in cache_keys:
+        cached = _review_cache.get(cache_key)
+        if cached is not None:
+            if cached.expires_at > now:
+                return cached
+            _review_cache.pop(cache_key)
+
+    async with async_session() as db:
+        result = await db.execute(
+            select(
+                AIReviewCache.cache_key,
+                AIReviewCache.code_review,
+                AIReviewCache.model_name,
+                AIReviewCache.expires_at,
+            )
+            .where(AIReviewCache.cache_key.in_(cache_keys), AIReviewCache.expires_at > func.now())
+            .order_by(AIReviewCache.created_at.desc())
+            .limit(1)
+        )
+        row = result.one_or_none()
+    if row is None:
+        return None
+
+    cached = CachedReview(code_review=row.code_review, model_name=row.model_name or "", expires_at=row.expires_at)
+    _review_cache.set(row.cache_key, cached)
+    return cached
+
+
+async def _store_review(cache_key: str, review_text: str, model_name: str) -> None:
+    """Persist a review and evict expired rows and rows beyond the size bound."""
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=settings.AI_REVIEW_CACHE_TTL_SECONDS)
+    _review_cache.set(cache_key, CachedReview(review_text, model_name, expires_at))
+
+    stmt = pg_insert(AIReviewCache).values(
+        cache_key=cache_key, code_review=review_text, model_name=model_name, expires_at=expires_at
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AIReviewCache.cache_key],
+        set_={
+            "code_review": stmt.excluded.code_review,
+            "model_name": stmt.excluded.model_name,
+            "expires_at": stmt.excluded.expires_at,
+            "created_at": func.now(),
+        },
+    )
+    # Oldest-first eviction once the table holds more than the configured max.
+    overflow = (
+        select(AIReviewCache.id)
+        .order_by(AIReviewCache.created_at.desc())
+        .offset(settings.AI_REVIEW_CACHE_MAX_ENTRIES)
+    )
+    async with async_session() as db:
+        await db.execute(stmt)
+        await db.execute(
+            delete(AIReviewCache).where(
+                or_(AIReviewCache.expires_at <= func.now(), AIReviewCache.id.in_(overflow))
+            )
+        )
+        await db.commit()
+
+
+# ---------------------------------------------------------------------------
+# Service Logic
+# ---------------------------------------------------------------------------
+
+async def run_code_review(code: str, language: str = "") -> tuple[str, str, bool]:
+    """Run the AI code review on the given code, reusing a cached review if any.
 
     Args:
         code: The source code to review.
         language: Optional programming language hint for context.
 
     Returns:
-        A tuple (code_review_text, model_used). model_used is the model name
-        or empty string if not available.
+        A tuple (code_review_text, model_used, cached). model_used is the model
+        name or empty string if not available; cached is True on a cache hit.
 
     Raises:
         ValueError: If CEREBRAS_API_KEY is not configured.
     """
-    agent: Agent[None, CodeReviewOutput] = get_agent()
+    cache_keys = [review_cache_key(code, language, model) for model in llm.candidate_models("ai_review")]
+    cached = await _load_review(cache_keys)
+    if cached is not None:
+        return cached.code_review, cached.model_name, True
+
+    model_used: str = llm.route("ai_review")
+    agent: Agent[None, CodeReviewOutput] = get_agent(model_used)
     prompt: str = _format_review_prompt(code, language)
-    result = await agent.run(prompt)
+    result = await llm.run_agent("ai_review", agent, prompt, model_used)
     review_text: str = result.output.code_review
-    model_used: str = getattr(settings, "CEREBRAS_MODEL", "") or DEFAULT_MODEL_NAME
-    return review_text, model_used
+    await _store_review(review_cache_key(code, language, model_used), review_text, model_used)
+    return review_text, model_used, False
+
+
+async def stream_code_review(
+    agent: Agent[None, str], model_name: str, code: str, language: str = ""
+) -> AsyncIterator[Dict[str, Any]]:
+    """Stream an AI code review as it is generated.
+
+    Args:
+        agent: The streaming agent (from get_stream_agent()), resolved by the
+            caller so a missing API key can be reported before streaming starts.
+        model_name: The model the agent is bound to.
+        code: The source code to review.
+        language: Optional programming language hint for context.
+
+    Yields:
+        ``{"type": "delta", "text": ...}`` for each new chunk of review text,
+        then one ``{"type": "done", "model_used": ..., "usage": {...}}``.
+
+    Raises:
+        LLMUnavailableError: If the circuit is open or the deadline passes.
+    """
+    prompt: str = _format_review_prompt(code, language)
+    async with llm.stream_agent("ai_review_stream", agent, prompt, model_name) as stream:
+        async for delta in stream.text_deltas():
+            if delta:
+                yield {"type": "delta", "text": delta}
+        usage = stream.usage()
+    yield {
+        "type": "done",
+        "model_used": model_name,
+        "usage": {
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "requests": usage.requests,
+        },
+    }
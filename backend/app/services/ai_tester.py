@@ -8,23 +8,30 @@ to compare outputs.
 from __future__ import annotations
 
 # Built-In Imports.
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import hashlib
+import json
 import pydantic
 import re
 
 # External Imports.
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
-from pydantic_ai.models.cerebras import CerebrasModel
-from pydantic_ai.providers.cerebras import CerebrasProvider
-from pydantic_ai.profiles.openai import OpenAIModelProfile
 from pydantic_ai.exceptions import UnexpectedModelBehavior
+from sqlalchemy import select, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 # Local Imports.
-from app.config import settings
+from app.cache import LRUCache
+from app.database import async_session
+from app.models import AITestSuite
+from app.services import llm
 from app.services.compiler import CodeExecutor
 from app.schemas import AITestResult, AITestExecutionResponse
-from app.services.security_scanner import sanitize_ai_prompt
+from app.services.security_scanner import LANGUAGE_ALIASES, sanitize_ai_prompt
+from app.services.source_analysis import analyze_python
+from app.singleflight import SingleFlight
 
 # ---------------------------------------------------------------------------
 # Internal Schemas for AI Output
@@ -42,6 +49,17 @@ class GeneratedProblemTests(BaseModel):
     reference_solution: str = Field(..., description="A complete, correct Python solution (function definition + optional helper logic).")
     harness_code: str = Field(..., description="A Python script that reads stdin, parses inputs, calls the function, and prints the result.")
 
+class CachedTestSuite(BaseModel):
+    """A generated suite plus the reference outputs computed for it so far."""
+    cache_key: str
+    suite: GeneratedProblemTests
+    # Fingerprint of ``suite``; reference outputs are only merged into the same suite
+    suite_hash: str = ""
+    # Stripped reference stdout keyed by test input; only successful runs are kept
+    expected_outputs: Dict[str, str] = Field(default_factory=dict)
+    # Model that generated the suite
+    model_name: Optional[str] = None
+
 # ---------------------------------------------------------------------------
 # Agent Configuration
 # ---------------------------------------------------------------------------
@@ -64,43 +82,142 @@ SYSTEM_PROMPT: str = (
     "Crucial Requirement: The harness script should assume the function definition is already present in the environment."
 )
 
-def _make_tester_agent() -> Agent[None, GeneratedProblemTests]:
+def _make_tester_agent(model_name: str) -> Agent[None, GeneratedProblemTests]:
     """Build the AI agent that generates test cases."""
-    cerebras_key = getattr(settings, "CEREBRAS_API_KEY", "") or ""
-    if not cerebras_key:
-        raise ValueError("CEREBRAS_API_KEY is not set.")
-
-    model_name = getattr(settings, "CEREBRAS_MODEL", "") or "qwen-3-235b-a22b-instruct-2507"
-    model = CerebrasModel(
-        model_name,
-        provider=CerebrasProvider(api_key=cerebras_key),
-    )
-    # Disable strict tool definitions to avoid "mixed values for strict" error
-    model._profile = OpenAIModelProfile(openai_supports_strict_tool_definition=False)
-
     return Agent(
-        model,
+        # Disable strict tool definitions to avoid "mixed values for strict" error
+        llm.build_model(model_name, strict_tools=False),
         output_type=GeneratedProblemTests,
         system_prompt=SYSTEM_PROMPT,
         retries=3
     )
 
 # ---------------------------------------------------------------------------
-# Service Logic
+# Test Suite Cache
 # ---------------------------------------------------------------------------
 
-async def run_ai_tests(
-    problem_description: str,
-    user_code: str,
-    language: str
-) -> AITestExecutionResponse:
-    """Generate tests via AI and execute them against user and reference code."""
-    
-    # Try to extract all class and function names to handle helpers/boilerplate/LeetCode style
+# Hot suites kept in memory in front of the ai_test_suites table.
+_suite_cache: LRUCache[str, CachedTestSuite] = LRUCache(maxsize=256)
+
+# In-flight generations, so concurrent misses for one key share an LLM call.
+_suite_flight: SingleFlight[CachedTestSuite] = SingleFlight("ai_test_suite")
+
+# Upper bound on sandbox processes one AI test run may have in flight.
+MAX_CONCURRENT_RUNS: int = 4
+
+
+def _detect_signature(user_code: str, language: str = "python") -> Tuple[List[str], List[str]]:
+    """Extract class and function names to handle helpers/boilerplate/LeetCode style.
+
+    Python is read from the shared syntax-tree analysis (top-level classes,
+    their methods and top-level functions); other languages, and Python that
+    doesn't parse, fall back to matching ``class``/``def`` in the text.
+    """
+    if language.lower() == "python":
+        analysis = analyze_python(user_code)
+        if analysis.parsed:
+            methods = [name for names in analysis.methods.values() for name in names]
+            return list(analysis.classes), [*methods, *analysis.functions]
     found_classes = re.findall(r"class\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[:\(]", user_code)
     found_functions = re.findall(r"def\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(", user_code)
-    
-    agent = _make_tester_agent()
+    return found_classes, found_functions
+
+
+def suite_cache_key(
+    problem_description: str, found_classes: List[str], found_functions: List[str], language: str = "python"
+) -> str:
+    """Derive the cache key for a generated test suite.
+
+    The description is whitespace-normalized, the signature is order- and
+    duplicate-insensitive and the language is lower-cased with aliases
+    resolved, so cosmetic differences in any of them still hit the cache.
+    """
+    normalized = " ".join(problem_description.split())
+    signature = f"classes={','.join(sorted(set(found_classes)))};functions={','.join(sorted(set(found_functions)))}"
+    lang = language.lower()
+    lang = LANGUAGE_ALIASES.get(lang, lang)
+    return hashlib.sha256(f"{lang}\x00{normalized}\x00{signature}".encode("utf-8")).hexdigest()
+
+
+def suite_hash(suite: GeneratedProblemTests) -> str:
+    """Fingerprint a generated suite, so outputs can't outlive a regeneration."""
+    return hashlib.sha256(json.dumps(suite.model_dump(), sort_keys=True).encode("utf-8")).hexdigest()
+
+
+async def _load_suite(cache_key: str) -> Optional[CachedTestSuite]:
+    """Return a cached suite from memory or Postgres, or None."""
+    cached = _suite_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    async with async_session() as db:
+        result = await db.execute(
+            select(AITestSuite.suite, AITestSuite.suite_hash, AITestSuite.expected_outputs, AITestSuite.model_name)
+            .where(AITestSuite.cache_key == cache_key)
+        )
+        row = result.one_or_none()
+    if row is None:
+        return None
+
+    cached = CachedTestSuite(
+        cache_key=cache_key,
+        suite=GeneratedProblemTests.model_validate(row.suite),
+        suite_hash=row.suite_hash,
+        expected_outputs=row.expected_outputs or {},
+        model_name=row.model_name,
+    )
+    _suite_cache.set(cache_key, cached)
+    return cached
+
+
+async def _store_suite(cache_key: str, suite: GeneratedProblemTests, model_name: str) -> CachedTestSuite:
+    """Persist a suite, replacing any previous one (and its outputs) for the same key."""
+    cached = CachedTestSuite(cache_key=cache_key, suite=suite, suite_hash=suite_hash(suite), model_name=model_name)
+    _suite_cache.set(cache_key, cached)
+    stmt = pg_insert(AITestSuite).values(
+        cache_key=cache_key,
+        suite=suite.model_dump(),
+        suite_hash=cached.suite_hash,
+        expected_outputs={},
+        model_name=model_name,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AITestSuite.cache_key],
+        set_={
+            "suite": stmt.excluded.suite,
+            "suite_hash": stmt.excluded.suite_hash,
+            "expected_outputs": stmt.excluded.expected_outputs,
+            "model_name": stmt.excluded.model_name,
+            "updated_at": func.now(),
+        },
+    )
+    async with async_session() as db:
+        await db.execute(stmt)
+        await db.commit()
+    return cached
+
+
+async def _store_expected_outputs(cached: CachedTestSuite, new_outputs: Dict[str, str]) -> None:
+    """Merge newly computed reference outputs into the cached suite.
+
+    The UPDATE only matches the suite the outputs were computed for, so a run
+    that finishes after a regeneration can't merge stale outputs into it.
+    """
+    cached.expected_outputs.update(new_outputs)
+    async with async_session() as db:
+        await db.execute(
+            update(AITestSuite)
+            .where(AITestSuite.cache_key == cached.cache_key, AITestSuite.suite_hash == cached.suite_hash)
+            .values(expected_outputs=AITestSuite.expected_outputs.op("||")(new_outputs))
+        )
+        await db.commit()
+
+
+async def _generate_suite(
+    problem_description: str, found_classes: List[str], found_functions: List[str], model_name: str
+) -> GeneratedProblemTests:
+    """Ask the tester agent for test cases, a reference solution and a harness."""
+    agent = llm.get_agent("ai_tester", _make_tester_agent, model_name)
     # Generate tests and reference solution, providing hint(s) for the context
     classes_str = ", ".join(f"'{c}'" for c in found_classes) if found_classes else "None found"
     functions_str = ", ".join(f"'{f}'" for f in found_functions) if found_functions else "None found"
@@ -119,62 +236,126 @@ async def run_ai_tests(
     safe_prompt = sanitize_ai_prompt(prompt, max_length=5000)
     
     try:
-        result = await agent.run(safe_prompt)
+        result = await llm.run_agent("ai_tester", agent, safe_prompt, model_name)
     except UnexpectedModelBehavior as e:
         # UnexpectedModelBehavior often contains details about what went wrong
         raise ValueError(f"AI Test Generation Failed (Validation): {str(e)}")
     except Exception as e:
         raise ValueError(f"AI Test Generation Failed: {type(e).__name__}: {str(e)}")
 
-    ai_data: GeneratedProblemTests = result.output
-    
+    return result.output
+
+
+async def get_test_suite(
+    problem_description: str, user_code: str, regenerate: bool = False, language: str = "python"
+) -> CachedTestSuite:
+    """Return the test suite for a problem, generating it only on a cache miss.
+
+    Args:
+        problem_description: The problem statement to generate tests for.
+        user_code: The user's code, used to detect the class/function signature.
+        regenerate: Skip the cache lookup and replace the stored suite.
+        language: The language of ``user_code``.
+
+    Returns:
+        The cached or freshly generated suite with any known reference outputs.
+    """
+    found_classes, found_functions = _detect_signature(user_code, language)
+    cache_key = suite_cache_key(problem_description, found_classes, found_functions, language)
+
+    if not regenerate:
+        cached = await _load_suite(cache_key)
+        if cached is not None:
+            return cached
+
+    async def _generate_and_store() -> CachedTestSuite:
+        model_name = llm.route("ai_tester")
+        suite = await _generate_suite(problem_description, found_classes, found_functions, model_name)
+        return await _store_suite(cache_key, suite, model_name)
+
+    return await _suite_flight.do(cache_key, _generate_and_store)
+
+
+# ---------------------------------------------------------------------------
+# Service Logic
+# ---------------------------------------------------------------------------
+
+async def run_ai_tests(
+    problem_description: str,
+    user_code: str,
+    language: str,
+    regenerate: bool = False
+) -> AITestExecutionResponse:
+    """Generate (or reuse cached) tests and execute them against user and reference code."""
+    cached = await get_test_suite(problem_description, user_code, regenerate, language)
+    ai_data = cached.suite
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_RUNS)
+
+    async def _run(run_language: str, code: str, input_data: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await CodeExecutor.run(run_language, code, input_data)
+
+    # Combine reference code (function def) and harness; append the same
+    # harness to the user's definitions.
+    ref_full_code = f"{ai_data.reference_solution}\n\n{ai_data.harness_code}"
+    user_full_code = f"{user_code}\n\n{ai_data.harness_code}"
+
+    # The reference only runs for inputs with no stored expected output, and
+    # those runs share the sandbox with the user runs instead of preceding them.
+    missing_inputs = list(dict.fromkeys(
+        test.input_data for test in ai_data.test_cases
+        if test.input_data not in cached.expected_outputs
+    ))
+    user_runs = [_run(language, user_full_code, test.input_data) for test in ai_data.test_cases]
+    ref_runs = [_run("python", ref_full_code, input_data) for input_data in missing_inputs]
+    outcomes = await asyncio.gather(*user_runs, *ref_runs)
+    user_execs = outcomes[:len(user_runs)]
+    ref_execs = dict(zip(missing_inputs, outcomes[len(user_runs):]))
+
+    new_outputs = {
+        input_data: ref_exec.get("stdout", "").strip()
+        for input_data, ref_exec in ref_execs.items()
+        if ref_exec.get("exit_code") == 0
+    }
+    if new_outputs:
+        await _store_expected_outputs(cached, new_outputs)
+
     test_results: List[AITestResult] = []
     passed_count = 0
-    
-    for test in ai_data.test_cases:
-        # 1. Run Reference Solution to get expected output
-        # Combine reference code (function def) and harness
-        ref_full_code = f"{ai_data.reference_solution}\n\n{ai_data.harness_code}"
-
-        ref_exec = await CodeExecutor.run("python", ref_full_code, test.input_data)
-        
-        if ref_exec.get("exit_code") != 0:
+
+    for test, user_exec in zip(ai_data.test_cases, user_execs):
+        exit_code = user_exec.get("exit_code", 1)
+        expected_output = cached.expected_outputs.get(test.input_data)
+
+        if expected_output is None:
             # If reference solution fails, we might have a bad AI generation
             # We'll record this as a failure for the test case with a note
             expected_output = "ERROR: AI Reference Solution Failed"
             actual_output = ""
             passed = False
-            stderr = f"Reference Error: {ref_exec.get('stderr')}"
+            stderr = f"Reference Error: {ref_execs[test.input_data].get('stderr')}"
         else:
-            expected_output = ref_exec.get("stdout", "").strip()
-            
-            # 2. Run User Code
-            # Append the AI's harness to the user's function definition
-            user_full_code = f"{user_code}\n\n{ai_data.harness_code}"
-            user_exec = await CodeExecutor.run(language, user_full_code, test.input_data)
             actual_output = user_exec.get("stdout", "").strip()
             stderr = user_exec.get("stderr")
-            
-            # 3. Validate
-            exit_code = user_exec.get("exit_code", 1)
             # Match if exit code is 0 and output is same (ignoring trailing whitespace)
             passed = (exit_code == 0) and (actual_output == expected_output)
-            
+
         if passed:
             passed_count += 1
-            
+
         test_results.append(AITestResult(
             input_data=test.input_data,
             expected_output=expected_output,
             actual_output=actual_output,
             passed=passed,
             stderr=stderr,
-            exit_code=user_exec.get("exit_code", 1) if 'user_exec' in locals() else 1
+            exit_code=exit_code
         ))
-        
+
     summary = f"{passed_count}/{len(ai_data.test_cases)} Tests Passed"
-    
+
     return AITestExecutionResponse(
         results=test_results,
-        summary=summary
+        summary=summary,
+        model_used=cached.model_name
     )
@@ -0,0 +1,168 @@
+"""Write-behind persistence of judged submissions as problem attempts.
+
+The judging endpoints can save the run as a ``ProblemAttempt`` themselves
+instead of the client re-uploading code and results to ``POST /attempts``.
+Rows are queued in memory and a single flusher task writes them in batches,
+one multi-row INSERT and one commit per batch (group commit), every
+``FLUSH_INTERVAL_SECONDS`` or as soon as ``MAX_BATCH_ROWS`` are waiting.
+
+Attempt ids are reserved from the table's sequence in blocks, so the
+response carries the id without waiting for the flush. The trade-off of
+write-behind: an attempt becomes readable up to one flush interval after
+the response, and rows still queued are lost if the process dies without
+shutting down (``shutdown`` flushes them).
+"""
+
+from __future__ import annotations
+
+# Built-In Imports.
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+# External Imports.
+from sqlalchemy import insert, text
+from sqlalchemy.exc import IntegrityError
+
+# Local Imports.
+from app import metrics
+from app.database import async_session
+from app.models import ProblemAttempt
+from app.schemas import ProblemAttemptCreate
+from app.services.flash_card_service import mark_stale, schedule_update
+
+FLUSH_INTERVAL_SECONDS: float = 0.05
+MAX_BATCH_ROWS: int = 100
+# Ids reserved from the sequence per round trip.
+ID_BLOCK_SIZE: int = 50
+# Wait before retrying a batch after a database error.
+RETRY_DELAY_SECONDS: float = 1.0
+# How long shutdown waits for the queue to drain.
+SHUTDOWN_TIMEOUT_SECONDS: float = 10.0
+
+_RESERVE_IDS = text(
+    "SELECT nextval(pg_get_serial_sequence('problem_attempts', 'id')) "
+    "FROM generate_series(1, :count)"
+)
+
+_reserved_ids: Deque[int] = deque()
+_reserve_lock = asyncio.Lock()
+_pending: List[Dict[str, Any]] = []
+_wake = asyncio.Event()
+_flusher: Optional["asyncio.Task[None]"] = None
+
+
+async def _next_id() -> int:
+    """Return an unused attempt id, reserving a new block when needed."""
+    if not _reserved_ids:
+        async with _reserve_lock:
+            if not _reserved_ids:
+                async with async_session() as db:
+                    ids = (await db.execute(_RESERVE_IDS, {"count": ID_BLOCK_SIZE})).scalars().all()
+                _reserved_ids.extend(ids)
+    return _reserved_ids.popleft()
+
+
+async def enqueue(user_id: int, attempt: ProblemAttemptCreate) -> int:
+    """Queue an attempt for the next group commit.
+
+    Args:
+        user_id: The owner of the attempt.
+        attempt: The attempt to save.
+
+    Returns:
+        The id the attempt will have once flushed.
+    """
+    global _flusher
+    attempt_id = await _next_id()
+    _pending.append({**attempt.model_dump(), "id": attempt_id, "user_id": user_id})
+    if _flusher is None or _flusher.done():
+        _flusher = asyncio.create_task(_run_flusher())
+    if len(_pending) >= MAX_BATCH_ROWS:
+        _wake.set()
+    return attempt_id
+
+
+async def _run_flusher() -> None:
+    """Flush queued attempts until the queue stays empty."""
+    while _pending:
+        try:
+            await asyncio.wait_for(_wake.wait(), FLUSH_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wake.clear()
+        try:
+            flushed = await _flush()
+        except Exception:
+            # _flush requeues what it could not write; keep the loop alive.
+            metrics.increment("attempt_flush_errors_total")
+            flushed = False
+        if not flushed:
+            await asyncio.sleep(RETRY_DELAY_SECONDS)
+
+
+async def _flush() -> bool:
+    """Write one batch in one transaction.
+
+    Returns:
+        False if the database was unavailable and the batch was requeued.
+    """
+    batch = _pending[:MAX_BATCH_ROWS]
+    del _pending[:len(batch)]
+    if not batch:
+        return True
+
+    started = time.perf_counter()
+    try:
+        failed_users = await _insert(batch)
+    except IntegrityError:
+        # One bad row (e.g. its user was deleted) must not block the rest.
+        failed_users = set()
+        for index, row in enumerate(batch):
+            try:
+                failed_users |= await _insert([row])
+            except IntegrityError:
+                metrics.increment("attempt_writes_total", outcome="dropped")
+            except Exception:
+                # Database went away mid-fallback: keep the unwritten rows.
+                remaining = batch[index:]
+                _pending[:0] = remaining
+                metrics.increment("attempt_writes_total", len(remaining), outcome="retry")
+                for user_id in failed_users:
+                    schedule_update(user_id)
+                return False
+    except Exception:
+        _pending[:0] = batch
+        metrics.increment("attempt_writes_total", len(batch), outcome="retry")
+        return False
+
+    metrics.observe("attempt_flush_seconds", time.perf_counter() - started)
+    for user_id in failed_users:
+        schedule_update(user_id)
+    return True
+
+
+async def _insert(rows: List[Dict[str, Any]]) -> set[int]:
+    """Insert rows and mark flash cards stale; returns users with failures."""
+    failed_users = {row["user_id"] for row in rows if not row["passed"]}
+    async with async_session() as db:
+        await db.execute(insert(ProblemAttempt), rows)
+        for user_id in failed_users:
+            await mark_stale(db, user_id)
+        await db.commit()
+    metrics.increment("attempt_writes_total", len(rows), outcome="ok")
+    return failed_users
+
+
+async def shutdown() -> None:
+    """Flush queued attempts (app shutdown), waiting up to SHUTDOWN_TIMEOUT_SECONDS."""
+    if _flusher is None or _flusher.done():
+        return
+    _wake.set()
+    try:
+        await asyncio.wait_for(_flusher, SHUTDOWN_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        # Database unreachable; whatever is left cannot be saved.
+        metrics.increment("attempt_writes_total", len(_pending), outcome="dropped")
+        _pending.clear()
@@ -20,8 +20,53 @@ TEMP_DIR.mkdir(parents=True, exist_ok=True)
 
 import asyncio
 import psutil
+import signal
 import time
 
+# Limits applied to every sandboxed run.
+TIME_LIMIT_SECONDS: int = 5
+MEMORY_LIMIT_MB: int = 250
+
+# Limits for compiling C++; template-heavy code needs more than a run does.
+COMPILE_TIME_LIMIT_SECONDS: int = 10
+COMPILE_MEMORY_LIMIT_MB: int = 1024
+
+# Run each program in its own session (and so its own process group) on
+# POSIX, so killing the group also takes down anything it spawned.
+NEW_SESSION: bool = os.name != "nt"
+
+
+def _kill_process_tree(process: Any) -> None:
+    """Kill a sandboxed process and everything it started.
+
+    On POSIX the whole process group is killed; elsewhere the process and its
+    known children are killed one by one.
+    """
+    if NEW_SESSION:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    else:
+        try:
+            p = psutil.Process(process.pid)
+            for child in p.children(recursive=True):
+                try:
+                    child.kill()
+                except psutil.NoSuchProcess:
+                    pass
+            try:
+                p.kill()
+            except psutil.NoSuchProcess:
+                pass
+        except Exception:
+            pass
+    try:
+        process.kill()
+    except OSError:
+        pass
+
+
 async def execute_with_limits(cmd: list[str], input_data: str, timeout: int = 5, max_memory_mb: int = 250, shell: bool = False) -> Dict[str, Any]:
     """Runs a command with timeout and memory limits asynchronously.
     
@@ -34,6 +79,10 @@ async def execute_with_limits(cmd: list[str], input_data: str, timeout: int = 5,
         
     Returns:
         A dictionary containing stdout, stderr, and exit_code.
+
+    Raises:
+        asyncio.CancelledError: If the caller is cancelled (e.g. the client
+            disconnected); the process group is killed first.
     """
     import sys
     env = {**os.environ, "PYTHONIOENCODING": "utf-8", "PYTHONUNBUFFERED": "1"}
@@ -47,7 +96,8 @@ async def execute_with_limits(cmd: list[str], input_data: str, timeout: int = 5,
                     stdin=asyncio.subprocess.PIPE,
                     stdout=asyncio.subprocess.PIPE,
                     stderr=asyncio.subprocess.PIPE,
-                    env=env
+                    env=env,
+                    start_new_session=NEW_SESSION
                 )
             else:
                 process = await asyncio.create_subprocess_exec(
@@ -55,7 +105,8 @@ async def execute_with_limits(cmd: list[str], input_data: str, timeout: int = 5,
                     stdin=asyncio.subprocess.PIPE,
                     stdout=asyncio.subprocess.PIPE,
                     stderr=asyncio.subprocess.PIPE,
-                    env=env
+                    env=env,
+                    start_new_session=NEW_SESSION
                 )
             is_async_proc = True
         except NotImplementedError:
@@ -68,7 +119,8 @@ async def execute_with_limits(cmd: list[str], input_data: str, timeout: int = 5,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
                     env=env,
-                    shell=True
+                    shell=True,
+                    start_new_session=NEW_SESSION
                 )
             else:
                 process = subprocess.Popen(
@@ -76,7 +128,8 @@ async def execute_with_limits(cmd: list[str], input_data: str, timeout: int = 5,
                     stdin=subprocess.PIPE,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
-                    env=env
+                    env=env,
+                    start_new_session=NEW_SESSION
                 )
             is_async_proc = False
     except Exception as e:
@@ -98,19 +151,7 @@ async def execute_with_limits(cmd: list[str], input_data: str, timeout: int = 5,
                         pass
                 
                 if current_mem > max_memory_bytes:
-                    for child in children:
-                        try:
-                            child.kill()
-                        except psutil.NoSuchProcess:
-                            pass
-                    try:
-                        p.kill()
-                    except psutil.NoSuchProcess:
-                        pass
-                    try:
-                        process.kill()
-                    except OSError:
-                        pass
+                    _kill_process_tree(process)
                     return True
             except psutil.NoSuchProcess:
                 break
@@ -166,25 +207,9 @@ async def execute_with_limits(cmd: list[str], input_data: str, timeout: int = 5,
         if not mem_task.done():
             mem_task.cancel()
             
+        # Also reached on cancellation, so an abandoned run never outlives its request.
         if limit_reason or (process.returncode if is_async_proc else process.poll()) is None:
-            try:
-                p = psutil.Process(process.pid)
-                for child in p.children(recursive=True):
-                    try:
-                        child.kill()
-                    except psutil.NoSuchProcess:
-                        pass
-                try:
-                    p.kill()
-                except psutil.NoSuchProcess:
-                    pass
-            except Exception:
-                pass
-                
-            try:
-                process.kill()
-            except OSError:
-                pass
+            _kill_process_tree(process)
 
     if limit_reason:
         return {
@@ -239,17 +264,16 @@ class CodeExecutor:
         file_path: Path = TEMP_DIR / f"{job_id}.py"
         file_path.write_text(code, encoding="utf-8")
 
-        result = await execute_with_limits(
-            ["python", str(file_path)],
-            input_data,
-            timeout=5,
-            max_memory_mb=250
-        )
-        
-        if file_path.exists():
-            os.remove(file_path)
-            
-        return result
+        try:
+            return await execute_with_limits(
+                ["python", str(file_path)],
+                input_data,
+                timeout=TIME_LIMIT_SECONDS,
+                max_memory_mb=MEMORY_LIMIT_MB
+            )
+        finally:
+            if file_path.exists():
+                os.remove(file_path)
 
     @staticmethod
     async def _run_cpp(job_id: str, code: str, input_data: str) -> Dict[str, Any]:
@@ -262,38 +286,33 @@ class CodeExecutor:
         )
         source_path.write_text(code, encoding="utf-8")
 
-        # Compile synchronously or async? We can just use traditional subprocess.run for compiling
-        # since compile times are short and we don't necessarily limit memory here.
-        # But for stability, 10s compile timeout is good.
-        compile_res = subprocess.run(
-            ["g++", str(source_path), "-o", str(exec_path)],
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-        )
-
-        if compile_res.returncode != 0:
+        try:
+            # Compiled in the sandbox too, so a slow or stuck g++ neither
+            # blocks the event loop nor outlives its time limit.
+            compile_res = await execute_with_limits(
+                ["g++", str(source_path), "-o", str(exec_path)],
+                "",
+                timeout=COMPILE_TIME_LIMIT_SECONDS,
+                max_memory_mb=COMPILE_MEMORY_LIMIT_MB
+            )
+            if compile_res["exit_code"] != 0:
+                return {
+                    "stdout": "",
+                    "stderr": compile_res["stderr"],
+                    "exit_code": compile_res["exit_code"],
+                }
+
+            return await execute_with_limits(
+                [str(exec_path)],
+                input_data,
+                timeout=TIME_LIMIT_SECONDS,
+                max_memory_mb=MEMORY_LIMIT_MB
+            )
+        finally:
             if source_path.exists():
                 os.remove(source_path)
-            return {
-                "stdout": "",
-                "stderr": compile_res.stderr,
-                "exit_code": compile_res.returncode,
-            }
-
-        result = await execute_with_limits(
-            [str(exec_path)],
-            input_data,
-            timeout=5,
-            max_memory_mb=250
-        )
-
-        if source_path.exists():
-            os.remove(source_path)
-        if exec_path.exists():
-            os.remove(exec_path)
-
-        return result
+            if exec_path.exists():
+                os.remove(exec_path)
 
     @staticmethod
     async def _run_go(job_id: str, code: str, input_data: str) -> Dict[str, Any]:
@@ -302,15 +321,14 @@ class CodeExecutor:
         abs_path: str = str(file_path.absolute())
         file_path.write_text(code, encoding="utf-8")
 
-        result = await execute_with_limits(
-            ["go", "run", abs_path],
-            input_data,
-            timeout=5,  # Reduced to 5 per user instructions
-            max_memory_mb=250,
-            shell=True if os.name == "nt" else False
-        )
-
-        if file_path.exists():
-            os.remove(file_path)
-
-        return result
+        try:
+            return await execute_with_limits(
+                ["go", "run", abs_path],
+                input_data,
+                timeout=TIME_LIMIT_SECONDS,  # Reduced to 5 per user instructions
+                max_memory_mb=MEMORY_LIMIT_MB,
+                shell=True if os.name == "nt" else False
+            )
+        finally:
+            if file_path.exists():
+                os.remove(file_path)
@@ -0,0 +1,303 @@
+"""Local catalog of DSA practice problems learned from AI searches.
+
+Every problem returned by the DSA search agent is stored in the dsa_catalog
+table and mirrored into an in-memory inverted index over topic and title
+tokens. Searches whose terms are all covered by enough catalog problems are
+answered from the index in well under a millisecond; only poorly covered
+queries fall through to the (multi-second) agent and Tavily.
+
+Rows written by other workers are picked up by a periodic refresh. A query
+that misses the index may also trigger one, at most once every
+REFRESH_MIN_INTERVAL_SECONDS, so a burst of misses doesn't hit Postgres
+on every request.
+"""
+
+from __future__ import annotations
+
+# Built-In Imports.
+import asyncio
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+# External Imports.
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+# Local Imports.
+from app import metrics
+from app.database import async_session
+from app.models import DSACatalogProblem
+from app.schemas import DSAProblem, DSASearchResponse, DSASearchResult
+from app.services.problem_ingestion import normalize_problem_url
+
+# A query is answered locally only if at least this many distinct problems
+# match every query term; results are capped at MAX_CATALOG_RESULTS.
+MIN_CATALOG_RESULTS: int = 5
+MAX_CATALOG_RESULTS: int = 10
+
+# Words that say nothing about the topic ("top graph problems").
+STOPWORDS: Set[str] = {
+    "a", "an", "and", "the", "of", "for", "in", "on", "to", "with", "using",
+    "dsa", "problem", "question", "practice", "top", "best", "list", "leetcode",
+}
+DIFFICULTIES: Set[str] = {"easy", "medium", "hard"}
+
+# updated_at is the writing transaction's start time, so a row can commit
+# after rows stamped later. Refreshes re-read this much history to catch it.
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+# Period of the background refresh, and the minimum gap between refreshes
+# triggered by index misses.
+REFRESH_INTERVAL_SECONDS: float = 60.0
+REFRESH_MIN_INTERVAL_SECONDS: float = 10.0
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _stem(token: str) -> str:
+    """Cheap plural folding so "graphs" and "graph" match."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase, plural-folded tokens, dropping stopwords."""
+    tokens = (_stem(token) for token in _TOKEN_RE.findall(text.lower()))
+    return [token for token in tokens if token not in STOPWORDS]
+
+
+@dataclass
+class CatalogEntry:
+    """One (problem, topic) row held in memory."""
+
+    id: int
+    title: str
+    url: str
+    difficulty: str
+    topic: str
+
+
+class CatalogIndex:
+    """In-memory inverted index over catalog topics and titles.
+
+    Not thread-safe; intended for use from a single asyncio event loop.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[int, CatalogEntry] = {}
+        self._topic_postings: Dict[str, Set[int]] = {}
+        self._title_postings: Dict[str, Set[int]] = {}
+
+    def add(self, entry: CatalogEntry) -> None:
+        """Index an entry, replacing any previous version with the same id."""
+        self.remove(entry.id)
+        self._entries[entry.id] = entry
+        for token in tokenize(entry.topic):
+            self._topic_postings.setdefault(token, set()).add(entry.id)
+        for token in tokenize(entry.title):
+            self._title_postings.setdefault(token, set()).add(entry.id)
+
+    def get(self, entry_id: int) -> Optional[CatalogEntry]:
+        """Return the indexed entry with this id, if any."""
+        return self._entries.get(entry_id)
+
+    def remove(self, entry_id: int) -> None:
+        """Drop an entry from the index if present."""
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for postings, text in ((self._topic_postings, entry.topic), (self._title_postings, entry.title)):
+            for token in tokenize(text):
+                ids = postings.get(token)
+                if ids is not None:
+                    ids.discard(entry_id)
+                    if not ids:
+                        del postings[token]
+
+    def search(self, query: str) -> Optional[DSASearchResponse]:
+        """Answer a query from the catalog, or None if coverage is poor.
+
+        Every non-difficulty query term must appear in an entry's topic or
+        title. Topic matches rank above title matches; a difficulty word in
+        the query ("easy graph") filters by difficulty.
+        """
+        tokens = tokenize(query)
+        difficulties = {token for token in tokens if token in DIFFICULTIES}
+        terms = list(dict.fromkeys(token for token in tokens if token not in DIFFICULTIES))
+        if not terms:
+            return None
+
+        scores: Dict[int, int] = {}
+        candidates: Optional[Set[int]] = None
+        for term in terms:
+            topic_ids = self._topic_postings.get(term, set())
+            title_ids = self._title_postings.get(term, set())
+            matched = topic_ids | title_ids
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                return None
+            for entry_id in topic_ids:
+                scores[entry_id] = scores.get(entry_id, 0) + 2
+            for entry_id in title_ids:
+                scores[entry_id] = scores.get(entry_id, 0) + 1
+
+        best: Dict[str, tuple[int, CatalogEntry]] = {}
+        for entry_id in candidates or ():
+            entry = self._entries[entry_id]
+            if difficulties and entry.difficulty.lower() not in difficulties:
+                continue
+            # The same problem may be indexed under several topics.
+            if entry.url not in best or scores[entry_id] > best[entry.url][0]:
+                best[entry.url] = (scores[entry_id], entry)
+
+        if len(best) < MIN_CATALOG_RESULTS:
+            return None
+
+        ranked = sorted(best.values(), key=lambda item: (-item[0], item[1].title))[:MAX_CATALOG_RESULTS]
+        topic = Counter(entry.topic for _, entry in ranked).most_common(1)[0][0]
+        return DSASearchResponse(
+            topic=topic,
+            problems=[
+                DSAProblem(title=entry.title, url=entry.url, difficulty=entry.difficulty)
+                for _, entry in ranked
+            ],
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_index = CatalogIndex()
+# Highest updated_at loaded from Postgres, for incremental refreshes.
+_loaded_until: Optional[datetime] = None
+# time.monotonic() when the last refresh started.
+_refreshed_at: Optional[float] = None
+_refresher: Optional[asyncio.Task[None]] = None
+
+
+def search(query: str) -> Optional[DSASearchResponse]:
+    """Answer a query from the in-memory catalog, or None if coverage is poor."""
+    return _index.search(query)
+
+
+async def refresh() -> int:
+    """Load catalog rows added or updated since the last refresh.
+
+    Picks up problems learned by other workers. Called at startup, every
+    REFRESH_INTERVAL_SECONDS by the background refresher, and (throttled)
+    on index misses via ``refresh_if_stale``. Rows from the last
+    REFRESH_OVERLAP before the watermark are re-read; those already indexed
+    unchanged are skipped.
+
+    Returns:
+        The number of entries that were new or changed, so callers only
+        re-search when the index actually changed.
+    """
+    global _loaded_until, _refreshed_at
+    _refreshed_at = time.monotonic()
+    query = select(DSACatalogProblem)
+    if _loaded_until is not None:
+        query = query.where(DSACatalogProblem.updated_at > _loaded_until - REFRESH_OVERLAP)
+    async with async_session() as db:
+        rows = (await db.execute(query)).scalars().all()
+
+    changed = 0
+    for row in rows:
+        entry = CatalogEntry(row.id, row.title, row.url, row.difficulty, row.topic)
+        if _index.get(row.id) != entry:
+            _index.add(entry)
+            changed += 1
+        if _loaded_until is None or row.updated_at > _loaded_until:
+            _loaded_until = row.updated_at
+    return changed
+
+
+async def refresh_if_stale() -> int:
+    """Refresh after an index miss, unless a refresh started recently.
+
+    Misses within REFRESH_MIN_INTERVAL_SECONDS of the last refresh (including
+    one still running) return at once; the periodic refresh keeps the index
+    fresh between them.
+
+    Returns:
+        The number of new or changed entries; 0 if the refresh was skipped.
+    """
+    if _refreshed_at is not None and time.monotonic() - _refreshed_at < REFRESH_MIN_INTERVAL_SECONDS:
+        metrics.increment("dsa_catalog_refreshes_total", trigger="miss", outcome="throttled")
+        return 0
+    changed = await refresh()
+    metrics.increment("dsa_catalog_refreshes_total", trigger="miss", outcome="ok")
+    return changed
+
+
+async def _refresh_periodically() -> None:
+    """Refresh the index every REFRESH_INTERVAL_SECONDS."""
+    while True:
+        await asyncio.sleep(REFRESH_INTERVAL_SECONDS)
+        try:
+            await refresh()
+            metrics.increment("dsa_catalog_refreshes_total", trigger="periodic", outcome="ok")
+        except Exception:
+            # Keep serving the current index; the next period retries.
+            metrics.increment("dsa_catalog_refreshes_total", trigger="periodic", outcome="error")
+
+
+def start_refresher() -> None:
+    """Start the background refresh (app startup)."""
+    global _refresher
+    if _refresher is None or _refresher.done():
+        _refresher = asyncio.create_task(_refresh_periodically())
+
+
+async def shutdown() -> None:
+    """Stop the background refresh (app shutdown)."""
+    global _refresher
+    if _refresher is not None:
+        _refresher.cancel()
+        await asyncio.gather(_refresher, return_exceptions=True)
+    _refresher = None
+
+
+async def add_search_result(response: DSASearchResult) -> None:
+    """Store an agent search result in the catalog and index it."""
+    rows = {
+        (normalize_problem_url(problem.url), response.topic): {
+            "url": normalize_problem_url(problem.url),
+            "title": problem.title,
+            "difficulty": problem.difficulty,
+            "topic": response.topic,
+        }
+        for problem in response.problems
+        if problem.url.strip()
+    }
+    if not rows:
+        return
+
+    stmt = pg_insert(DSACatalogProblem).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_dsa_catalog_url_topic",
+        set_={
+            "title": stmt.excluded.title,
+            "difficulty": stmt.excluded.difficulty,
+            "updated_at": func.now(),
+        },
+    ).returning(
+        DSACatalogProblem.id,
+        DSACatalogProblem.title,
+        DSACatalogProblem.url,
+        DSACatalogProblem.difficulty,
+        DSACatalogProblem.topic,
+    )
+    async with async_session() as db:
+        stored = (await db.execute(stmt)).all()
+        await db.commit()
+
+    for row in stored:
+        _index.add(CatalogEntry(row.id, row.title, row.url, row.difficulty, row.topic))
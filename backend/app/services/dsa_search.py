@@ -2,24 +2,25 @@
 
 This module provides a service that uses a Cerebras-backed Pydantic AI agent
 equipped with the Tavily search tool to find high-quality DSA practice problems
-from across the web.
+from across the web. Queries already covered by the local problem catalog
+(see dsa_catalog.py) are answered without calling the agent.
 """
 
 from __future__ import annotations
 
 # Built-In Imports.
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 # External Imports.
 from pydantic_ai import Agent
-from pydantic_ai.models.cerebras import CerebrasModel
-from pydantic_ai.providers.cerebras import CerebrasProvider
-from pydantic_ai.profiles.openai import OpenAIModelProfile
 from pydantic_ai.common_tools.tavily import tavily_search_tool
 
 # Local Imports.
+from app import metrics
 from app.config import settings
-from app.schemas import DSASearchResponse
+from app.services import dsa_catalog, llm
+from app.singleflight import SingleFlight
+from app.schemas import DSASearchResponse, DSASearchResult
 from app.services.security_scanner import sanitize_ai_prompt
 
 if TYPE_CHECKING:
@@ -34,17 +35,17 @@ SYSTEM_PROMPT: str = (
     "and return them as a structured list with valid URLs."
 )
 
-DEFAULT_MODEL_NAME: str = "qwen-3-235b-a22b-instruct-2507"
-
-
-def _make_agent() -> Agent[None, DSASearchResponse]:
+def _make_agent(model_name: str) -> Agent[None, DSASearchResult]:
     """Build the Cerebras-backed DSA search agent with Tavily search tool.
 
     Uses CEREBRAS_API_KEY and TAVILY_API_KEY from settings.
     Raises ValueError if keys are missing.
 
+    Args:
+        model_name: The Cerebras model the agent calls.
+
     Returns:
-        A configured Agent that returns DSASearchResponse.
+        A configured Agent that returns DSASearchResult.
     """
     cerebras_key = getattr(settings, "CEREBRAS_API_KEY", "") or ""
     tavily_key = getattr(settings, "TAVILY_API_KEY", "") or ""
@@ -55,37 +56,33 @@ def _make_agent() -> Agent[None, DSASearchResponse]:
             "Add them to your .env to use DSA search."
         )
 
-    model_name = getattr(settings, "CEREBRAS_MODEL", "") or DEFAULT_MODEL_NAME
-    model = CerebrasModel(
-        model_name,
-        provider=CerebrasProvider(api_key=cerebras_key),
-    )
-    # Disable strict tool definitions to avoid "mixed values for strict" error with Cerebras
-    model._profile = OpenAIModelProfile(openai_supports_strict_tool_definition=False)
-
     return Agent(
-        model,
+        # Disable strict tool definitions to avoid "mixed values for strict" error with Cerebras
+        llm.build_model(model_name, strict_tools=False),
         tools=[tavily_search_tool(api_key=tavily_key)],
-        output_type=DSASearchResponse,
+        output_type=DSASearchResult,
         system_prompt=SYSTEM_PROMPT,
     )
 
 
-# Lazy singleton
-_agent: Agent[None, DSASearchResponse] | None = None
+_search_flight: SingleFlight[DSASearchResponse] = SingleFlight("dsa_search")
 
 
-def get_agent() -> Agent[None, DSASearchResponse]:
-    """Return the shared DSA search agent, creating it on first call."""
-    global _agent
-    if _agent is None:
-        _agent = _make_agent()
-    return _agent
+def get_agent(model_name: Optional[str] = None) -> Agent[None, DSASearchResult]:
+    """Return the shared DSA search agent for a model, creating it on first call."""
+    return llm.get_agent("dsa_search", _make_agent, model_name)
 
 
 async def run_dsa_search(query: str) -> DSASearchResponse:
     """Run the DSA problem search for the given query.
 
+    The local catalog is tried first (refreshed from Postgres on a miss, at
+    most every REFRESH_MIN_INTERVAL_SECONDS, to pick up problems learned by
+    other workers). Only when it covers the query poorly is the agent
+    called; its results are added to the catalog.
+    Concurrent agent searches for the same query (ignoring case and
+    whitespace) share one agent run.
+
     Args:
         query: The user's search query (e.g. 'Graph Traversal').
 
@@ -93,7 +90,22 @@ async def run_dsa_search(query: str) -> DSASearchResponse:
         A DSASearchResponse instance containing a list of problems.
     """
     safe_query = sanitize_ai_prompt(query, max_length=300)
-    agent = get_agent()
-    result = await agent.run(safe_query)
-    # result.output is an instance of DSASearchResponse
-    return result.output
+
+    local = dsa_catalog.search(safe_query)
+    if local is None and await dsa_catalog.refresh_if_stale():
+        local = dsa_catalog.search(safe_query)
+    if local is not None:
+        metrics.increment("dsa_search_total", source="catalog")
+        return local
+
+    metrics.increment("dsa_search_total", source="agent")
+    model_name = llm.route("dsa_search")
+    agent = get_agent(model_name)
+
+    async def _search() -> DSASearchResponse:
+        result = await llm.run_agent("dsa_search", agent, safe_query, model_name)
+        # result.output is an instance of DSASearchResult
+        await dsa_catalog.add_search_result(result.output)
+        return DSASearchResponse(**result.output.model_dump(), model_used=model_name)
+
+    return await _search_flight.do(" ".join(safe_query.lower().split()), _search)
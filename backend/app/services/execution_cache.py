@@ -0,0 +1,113 @@
+"""Opt-in cache of successful ``POST /execute`` results.
+
+Students often run the same code on the same stdin many times in a row. When
+``EXECUTION_CACHE_ENABLED`` is set, successful runs are remembered per
+(language, code hash, stdin hash, limits, toolchain version), so a repeat
+returns the stored result without spawning a process. Entries expire after
+``EXECUTION_CACHE_TTL_SECONDS``, and the least recently used are evicted once
+the stored output exceeds ``EXECUTION_CACHE_MAX_BYTES``.
+
+Only deterministic programs may be cached. Requests opt out with
+``"cache": false``. Python that imports a time or randomness module, and C++
+or Go that mentions one, is never cached.
+"""
+
+from __future__ import annotations
+
+# Built-In Imports.
+import asyncio
+import hashlib
+import re
+from typing import Any, Dict, Optional
+
+# Local Imports.
+from app import metrics
+from app.cache import TTLByteLRUCache
+from app.config import settings
+from app.services.compiler import MEMORY_LIMIT_MB, TIME_LIMIT_SECONDS
+from app.services.source_analysis import analyze_python
+
+# Commands reporting each toolchain's version; a compiler upgrade changes
+# the key, so results from the old toolchain are not served.
+TOOLCHAIN_VERSION_COMMANDS: Dict[str, list[str]] = {
+    "python": ["python", "--version"],
+    "cpp": ["g++", "--version"],
+    "golang": ["go", "version"],
+}
+
+# Python modules whose use makes output vary between runs.
+NONDETERMINISTIC_MODULES = frozenset({"random", "secrets", "time", "datetime", "uuid"})
+
+# Text that suggests time or randomness in the compiled languages.
+NONDETERMINISTIC_PATTERNS: Dict[str, re.Pattern[str]] = {
+    "cpp": re.compile(r"\b(?:s?rand|time|clock|chrono|random_device|mt19937(?:_64)?)\b"),
+    "golang": re.compile(r'"(?:math/rand(?:/v2)?|crypto/rand|time)"'),
+}
+
+_versions: Dict[str, Optional[str]] = {}
+_results: TTLByteLRUCache[str, Dict[str, Any]] = TTLByteLRUCache(
+    maxbytes=settings.EXECUTION_CACHE_MAX_BYTES,
+    ttl=settings.EXECUTION_CACHE_TTL_SECONDS,
+    sizeof=lambda result: len(result.get("stdout", "")) + len(result.get("stderr", "")),
+)
+
+
+async def toolchain_version(language: str) -> Optional[str]:
+    """Return the first line of the toolchain's version output, or None.
+
+    Looked up once per process and language.
+    """
+    if language in _versions:
+        return _versions[language]
+    version: Optional[str] = None
+    command = TOOLCHAIN_VERSION_COMMANDS.get(language)
+    if command is not None:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+            )
+            output, _ = await asyncio.wait_for(process.communicate(), timeout=10)
+            if process.returncode == 0 and output.strip():
+                version = output.decode("utf-8", errors="replace").splitlines()[0].strip()
+        except (OSError, asyncio.TimeoutError):
+            version = None
+    _versions[language] = version
+    return version
+
+
+def is_deterministic(language: str, code: str) -> bool:
+    """Return False if the code looks like it reads time or randomness."""
+    if language == "python":
+        analysis = analyze_python(code)
+        return analysis.parsed and not NONDETERMINISTIC_MODULES.intersection(analysis.imports)
+    pattern = NONDETERMINISTIC_PATTERNS.get(language)
+    return pattern is None or pattern.search(code) is None
+
+
+async def cache_key(language: str, code: str, input_data: str) -> Optional[str]:
+    """Return the cache key for a run, or None if it must not be cached."""
+    language = language.lower()
+    if not is_deterministic(language, code):
+        return None
+    version = await toolchain_version(language)
+    if version is None:
+        return None
+    code_hash = hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+    input_hash = hashlib.sha256(input_data.encode("utf-8", "surrogatepass")).hexdigest()
+    limits = f"{TIME_LIMIT_SECONDS}s/{MEMORY_LIMIT_MB}MB"
+    return hashlib.sha256(
+        f"{language}\x00{code_hash}\x00{input_hash}\x00{limits}\x00{version}".encode("utf-8")
+    ).hexdigest()
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    """Return a stored result, or None."""
+    result = _results.get(key)
+    metrics.increment("execution_cache_total", outcome="miss" if result is None else "hit")
+    return result
+
+
+def store(key: str, result: Dict[str, Any]) -> None:
+    """Remember a result if the run succeeded."""
+    if result.get("exit_code") == 0:
+        _results.set(key, dict(result))
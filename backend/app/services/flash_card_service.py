@@ -1,20 +1,31 @@
 """Service for generating personalized flash cards using AI.
 
 This module analyzes user's problem attempts (especially failures) to generate
-targeted flash cards for reinforcement.
+targeted flash cards for reinforcement. Each user's cards are precomputed and
+stored in generated_flashcard_sets; saving a failed attempt marks the set
+stale and schedules a background update that only feeds the new failures to
+the LLM.
 """
 
 from __future__ import annotations
-from typing import List, Optional
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
-from pydantic_ai.models.cerebras import CerebrasModel
-from pydantic_ai.providers.cerebras import CerebrasProvider
-from pydantic_ai.profiles.openai import OpenAIModelProfile
+from sqlalchemy import exists, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
 
-from app.config import settings
-from app.models import ProblemAttempt
+from app import metrics
+from app.database import async_session
+from app.models import GeneratedFlashCardSet, ProblemAttempt
 from app.schemas import FlashCard
+from app.services import llm
+
+# Attempts fed to one generation, and cards kept per user (newest first).
+ATTEMPT_WINDOW = 10
+MAX_STORED_CARDS = 20
 
 SYSTEM_PROMPT = (
     "You are a DSA mentor. Your task is to analyze a user's failed coding attempts "
@@ -28,28 +39,21 @@ SYSTEM_PROMPT = (
 class FlashCardList(BaseModel):
     cards: List[FlashCard]
 
-def _make_flashcard_agent() -> Agent[None, FlashCardList]:
-    cerebras_key = getattr(settings, "CEREBRAS_API_KEY", "") or ""
-    if not cerebras_key:
-        raise ValueError("CEREBRAS_API_KEY is not set.")
-
-    model_name = getattr(settings, "CEREBRAS_MODEL", "") or "qwen-3-235b-a22b-instruct-2507"
-    model = CerebrasModel(
-        model_name,
-        provider=CerebrasProvider(api_key=cerebras_key),
-    )
-    model._profile = OpenAIModelProfile(openai_supports_strict_tool_definition=False)
-
+def _make_flashcard_agent(model_name: str) -> Agent[None, FlashCardList]:
     return Agent(
-        model,
+        llm.build_model(model_name, strict_tools=False),
         output_type=FlashCardList,
         system_prompt=SYSTEM_PROMPT,
     )
 
-async def generate_flash_cards(attempts: List[ProblemAttempt]) -> List[FlashCard]:
-    """Generate flash cards from a list of problem attempts."""
+async def generate_flash_cards(attempts: List[ProblemAttempt]) -> Tuple[List[FlashCard], Optional[str]]:
+    """Generate flash cards from a list of problem attempts.
+
+    Returns:
+        The cards and the model that generated them (None without attempts).
+    """
     if not attempts:
-        return []
+        return [], None
 
     # Prepare historical context for the AI
     history_ctx = []
@@ -64,17 +68,163 @@ async def generate_flash_cards(attempts: List[ProblemAttempt]) -> List[FlashCard
         )
 
     ctx_str = "\n---\n".join(history_ctx)
-    agent = _make_flashcard_agent()
+    model_name = llm.route("flash_cards")
+    agent = llm.get_agent("flash_cards", _make_flashcard_agent, model_name)
     
     prompt = (
         f"Analyze these recent DSA attempts and generate 5 flash cards for reinforcement:\n\n"
         f"{ctx_str}"
     )
     
-    result = await agent.run(prompt)
+    result = await llm.run_agent("flash_cards", agent, prompt, model_name)
     
     # Add problem context to cards if missing
     cards = result.output.cards
     # (Optional: Map cards back to specific problems if logical)
     
-    return cards
+    return cards, model_name
+
+
+# ---------------------------------------------------------------------------
+# Precomputed per-user card sets
+# ---------------------------------------------------------------------------
+
+# One background update per user at a time; a user saving more failures while
+# it runs gets one follow-up run instead of one run per attempt.
+_update_tasks: Dict[int, asyncio.Task] = {}
+_rerun: Set[int] = set()
+
+
+async def recent_attempts(db: AsyncSession, user_id: int) -> List[ProblemAttempt]:
+    """Return the user's last attempts, failures first."""
+    query = (
+        select(ProblemAttempt)
+        .where(ProblemAttempt.user_id == user_id)
+        .order_by(ProblemAttempt.passed.asc(), ProblemAttempt.created_at.desc())
+        .limit(ATTEMPT_WINDOW)
+    )
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
+async def get_card_set(db: AsyncSession, user_id: int) -> Optional[GeneratedFlashCardSet]:
+    """Return the user's stored card set, if one has been generated."""
+    result = await db.execute(
+        select(GeneratedFlashCardSet).where(GeneratedFlashCardSet.user_id == user_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def mark_stale(db: AsyncSession, user_id: int) -> None:
+    """Flag the user's card set as behind their attempts (caller commits)."""
+    await db.execute(
+        update(GeneratedFlashCardSet)
+        .where(GeneratedFlashCardSet.user_id == user_id)
+        .values(stale=True)
+    )
+
+
+async def _store_card_set(
+    user_id: int, cards: List[dict], last_attempt_id: Optional[int], model_used: Optional[str]
+) -> GeneratedFlashCardSet:
+    """Upsert the user's card set.
+
+    ``stale`` is recomputed in the same statement, so a failure saved while
+    the cards were being generated keeps the set stale.
+    """
+    newer_failure = exists().where(
+        ProblemAttempt.user_id == user_id,
+        ProblemAttempt.passed.is_(False),
+        ProblemAttempt.id > (last_attempt_id or 0),
+    )
+    stmt = pg_insert(GeneratedFlashCardSet).values(
+        user_id=user_id,
+        cards=cards,
+        last_attempt_id=last_attempt_id,
+        stale=newer_failure,
+        model_used=model_used,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[GeneratedFlashCardSet.user_id],
+        set_={
+            "cards": stmt.excluded.cards,
+            "last_attempt_id": stmt.excluded.last_attempt_id,
+            "stale": stmt.excluded.stale,
+            "model_used": stmt.excluded.model_used,
+            "generated_at": func.now(),
+        },
+    ).returning(GeneratedFlashCardSet)
+    async with async_session() as db:
+        card_set = (await db.execute(stmt)).scalar_one()
+        await db.commit()
+    return card_set
+
+
+async def regenerate_card_set(user_id: int, attempts: List[ProblemAttempt]) -> GeneratedFlashCardSet:
+    """Replace the user's cards with a fresh generation (explicit refresh)."""
+    cards, model_used = await generate_flash_cards(attempts)
+    return await _store_card_set(
+        user_id,
+        [card.model_dump() for card in cards],
+        max(attempt.id for attempt in attempts),
+        model_used,
+    )
+
+
+async def _update_card_set(user_id: int) -> None:
+    """Add cards for failures newer than the stored set, keeping older cards."""
+    async with async_session() as db:
+        current = await get_card_set(db, user_id)
+        query = (
+            select(ProblemAttempt)
+            .where(ProblemAttempt.user_id == user_id, ProblemAttempt.passed.is_(False))
+            .order_by(ProblemAttempt.id.desc())
+            .limit(ATTEMPT_WINDOW)
+        )
+        if current is not None and current.last_attempt_id is not None:
+            query = query.where(ProblemAttempt.id > current.last_attempt_id)
+        attempts = list((await db.execute(query)).scalars().all())
+
+    if not attempts:
+        if current is not None and current.stale:
+            await _store_card_set(user_id, current.cards, current.last_attempt_id, current.model_used)
+        return
+
+    cards, model_used = await generate_flash_cards(attempts)
+    new_cards = [card.model_dump() for card in cards]
+    old_cards = current.cards if current is not None else []
+    await _store_card_set(user_id, (new_cards + old_cards)[:MAX_STORED_CARDS], attempts[0].id, model_used)
+
+
+async def _run_updates(user_id: int) -> None:
+    """Run the update for a user, once more per burst of new failures."""
+    try:
+        while True:
+            _rerun.discard(user_id)
+            try:
+                await _update_card_set(user_id)
+                metrics.increment("flash_card_updates_total", outcome="ok")
+            except Exception:
+                # The set stays stale; the next failure or page view retries.
+                metrics.increment("flash_card_updates_total", outcome="error")
+                return
+            if user_id not in _rerun:
+                return
+    finally:
+        _update_tasks.pop(user_id, None)
+
+
+def schedule_update(user_id: int) -> None:
+    """Update the user's cards in the background (coalesced per user)."""
+    if user_id in _update_tasks:
+        _rerun.add(user_id)
+        return
+    _update_tasks[user_id] = asyncio.create_task(_run_updates(user_id))
+
+
+async def shutdown() -> None:
+    """Cancel running updates (app shutdown); stale sets retry on next view."""
+    tasks = list(_update_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
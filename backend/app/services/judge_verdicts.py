@@ -0,0 +1,83 @@
+"""Memoized judge verdicts for POST /execute/tests.
+
+A verdict depends only on the submitted source, its language, the problem and
+the problem's test cases. Verdicts are stored in the judge_verdicts table,
+keyed by (code hash, language, problem id, test-set version), so re-judging
+an unchanged submission is one indexed lookup instead of a sandbox run per
+test. The test-set version is a hash of the test cases themselves, so
+changing a problem's tests invalidates its verdicts without a migration or
+a manual flush.
+"""
+
+from __future__ import annotations
+
+# Built-In Imports.
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+# External Imports.
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+# Local Imports.
+from app import metrics
+from app.database import async_session
+from app.models import JudgeVerdict
+from app.schemas import TestExecutionResponse
+
+# stderr prefixes of execute_with_limits failures that depend on machine
+# load rather than on the code; verdicts containing them are not stored.
+TRANSIENT_ERRORS = (
+    "Time Limit Exceeded",
+    "Memory Limit Exceeded",
+    "Execution Error",
+    "Failed to start process",
+)
+
+
+def test_set_version(test_cases: List[Dict[str, Any]]) -> str:
+    """Fingerprint a problem's test cases."""
+    return hashlib.sha256(json.dumps(test_cases, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def code_hash(code: str) -> str:
+    """Hash a submitted source."""
+    return hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+async def load_verdict(
+    code: str, language: str, problem_id: int, version: str
+) -> Optional[TestExecutionResponse]:
+    """Return the memoized verdict for a submission, or None."""
+    async with async_session() as db:
+        verdict = await db.scalar(
+            select(JudgeVerdict.verdict).where(
+                JudgeVerdict.code_hash == code_hash(code),
+                JudgeVerdict.language == language.lower(),
+                JudgeVerdict.problem_id == problem_id,
+                JudgeVerdict.test_set_version == version,
+            )
+        )
+    metrics.increment("judge_verdicts_total", outcome="miss" if verdict is None else "hit")
+    if verdict is None:
+        return None
+    return TestExecutionResponse.model_validate({**verdict, "memoized": True})
+
+
+async def store_verdict(
+    code: str, language: str, problem_id: int, version: str, response: TestExecutionResponse
+) -> None:
+    """Memoize a verdict unless a test failed for load-dependent reasons."""
+    if any(result.stderr.startswith(TRANSIENT_ERRORS) for result in response.results):
+        return
+    stmt = pg_insert(JudgeVerdict).values(
+        code_hash=code_hash(code),
+        language=language.lower(),
+        problem_id=problem_id,
+        test_set_version=version,
+        verdict=response.model_dump(exclude={"memoized", "attempt_id"}),
+    ).on_conflict_do_nothing(constraint="uq_judge_verdicts_key")
+    async with async_session() as db:
+        await db.execute(stmt)
+        await db.commit()
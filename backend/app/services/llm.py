@@ -0,0 +1,525 @@
+"""Shared LLM client layer used by every AI-backed service.
+
+This module owns a single keep-alive HTTP connection pool and a single
+Cerebras provider for the whole process. Services register their agent
+factory under a name and get the same agent instance back on every call, and
+all agent runs go through ``run_agent`` so latency and token usage are
+recorded in one place. Each call goes to the model picked by the
+latency-aware router (see model_router.py) for its service.
+
+``run_agent`` also bounds every call: a per-service deadline, an optional
+hedged duplicate request once the call outlives the observed p95 latency, a
+process-wide cap on concurrent upstream requests, and a circuit breaker that
+fails fast while the upstream is browning out. ``stream_agent`` applies the
+same limits, except hedging, to streamed runs.
+"""
+
+from __future__ import annotations
+
+# Built-In Imports.
+import asyncio
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, TypeVar
+
+# External Imports.
+import httpx
+from pydantic_ai import Agent
+from pydantic_ai.agent import AgentRunResult
+from pydantic_ai.result import StreamedRunResult
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.models.cerebras import CerebrasModel
+from pydantic_ai.profiles.openai import OpenAIModelProfile
+from pydantic_ai.providers.cerebras import CerebrasProvider
+
+# Local Imports.
+from app import metrics
+from app.config import settings
+from app.services.model_router import router
+
+DEFAULT_MODEL_NAME: str = "qwen-3-235b-a22b-instruct-2507"
+
+OutputT = TypeVar("OutputT")
+
+_http_client: Optional[httpx.AsyncClient] = None
+_provider: Optional[CerebrasProvider] = None
+_agents: Dict[Tuple[str, str], Agent[None, Any]] = {}
+
+
+@dataclass(frozen=True)
+class CallPolicy:
+    """Per-service limits for LLM calls.
+
+    Attributes:
+        deadline: Seconds before the call is abandoned.
+        hedge: Send a duplicate request once the call outlives the service's
+            observed p95 latency. Only for calls that are cheap to duplicate
+            (no tool calls with side effects or cost).
+    """
+
+    deadline: float
+    hedge: bool = False
+
+
+SERVICE_POLICIES: Dict[str, CallPolicy] = {
+    "ai_review": CallPolicy(deadline=30.0, hedge=True),
+    # Streamed reviews run until the whole review is sent; never hedged.
+    "ai_review_stream": CallPolicy(deadline=60.0),
+    "ai_tester": CallPolicy(deadline=60.0),
+    # Tool calls hit Tavily; a hedge would double the search cost.
+    "dsa_search": CallPolicy(deadline=45.0),
+    "flash_cards": CallPolicy(deadline=30.0, hedge=True),
+    "problem_ingestion": CallPolicy(deadline=45.0, hedge=True),
+}
+DEFAULT_POLICY = CallPolicy(deadline=60.0)
+
+# Hedging waits for enough samples to trust the p95, and never fires sooner.
+MIN_HEDGE_SAMPLES: int = 20
+MIN_HEDGE_DELAY: float = 0.5
+
+
+class LLMUnavailableError(Exception):
+    """Raised when an LLM call is refused by the circuit breaker or times out."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    Closed: calls pass. After ``failure_threshold`` consecutive failures it
+    opens and rejects calls for ``reset_after`` seconds, then lets a single
+    trial call through (half-open); success closes it, failure re-opens it.
+
+    Attributes:
+        failure_threshold: Consecutive failures that open the circuit.
+        reset_after: Seconds to stay open before a trial call.
+    """
+
+    def __init__(self, failure_threshold: int, reset_after: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """One of "closed", "open" or "half_open"."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_after:
+            return "open"
+        return "half_open"
+
+    def available(self) -> bool:
+        """Return True if ``allow`` would let a call through now (without claiming it)."""
+        state = self.state
+        return state == "closed" or (state == "half_open" and not self._trial_in_flight)
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed now."""
+        if not self.available():
+            return False
+        if self.state == "half_open":
+            self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Give back a trial slot for a call that ended without a verdict."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening (or re-opening) the circuit if needed."""
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_call_slots: Optional[asyncio.Semaphore] = None
+
+
+def get_model_name() -> str:
+    """Return the configured Cerebras model name."""
+    return getattr(settings, "CEREBRAS_MODEL", "") or DEFAULT_MODEL_NAME
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled HTTP client for LLM calls."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.LLM_READ_TIMEOUT, connect=settings.LLM_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+    return _http_client
+
+
+def get_provider() -> CerebrasProvider:
+    """Return the shared Cerebras provider, creating it on first call.
+
+    Raises:
+        ValueError: If CEREBRAS_API_KEY is not configured.
+    """
+    global _provider
+    if _provider is None:
+        api_key: str = getattr(settings, "CEREBRAS_API_KEY", "") or ""
+        if not api_key:
+            raise ValueError(
+                "CEREBRAS_API_KEY is not set. Add it to your .env to use AI features."
+            )
+        _provider = CerebrasProvider(api_key=api_key, http_client=get_http_client())
+    return _provider
+
+
+def build_model(model_name: Optional[str] = None, strict_tools: bool = True) -> CerebrasModel:
+    """Build a Cerebras model bound to the shared provider.
+
+    Args:
+        model_name: The Cerebras model; defaults to the configured model.
+        strict_tools: Set False to disable strict tool definitions, which
+            avoids the "mixed values for strict" error on Cerebras.
+
+    Returns:
+        A CerebrasModel for the given model name.
+    """
+    model = CerebrasModel(model_name or get_model_name(), provider=get_provider())
+    if not strict_tools:
+        model._profile = OpenAIModelProfile(openai_supports_strict_tool_definition=False)
+    return model
+
+
+def get_agent(
+    name: str, factory: Callable[[str], Agent[None, OutputT]], model_name: Optional[str] = None
+) -> Agent[None, OutputT]:
+    """Return the agent registered under ``name`` for a model, building it once.
+
+    Agents are created lazily so a missing API key doesn't break app startup;
+    a factory that raises is retried on the next call.
+
+    Args:
+        name: The service name, also used as the metrics label.
+        factory: Builds the agent for a model name (typically via ``build_model``).
+        model_name: The model to bind; defaults to the configured model.
+
+    Returns:
+        The shared agent instance.
+    """
+    model_name = model_name or get_model_name()
+    agent = _agents.get((name, model_name))
+    if agent is None:
+        agent = factory(model_name)
+        _agents[(name, model_name)] = agent
+    return agent
+
+
+def candidate_models(service: str) -> List[str]:
+    """Return the models a service may be routed to, in preference order."""
+    return router.candidates(service, get_model_name())
+
+
+def route(service: str) -> str:
+    """Pick the model for a call: the fastest healthy candidate for the service.
+
+    Models whose breaker would refuse the call (open, or half-open with its
+    trial call already in flight) are skipped.
+    """
+    return router.choose(
+        service, candidate_models(service), lambda model: not get_breaker(model).available()
+    )
+
+
+def usage_of(result: Any) -> Any:
+    """Return a run's token usage (a method on pydantic-ai 1.x, a property later)."""
+    usage = result.usage
+    return usage() if callable(usage) else usage
+
+
+def record_usage(
+    service: str, started: float, outcome: str, usage: Any = None, model: Optional[str] = None
+) -> None:
+    """Record latency, call count and token usage for one LLM call.
+
+    Also feeds the model router, so every recorded call shapes routing.
+    """
+    model = model or get_model_name()
+    elapsed = time.perf_counter() - started
+    router.record(service, model, elapsed, outcome == "ok")
+    metrics.observe("llm_call_seconds", elapsed, service=service, model=model)
+    metrics.increment("llm_calls_total", service=service, model=model, outcome=outcome)
+    if usage is not None:
+        metrics.increment("llm_tokens_total", usage.input_tokens or 0, service=service, model=model, kind="input")
+        metrics.increment("llm_tokens_total", usage.output_tokens or 0, service=service, model=model, kind="output")
+
+
+def get_breaker(model: str) -> CircuitBreaker:
+    """Return the circuit breaker guarding one upstream model."""
+    breaker = _breakers.get(model)
+    if breaker is None:
+        breaker = CircuitBreaker(settings.LLM_BREAKER_FAILURE_THRESHOLD, settings.LLM_BREAKER_RESET_SECONDS)
+        _breakers[model] = breaker
+    return breaker
+
+
+def _get_call_slots() -> asyncio.Semaphore:
+    """Return the semaphore capping concurrent upstream requests."""
+    global _call_slots
+    if _call_slots is None:
+        _call_slots = asyncio.Semaphore(settings.LLM_MAX_CONCURRENT_CALLS)
+    return _call_slots
+
+
+def _is_upstream_failure(error: BaseException) -> bool:
+    """Return True for errors that indicate an unhealthy upstream.
+
+    Invalid model output or 4xx request errors don't trip the breaker.
+    """
+    if isinstance(error, (asyncio.TimeoutError, httpx.TransportError)):
+        return True
+    return isinstance(error, ModelHTTPError) and (error.status_code >= 500 or error.status_code == 429)
+
+
+def _hedge_delay(service: str, model: str) -> Optional[float]:
+    """Return when to send a hedge request, or None without enough samples."""
+    histogram = metrics.get_histogram("llm_call_seconds", service=service, model=model)
+    if histogram is None or histogram.count < MIN_HEDGE_SAMPLES:
+        return None
+    return max(histogram.quantile(0.95), MIN_HEDGE_DELAY)
+
+
+def _circuit_open(service: str) -> LLMUnavailableError:
+    """Count a call refused by the circuit breaker and return the error to raise."""
+    metrics.increment("llm_calls_rejected_total", service=service, reason="circuit_open")
+    return LLMUnavailableError("The AI service is temporarily unavailable. Try again shortly.")
+
+
+async def _acquire_slot(service: str, policy: CallPolicy) -> asyncio.Semaphore:
+    """Wait for an upstream call slot, for at most the service's deadline.
+
+    Time spent queued here is local back-pressure, not upstream latency, so
+    a timeout is a local rejection: it is not counted against the model's
+    breaker or routing stats. The caller releases the returned semaphore.
+
+    Raises:
+        LLMUnavailableError: If no slot frees up before the deadline.
+    """
+    slots = _get_call_slots()
+    try:
+        await asyncio.wait_for(slots.acquire(), policy.deadline)
+    except asyncio.TimeoutError as e:
+        metrics.increment("llm_calls_rejected_total", service=service, reason="saturated")
+        raise LLMUnavailableError("The AI service is busy. Try again shortly.") from e
+    return slots
+
+
+async def _run_once(agent: Agent[None, OutputT], prompt: str) -> AgentRunResult[OutputT]:
+    """Run the agent while holding one upstream call slot."""
+    async with _get_call_slots():
+        return await agent.run(prompt)
+
+
+async def _run_hedged(
+    service: str, model: str, agent: Agent[None, OutputT], prompt: str, hedge: bool
+) -> AgentRunResult[OutputT]:
+    """Run the agent, racing a duplicate request if the first one is slow.
+
+    The caller already holds the slot for the first request; a hedge takes
+    its own.
+    """
+    delay = _hedge_delay(service, model) if hedge else None
+    if delay is None:
+        return await agent.run(prompt)
+
+    first = asyncio.ensure_future(agent.run(prompt))
+    tasks = {first}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        # No hedge when at the concurrency cap: it would only queue.
+        if done or _get_call_slots().locked():
+            return await first
+
+        metrics.increment("llm_hedges_total", service=service)
+        hedge_task = asyncio.ensure_future(_run_once(agent, prompt))
+        tasks.add(hedge_task)
+        pending = set(tasks)
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge_task:
+                        metrics.increment("llm_hedge_wins_total", service=service)
+                    return task.result()
+            if not pending:
+                # Both requests failed; surface the latest error.
+                return done.pop().result()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def run_agent(
+    service: str, agent: Agent[None, OutputT], prompt: str, model: Optional[str] = None
+) -> AgentRunResult[OutputT]:
+    """Run an agent under its service's call policy and record metrics.
+
+    Args:
+        service: The service name, used to pick the CallPolicy and as the
+            metrics label.
+        agent: The agent to run, bound to ``model`` (see ``get_agent``).
+        prompt: The user prompt.
+        model: The model the agent is bound to (from ``route``); defaults
+            to the configured model.
+
+    Returns:
+        The agent run result.
+
+    Raises:
+        LLMUnavailableError: If the circuit is open, no call slot frees up
+            in time, or the deadline passes.
+    """
+    model = model or get_model_name()
+    policy = SERVICE_POLICIES.get(service, DEFAULT_POLICY)
+    breaker = get_breaker(model)
+    if not breaker.available():
+        raise _circuit_open(service)
+
+    # The deadline and breaker only cover the upstream call, not the queue.
+    slots = await _acquire_slot(service, policy)
+    try:
+        if not breaker.allow():
+            raise _circuit_open(service)
+
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(_run_hedged(service, model, agent, prompt, policy.hedge), policy.deadline)
+        except asyncio.TimeoutError as e:
+            breaker.record_failure()
+            record_usage(service, started, "timeout", model=model)
+            raise LLMUnavailableError(f"The AI service did not answer within {policy.deadline:g}s.") from e
+        except asyncio.CancelledError:
+            # The caller went away (e.g. client disconnect); not the upstream's fault.
+            breaker.release()
+            raise
+        except Exception as e:
+            if _is_upstream_failure(e):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            record_usage(service, started, "error", model=model)
+            raise
+    finally:
+        slots.release()
+    breaker.record_success()
+    record_usage(service, started, "ok", usage_of(result), model)
+    return result
+
+
+class AgentStream:
+    """A streamed agent run started by ``stream_agent``.
+
+    Every read from the stream counts against the run's deadline.
+    """
+
+    def __init__(self, result: StreamedRunResult[None, str], deadline_at: float) -> None:
+        self._result = result
+        self._deadline_at = deadline_at
+
+    async def text_deltas(self) -> AsyncIterator[str]:
+        """Yield new chunks of output text as they arrive."""
+        chunks = aiter(self._result.stream_text(delta=True))
+        while True:
+            try:
+                async with asyncio.timeout_at(self._deadline_at):
+                    delta = await anext(chunks)
+            except StopAsyncIteration:
+                return
+            yield delta
+
+    def usage(self) -> Any:
+        """Token usage of the run so far."""
+        return usage_of(self._result)
+
+
+@asynccontextmanager
+async def stream_agent(
+    service: str, agent: Agent[None, str], prompt: str, model: Optional[str] = None
+) -> AsyncIterator[AgentStream]:
+    """Stream an agent run under its service's call policy and record metrics.
+
+    The circuit breaker, the concurrency cap and the deadline apply as in
+    ``run_agent``; the call slot is held until the stream is closed.
+
+    Args:
+        service: The service name, used to pick the CallPolicy and as the
+            metrics label.
+        agent: The agent to run, bound to ``model``.
+        prompt: The user prompt.
+        model: The model the agent is bound to; defaults to the configured model.
+
+    Yields:
+        The running stream.
+
+    Raises:
+        LLMUnavailableError: If the circuit is open, no call slot frees up
+            in time, or the deadline passes.
+    """
+    model = model or get_model_name()
+    policy = SERVICE_POLICIES.get(service, DEFAULT_POLICY)
+    breaker = get_breaker(model)
+    if not breaker.available():
+        raise _circuit_open(service)
+
+    # As in run_agent, the deadline starts once a call slot is held.
+    slots = await _acquire_slot(service, policy)
+    try:
+        if not breaker.allow():
+            raise _circuit_open(service)
+
+        started = time.perf_counter()
+        deadline_at = asyncio.get_running_loop().time() + policy.deadline
+        try:
+            async with AsyncExitStack() as stack:
+                async with asyncio.timeout_at(deadline_at):
+                    result = await stack.enter_async_context(agent.run_stream(prompt))
+                stream = AgentStream(result, deadline_at)
+                yield stream
+        except TimeoutError as e:
+            breaker.record_failure()
+            record_usage(service, started, "timeout", model=model)
+            raise LLMUnavailableError(f"The AI service did not answer within {policy.deadline:g}s.") from e
+        except (asyncio.CancelledError, GeneratorExit):
+            # The client went away mid-stream; not the upstream's fault.
+            breaker.release()
+            raise
+        except Exception as e:
+            if _is_upstream_failure(e):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            record_usage(service, started, "error", model=model)
+            raise
+    finally:
+        slots.release()
+    breaker.record_success()
+    record_usage(service, started, "ok", stream.usage(), model)
+
+
+async def aclose() -> None:
+    """Close the pooled HTTP client and forget cached agents (app shutdown)."""
+    global _http_client, _provider, _call_slots
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+    _provider = None
+    _call_slots = None
+    _agents.clear()
@@ -0,0 +1,146 @@
+"""Latency-aware routing of LLM calls across candidate models.
+
+Each AI task (review, test generation, search, flash cards, ingestion) has
+a list of candidate models (``LLM_TASK_MODELS``) and a quality floor. The
+router keeps an exponentially weighted moving average (EWMA) of latency and
+error rate per (task, model) and sends each call to the fastest healthy
+candidate that meets the floor. A small share of calls explores the other
+candidates so their numbers stay current and failed models can recover.
+"""
+
+from __future__ import annotations
+
+# Built-In Imports.
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Local Imports.
+from app.config import settings
+
+# Relative quality of known Cerebras models (higher is better). Override or
+# extend with LLM_MODEL_QUALITY; models missing from both are assumed to
+# meet any floor, since an operator listed them explicitly.
+MODEL_QUALITY: Dict[str, int] = {
+    "gpt-oss-120b": 3,
+    "qwen-3-235b-a22b-instruct-2507": 3,
+    "qwen-3-235b-a22b-thinking-2507": 3,
+    "llama-3.3-70b": 2,
+    "qwen-3-32b": 2,
+    "llama3.1-8b": 1,
+}
+
+# Minimum model quality per task.
+TASK_QUALITY_FLOOR: Dict[str, int] = {
+    "ai_review": 2,
+    "ai_review_stream": 2,
+    "ai_tester": 3,
+    "dsa_search": 2,
+    "flash_cards": 1,
+    "problem_ingestion": 2,
+}
+
+# Tasks that use another task's LLM_TASK_MODELS entry unless given their own.
+# Streamed reviews keep separate latency stats (a whole stream is much slower
+# than a one-shot review) but run on the same models.
+SHARED_TASK_MODELS: Dict[str, str] = {
+    "ai_review_stream": "ai_review",
+}
+
+# EWMA smoothing factor, error rate above which a model is skipped, and how
+# often (one call in N) the router explores instead of exploiting.
+EWMA_ALPHA: float = 0.2
+MAX_ERROR_RATE: float = 0.5
+EXPLORE_EVERY: int = 20
+
+
+@dataclass
+class ModelStats:
+    """Rolling latency and error rate of one model for one task."""
+
+    latency: Optional[float] = None
+    error_rate: float = 0.0
+    samples: int = 0
+
+    def record(self, seconds: float, ok: bool) -> None:
+        """Fold one call into the moving averages."""
+        self.samples += 1
+        if ok:
+            self.latency = seconds if self.latency is None else (
+                EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * self.latency
+            )
+        self.error_rate = EWMA_ALPHA * (0.0 if ok else 1.0) + (1 - EWMA_ALPHA) * self.error_rate
+
+
+def _quality(model: str) -> Optional[int]:
+    """Return a model's quality score, or None if unknown."""
+    return settings.LLM_MODEL_QUALITY.get(model, MODEL_QUALITY.get(model))
+
+
+def _latency_or_inf(stats: ModelStats) -> float:
+    """Return the latency EWMA, or infinity if no call has succeeded yet."""
+    return float("inf") if stats.latency is None else stats.latency
+
+
+class ModelRouter:
+    """Picks a model per call from a task's candidates.
+
+    Not thread-safe; intended for use from a single asyncio event loop.
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[Tuple[str, str], ModelStats] = {}
+        self._calls: Dict[str, int] = {}
+
+    def stats(self, task: str, model: str) -> ModelStats:
+        """Return the stats for a (task, model) pair."""
+        return self._stats.setdefault((task, model), ModelStats())
+
+    def record(self, task: str, model: str, seconds: float, ok: bool) -> None:
+        """Record the outcome of one call."""
+        self.stats(task, model).record(seconds, ok)
+
+    def candidates(self, task: str, default_model: str) -> List[str]:
+        """Return the task's configured models that meet its quality floor.
+
+        Falls back to the configured list (or ``default_model``) if none do,
+        so a misconfiguration degrades quality instead of disabling the task.
+        """
+        configured = (
+            settings.LLM_TASK_MODELS.get(task)
+            or settings.LLM_TASK_MODELS.get(SHARED_TASK_MODELS.get(task, task))
+            or [default_model]
+        )
+        floor = TASK_QUALITY_FLOOR.get(task, 0)
+        eligible = [model for model in configured if (_quality(model) or floor) >= floor]
+        return eligible or configured
+
+    def choose(self, task: str, candidates: List[str], is_open: Callable[[str], bool]) -> str:
+        """Pick the fastest healthy candidate.
+
+        Args:
+            task: The task name.
+            candidates: Models meeting the task's quality floor, in preference order.
+            is_open: Returns True if a model's circuit breaker would refuse a call.
+
+        Returns:
+            The model to call.
+        """
+        if len(candidates) == 1:
+            return candidates[0]
+        available = [model for model in candidates if not is_open(model)] or candidates
+
+        calls = self._calls[task] = self._calls.get(task, 0) + 1
+        if calls % EXPLORE_EVERY == 0:
+            # Least-sampled model, so slow or failed models get re-measured.
+            return min(available, key=lambda model: self.stats(task, model).samples)
+
+        healthy = [model for model in available if self.stats(task, model).error_rate <= MAX_ERROR_RATE]
+        pool = healthy or available
+        unmeasured = [model for model in pool if self.stats(task, model).samples == 0]
+        if unmeasured:
+            return unmeasured[0]
+        # Models that have only failed have no latency yet; try them last.
+        return min(pool, key=lambda model: _latency_or_inf(self.stats(task, model)))
+
+
+router = ModelRouter()
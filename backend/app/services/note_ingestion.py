@@ -0,0 +1,220 @@
+"""Background worker that fills notes created from a problem URL.
+
+``POST /notes/from-problem`` inserts a placeholder note with
+``ingestion_status = "pending"`` and returns immediately; this module then
+runs the Tavily search and LLM call (``fetch_problem_details``) in an asyncio
+task and writes the BlockNote content into the note when it finishes.
+Clients poll ``GET /notes/{id}`` or long-poll ``GET /notes/{id}/ingestion``.
+
+A worker claims a pending note by stamping ``ingestion_claimed_at``. Claims
+expire after ``CLAIM_TTL_SECONDS``, so notes whose worker died are picked up
+by the next sweep in any worker, and only by one of them.
+"""
+
+from __future__ import annotations
+
+# Built-In Imports.
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Set
+
+# External Imports.
+from sqlalchemy import func, or_, update
+from sqlalchemy.orm.exc import StaleDataError
+
+# Local Imports.
+from app import metrics
+from app.database import async_session
+from app.models import Note
+from app.services.problem_ingestion import fetch_problem_details, header_blocks
+
+# Attempts at writing the result when the note is edited concurrently.
+MAX_SAVE_ATTEMPTS: int = 3
+# How long a claim keeps other workers off a note; longer than any job.
+CLAIM_TTL_SECONDS: int = 300
+# Version of a freshly inserted placeholder, stored as ingestion_base_version
+# so a resumed job can still tell whether the user edited it.
+PLACEHOLDER_VERSION: int = 1
+
+logger = logging.getLogger(__name__)
+
+# Strong references to running jobs (the loop only keeps weak ones).
+_tasks: Set["asyncio.Task[None]"] = set()
+# Set when the job for a note finishes, for long-polling clients.
+_done_events: Dict[int, asyncio.Event] = {}
+
+
+def placeholder_blocks(url: str, title: str, message: str) -> List[Dict[str, Any]]:
+    """Build the content shown while (or instead of) the ingested problem."""
+    return [
+        *header_blocks(url, title),
+        {
+            "type": "paragraph",
+            "content": [{"type": "text", "text": message, "styles": {"italic": True}}],
+        },
+    ]
+
+
+def start(note_id: int, version: Optional[int], url: str, title: str, refresh: bool = False) -> None:
+    """Schedule ingestion for a placeholder note.
+
+    Args:
+        note_id: The placeholder note to fill.
+        version: The placeholder's version. If the user edits the note before
+            ingestion finishes, the problem is appended instead of replacing it.
+            None (placeholder version unknown) always appends.
+        url: The problem URL.
+        title: The problem title.
+        refresh: Bypass the shared per-URL ingestion cache.
+    """
+    if note_id in _done_events:
+        return
+    _done_events[note_id] = asyncio.Event()
+    task = asyncio.create_task(_ingest(note_id, version, url, title, refresh))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def _ingest(note_id: int, version: Optional[int], url: str, title: str, refresh: bool) -> None:
+    """Fetch the problem and store it in the note."""
+    try:
+        try:
+            blocks = await fetch_problem_details(url, title, refresh=refresh)
+            status = "complete"
+        except Exception as e:
+            blocks = placeholder_blocks(url, title, f"Could not fetch problem details: {e!s}")
+            status = "failed"
+        metrics.increment("note_ingestions_total", outcome=status)
+        await _save(note_id, version, url, title, blocks, status)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        # Left pending; the claim expires and a later sweep retries.
+        logger.exception("Saving ingestion for note %s failed", note_id)
+        metrics.increment("note_ingestion_saves_total", outcome="error")
+    finally:
+        _done_events.pop(note_id).set()
+
+
+async def _save(
+    note_id: int, version: Optional[int], url: str, title: str, blocks: List[Dict[str, Any]], status: str
+) -> None:
+    """Write the result, keeping any edits made to the placeholder."""
+    # The placeholder already starts with the header; append only the body.
+    header = header_blocks(url, title)
+    body = blocks[len(header):] if blocks[:len(header)] == header else blocks
+    for _ in range(MAX_SAVE_ATTEMPTS):
+        async with async_session() as db:
+            note = await db.get(Note, note_id)
+            # Deleted, or already finished by another worker.
+            if note is None or note.ingestion_status != "pending":
+                return
+            if version is not None and note.version == version:
+                note.content = blocks
+            elif status == "complete":
+                note.content = [*note.content, *body]
+            note.ingestion_status = status
+            try:
+                await db.commit()
+                return
+            except StaleDataError:
+                # Edited between our read and write; reload and retry.
+                await db.rollback()
+
+    # Edited faster than we could merge; keep the user's content and stop
+    # showing the note as in progress.
+    metrics.increment("note_ingestion_saves_total", outcome="conflict")
+    async with async_session() as db:
+        await db.execute(
+            update(Note)
+            .where(Note.id == note_id, Note.ingestion_status == "pending")
+            .values(ingestion_status="failed")
+        )
+        await db.commit()
+
+
+async def wait(note_id: int, timeout: float) -> None:
+    """Wait up to ``timeout`` seconds for this process's job on a note.
+
+    Returns early when the job finishes. If the job runs in another worker
+    (or already finished), this simply sleeps, so callers re-check the note.
+    """
+    event: Optional[asyncio.Event] = _done_events.get(note_id)
+    if event is None:
+        await asyncio.sleep(timeout)
+        return
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+
+
+async def resume_pending() -> int:
+    """Claim and restart ingestion for notes whose worker stopped.
+
+    Notes are claimed with one ``UPDATE ... RETURNING``, so when several
+    workers sweep at once each note is resumed by exactly one of them.
+
+    Returns:
+        The number of jobs started.
+    """
+    expired = func.now() - timedelta(seconds=CLAIM_TTL_SECONDS)
+    async with async_session() as db:
+        rows = (
+            await db.execute(
+                update(Note)
+                .where(
+                    Note.ingestion_status == "pending",
+                    or_(Note.ingestion_claimed_at.is_(None), Note.ingestion_claimed_at < expired),
+                )
+                # Claiming is not an edit: keep the version and sort order.
+                .values(ingestion_claimed_at=func.now(), updated_at=Note.updated_at)
+                .returning(Note.id, Note.ingestion_base_version, Note.ingestion_url, Note.title)
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+        await db.commit()
+    for row in rows:
+        # Compare against the placeholder's version, not the current one, so
+        # edits made before the previous worker died are kept.
+        start(row.id, row.ingestion_base_version, row.ingestion_url or "", row.title)
+    return len(rows)
+
+
+async def sweep() -> None:
+    """Resume abandoned ingestions now and every CLAIM_TTL_SECONDS."""
+    while True:
+        try:
+            await resume_pending()
+        except Exception:
+            logger.exception("Resuming pending note ingestions failed")
+            metrics.increment("note_ingestion_sweeps_total", outcome="error")
+        await asyncio.sleep(CLAIM_TTL_SECONDS)
+
+
+def start_sweeper() -> None:
+    """Start the background sweep (app startup)."""
+    task = asyncio.create_task(sweep())
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def shutdown() -> None:
+    """Cancel running jobs and the sweep (app shutdown).
+
+    Their claims are released so the next worker to sweep resumes them.
+    """
+    note_ids = list(_done_events)
+    for task in list(_tasks):
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    if note_ids:
+        async with async_session() as db:
+            await db.execute(
+                update(Note)
+                .where(Note.id.in_(note_ids), Note.ingestion_status == "pending")
+                .values(ingestion_claimed_at=None, updated_at=Note.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
@@ -0,0 +1,103 @@
+"""Service for applying block-level operations to BlockNote documents.
+
+This module lets the editor send only the blocks it changed instead of the
+whole document. Operations address blocks by their BlockNote ``id`` and are
+applied in order to a copy of the stored content.
+"""
+
+from __future__ import annotations
+
+# Built-In Imports.
+import copy
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Local Imports.
+from app.schemas import BlockOperation
+
+Block = Dict[str, Any]
+
+
+def _locate(blocks: List[Block], block_id: str) -> Optional[Tuple[List[Block], int]]:
+    """Find a block anywhere in the tree.
+
+    Returns:
+        A tuple (containing list, index) or None if no block has that id.
+    """
+    for index, block in enumerate(blocks):
+        if block.get("id") == block_id:
+            return blocks, index
+        found = _locate(block.get("children") or [], block_id)
+        if found:
+            return found
+    return None
+
+
+def _children_of(blocks: List[Block], parent_id: Optional[str]) -> List[Block]:
+    """Return the list a block should be placed into."""
+    if parent_id is None:
+        return blocks
+    found = _locate(blocks, parent_id)
+    if not found:
+        raise ValueError(f"Parent block '{parent_id}' not found.")
+    container, index = found
+    return container[index].setdefault("children", [])
+
+
+def _position_after(siblings: List[Block], after_id: Optional[str]) -> int:
+    """Return the insertion index directly after the given sibling."""
+    if after_id is None:
+        return 0
+    for index, block in enumerate(siblings):
+        if block.get("id") == after_id:
+            return index + 1
+    raise ValueError(f"Sibling block '{after_id}' not found under the target parent.")
+
+
+def apply_block_operations(
+    content: List[Block], operations: Sequence[BlockOperation]
+) -> List[Block]:
+    """Apply block operations to a BlockNote document.
+
+    Args:
+        content: The stored list of top-level blocks. It is not modified.
+        operations: The edits to apply, in order.
+
+    Returns:
+        A new list of blocks with every operation applied.
+
+    Raises:
+        ValueError: If an operation references a missing block or is malformed.
+    """
+    blocks: List[Block] = copy.deepcopy(content)
+
+    for operation in operations:
+        if operation.op == "insert":
+            if operation.block is None:
+                raise ValueError(f"Insert of '{operation.block_id}' is missing 'block'.")
+            if _locate(blocks, operation.block_id):
+                raise ValueError(f"Block '{operation.block_id}' already exists.")
+            siblings = _children_of(blocks, operation.parent_id)
+            new_block = {**operation.block, "id": operation.block_id}
+            siblings.insert(_position_after(siblings, operation.after_id), new_block)
+            continue
+
+        found = _locate(blocks, operation.block_id)
+        if not found:
+            raise ValueError(f"Block '{operation.block_id}' not found.")
+        container, index = found
+
+        if operation.op == "update":
+            if operation.block is None:
+                raise ValueError(f"Update of '{operation.block_id}' is missing 'block'.")
+            changes = {k: v for k, v in operation.block.items() if k != "id"}
+            container[index] = {**container[index], **changes}
+        elif operation.op == "delete":
+            container.pop(index)
+        elif operation.op == "move":
+            moved = container.pop(index)
+            # A block moved into its own subtree is no longer reachable here,
+            # so _children_of() rejects it as a missing parent.
+            siblings = _children_of(blocks, operation.parent_id)
+            siblings.insert(_position_after(siblings, operation.after_id), moved)
+
+    return blocks
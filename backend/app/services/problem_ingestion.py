@@ -1,23 +1,28 @@
 """Service for ingesting problem details from URLs.
 
 This module provides a service to fetch problem descriptions and generate
-starter code templates using AI and Tavily.
+starter code templates using AI and Tavily. Results are cached per normalized
+problem URL in Postgres so repeat imports of a problem skip both calls.
 """
 
 from __future__ import annotations
 
 # Built-In Imports.
-from typing import List, Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
 
 # External Imports.
-import httpx
 from pydantic_ai import Agent
-from pydantic_ai.models.cerebras import CerebrasModel
-from pydantic_ai.providers.cerebras import CerebrasProvider
-from pydantic_ai.profiles.openai import OpenAIModelProfile
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 # Local Imports.
 from app.config import settings
+from app.database import async_session
+from app.models import ProblemIngestionCache
+from app.services import llm, tavily_client
+from app.singleflight import SingleFlight
 
 # ---------------------------------------------------------------------------
 # Agent Configuration
@@ -34,83 +39,153 @@ SYSTEM_PROMPT: str = (
     "Return the description and examples first, then the code block inside triple backticks."
 )
 
-DEFAULT_MODEL_NAME: str = "qwen-3-235b-a22b-instruct-2507"
+def _make_agent(model_name: str) -> Agent[None, str]:
+    """Build the Cerebras-backed problem ingestion agent."""
+    return Agent(
+        # Disable strict tool definitions to avoid "mixed values for strict" error
+        llm.build_model(model_name, strict_tools=False),
+        system_prompt=SYSTEM_PROMPT,
+    )
 
 
-def _make_agent() -> Agent[None, str]:
-    """Build the Cerebras-backed problem ingestion agent."""
-    cerebras_key = getattr(settings, "CEREBRAS_API_KEY", "") or ""
+_ingestion_flight: SingleFlight[List[Dict[str, Any]]] = SingleFlight("problem_ingestion")
 
-    if not cerebras_key:
-        raise ValueError("CEREBRAS_API_KEY is not set.")
 
-    model_name = getattr(settings, "CEREBRAS_MODEL", "") or DEFAULT_MODEL_NAME
-    model = CerebrasModel(
-        model_name,
-        provider=CerebrasProvider(api_key=cerebras_key),
-    )
-    # Disable strict tool definitions to avoid "mixed values for strict" error
-    model._profile = OpenAIModelProfile(openai_supports_strict_tool_definition=False)
+def normalize_problem_url(url: str) -> str:
+    """Normalize a problem URL so trivially different spellings compare equal.
 
-    return Agent(
-        model,
-        system_prompt=SYSTEM_PROMPT,
+    Lowercases the scheme and host, drops the fragment and any trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/")
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+
+def header_blocks(url: str, title: str) -> List[Dict[str, Any]]:
+    """Build the title heading and problem link that start every problem note."""
+    return [
+        {
+            "type": "heading",
+            "props": {"level": 1},
+            "content": [{"type": "text", "text": title, "styles": {}}]
+        },
+        {
+            "type": "paragraph",
+            "content": [
+                {"type": "text", "text": "Problem Link: ", "styles": {"bold": True}},
+                {"type": "text", "text": url, "styles": {}}
+            ]
+        },
+    ]
+
+
+async def get_cached_problem(url: str, title: str) -> Optional[List[Dict[str, Any]]]:
+    """Return the note blocks for a problem from the ingestion cache, or None.
+
+    Args:
+        url: The URL of the problem.
+        title: The title of the problem, used for the heading.
+
+    Returns:
+        Header blocks plus the cached body, or None on a miss or expiry.
+    """
+    async with async_session() as db:
+        result = await db.execute(
+            select(ProblemIngestionCache.blocks).where(
+                ProblemIngestionCache.url == normalize_problem_url(url),
+                ProblemIngestionCache.expires_at > func.now(),
+            )
+        )
+        body = result.scalar_one_or_none()
+    if body is None:
+        return None
+    return [*header_blocks(url, title), *body]
+
+
+async def _store_cached_problem(normalized_url: str, body: List[Dict[str, Any]], model_name: str) -> None:
+    """Save (or replace) the ingested body for a problem URL."""
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=settings.PROBLEM_INGESTION_CACHE_TTL_SECONDS)
+    stmt = pg_insert(ProblemIngestionCache).values(
+        url=normalized_url, blocks=body, model_name=model_name, expires_at=expires_at
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ProblemIngestionCache.url],
+        set_={
+            "blocks": stmt.excluded.blocks,
+            "model_name": stmt.excluded.model_name,
+            "expires_at": stmt.excluded.expires_at,
+            "created_at": func.now(),
+        },
     )
+    async with async_session() as db:
+        await db.execute(stmt)
+        await db.commit()
 
 
-async def fetch_problem_details(url: str, title: str) -> List[Dict[str, Any]]:
+async def fetch_problem_details(url: str, title: str, refresh: bool = False) -> List[Dict[str, Any]]:
     """Fetch problem details from a URL and format them for BlockNote.
 
+    The formatted body is cached per normalized URL and shared by all users;
+    concurrent misses for the same URL share one Tavily/LLM round trip.
+
     Args:
         url: The URL of the problem.
         title: The title of the problem.
+        refresh: Skip the cache and re-ingest the problem, replacing the entry.
 
     Returns:
         A list of BlockNote-formatted blocks.
     """
-    tavily_key = getattr(settings, "TAVILY_API_KEY", "") or ""
-    
+    if not refresh:
+        cached = await get_cached_problem(url, title)
+        if cached is not None:
+            return cached
+
+    normalized_url = normalize_problem_url(url)
+
+    async def _ingest() -> List[Dict[str, Any]]:
+        body, fetched_live, model_name = await _fetch_problem_details(url, title)
+        # Output built without the live page is only a best effort; don't pin it.
+        if fetched_live:
+            await _store_cached_problem(normalized_url, body, model_name)
+        return body
+
+    body = await _ingestion_flight.do(normalized_url, _ingest)
+    return [*header_blocks(url, title), *body]
+
+
+async def _fetch_problem_details(url: str, title: str) -> Tuple[List[Dict[str, Any]], bool, str]:
+    """Run the Tavily search and ingestion agent for one problem (uncached).
+
+    Returns:
+        A tuple (body_blocks, fetched_live, model_name): the blocks after the
+        header, whether Tavily returned live content for the prompt, and the
+        model that formatted it.
+    """
     # Use Tavily Extract to get the page content if possible, otherwise use search context
     content = ""
+    fetched_live = False
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.tavily.com/search",
-                json={
-                    "api_key": tavily_key,
-                    "query": f"detailed description and template for coding problem: {title} {url}",
-                    "search_depth": "advanced",
-                    "include_raw_content": True
-                }
-            )
-            data = response.json()
-            content = "\n".join([r.get("content", "") for r in data.get("results", [])])
+        data = await tavily_client.search(
+            f"detailed description and template for coding problem: {title} {url}",
+            search_depth="advanced",
+            include_raw_content=True,
+        )
+        content = "\n".join([r.get("content", "") for r in data.get("results", [])])
+        fetched_live = bool(content.strip())
     except Exception as e:
         content = f"Could not fetch live content from {url}. Error: {str(e)}"
 
-    agent = _make_agent()
-    result = await agent.run(f"Problem: {title}\nURL: {url}\n\nSearch Context:\n{content}")
+    model_name = llm.route("problem_ingestion")
+    agent = llm.get_agent("problem_ingestion", _make_agent, model_name)
+    result = await llm.run_agent(
+        "problem_ingestion", agent, f"Problem: {title}\nURL: {url}\n\nSearch Context:\n{content}", model_name
+    )
     
     # Format the result into BlockNote blocks
     raw_text = result.output
     blocks = []
     
-    # Add title block
-    blocks.append({
-        "type": "heading",
-        "props": {"level": 1},
-        "content": [{"type": "text", "text": title, "styles": {}}]
-    })
-
-    # Add URL block
-    blocks.append({
-        "type": "paragraph",
-        "content": [
-            {"type": "text", "text": "Problem Link: ", "styles": {"bold": True}},
-            {"type": "text", "text": url, "styles": {}}
-        ]
-    })
-    
     # Split text and code
     import re
     parts = re.split(r"```[a-z]*\n?(.*?)```", raw_text, flags=re.DOTALL)
@@ -188,4 +263,4 @@ async def fetch_problem_details(url: str, title: str) -> List[Dict[str, Any]]:
                         "content": [{"type": "text", "text": stripped, "styles": {}}]
                     })
             
-    return blocks
+    return blocks, fetched_live, model_name
@@ -1,6 +1,16 @@
+import hashlib
+import json
 import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Tuple
+
 from fastapi import HTTPException
 
+from app import metrics
+from app.cache import LRUCache
+from app.services.source_analysis import analyze_python
+
 # Security rules mapped directly from security_rules.yml
 SECURITY_RULES = {
     "python": [
@@ -51,35 +61,160 @@ SECURITY_RULES = {
     ]
 }
 
-def check_security_rules(code: str, language: str) -> None:
+# Characters str.splitlines() treats as line boundaries. Violations are
+# reported per line, so matches must not cross them.
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+_LINE_BREAK_RE = re.compile(r"\r\n|[" + _LINE_BREAKS + "]")
+_OTHER_BREAK_RE = re.compile("[" + _LINE_BREAKS[1:] + "]")
+_INLINE_SPACE = r"[^\S" + _LINE_BREAKS + "]"
+_GLOBAL_FLAGS_RE = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+LANGUAGE_ALIASES = {"c": "cpp", "c++": "cpp", "golang": "go"}
+
+# Violation: (rule, 1-based line number).
+Violation = Tuple[Dict[str, str], int]
+
+
+@dataclass(frozen=True)
+class CompiledRuleSet:
+    """A language's rules compiled into one alternation plus per-rule patterns.
+
+    ``version`` fingerprints the rule definitions, so cached scan results
+    are keyed to the exact rules that produced them.
     """
-    Scans the provided code against rudimentary security rules to prevent malicious execution.
-    Raises an HTTPException if malicious patterns are detected.
+    combined: Pattern[str]
+    rules: List[Tuple[Pattern[str], Dict[str, str]]]
+    version: str
+
+
+@dataclass(frozen=True)
+class ScanResult:
+    """Outcome of one scan, cached per (code, language, rule-set version)."""
+    violation: Optional[Violation]
+
+
+# Results for recently scanned sources. Run, Tests and AI Tests all scan the
+# same code, usually within seconds of each other.
+_scan_cache: LRUCache[str, ScanResult] = LRUCache(maxsize=1024)
+
+
+def _single_line(pattern: str) -> str:
+    """Rewrite a rule so it can run over the whole source without spanning lines.
+
+    Leading global flags such as ``(?i)`` become a scoped group, since they
+    are only allowed at the start of the combined pattern, and ``\\s`` no
+    longer matches line breaks.
+    """
+    pattern = pattern.replace(r"\s", _INLINE_SPACE)
+    flags = _GLOBAL_FLAGS_RE.match(pattern)
+    if flags:
+        pattern = f"(?{flags.group(1)}:{pattern[flags.end():]})"
+    return pattern
+
+
+@lru_cache(maxsize=None)
+def compile_rules(lang: str) -> Optional[CompiledRuleSet]:
+    """Compile a language's rules once; None if the language has no rules."""
+    rules = SECURITY_RULES.get(lang, [])
+    if not rules:
+        return None
+    patterns = [_single_line(rule["pattern"]) for rule in rules]
+    return CompiledRuleSet(
+        combined=re.compile("|".join(f"(?:{pattern})" for pattern in patterns)),
+        rules=[(re.compile(pattern), rule) for pattern, rule in zip(patterns, rules)],
+        version=hashlib.sha256(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()[:16],
+    )
+
+
+def scan_cache_key(code: str, lang: str, version: str) -> str:
+    """Derive the scan cache key from the source, language and rule-set version."""
+    return hashlib.sha256(f"{version}\x00{lang}\x00{code}".encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def find_violation(code: str, language: str) -> Optional[Violation]:
+    """Return the first rule violated and its 1-based line number, or None.
+
+    Results are cached per (code, language, rule-set version); editing the
+    rules changes the version, so stale results are never served.
     """
     if not code or not language:
-        return
+        return None
 
     lang = language.lower()
-    
     # Normalize language aliases
-    if lang in ["c", "c++"]:
-        lang = "cpp"
-    elif lang == "golang":
-        lang = "go"
-        
-    rules = SECURITY_RULES.get(lang, [])
-    
-    if not rules:
-        return
-        
-    lines = code.splitlines()
-    for line_num, line in enumerate(lines, start=1):
-        for rule in rules:
-            if re.search(rule["pattern"], line):
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Security Violation: {rule['message']} (Line {line_num})"
-                )
+    lang = LANGUAGE_ALIASES.get(lang, lang)
+    compiled = compile_rules(lang)
+    if compiled is None:
+        return None
+
+    cache_key = scan_cache_key(code, lang, compiled.version)
+    cached = _scan_cache.get(cache_key)
+    if cached is not None:
+        metrics.increment("security_scan_cache_total", outcome="hit")
+        return cached.violation
+    metrics.increment("security_scan_cache_total", outcome="miss")
+
+    violation = _scan_python(code, compiled) if lang == "python" else _scan(code, compiled)
+    _scan_cache.set(cache_key, ScanResult(violation))
+    return violation
+
+
+def _scan_python(code: str, compiled: CompiledRuleSet) -> Optional[Violation]:
+    """Check Python on its syntax tree, so comments and strings don't count.
+
+    Sources that don't parse fall back to the text scan.
+    """
+    analysis = analyze_python(code)
+    if not analysis.parsed:
+        return _scan(code, compiled)
+    if not analysis.findings:
+        return None
+    order = {rule["id"]: index for index, (_, rule) in enumerate(compiled.rules)}
+    rule_id, line_num = min(analysis.findings, key=lambda finding: (finding[1], order[finding[0]]))
+    return compiled.rules[order[rule_id]][1], line_num
+
+
+def _scan(code: str, compiled: CompiledRuleSet) -> Optional[Violation]:
+    """Scan a source once with the combined pattern (uncached).
+
+    The earliest match gives the first offending line; on that line the
+    first rule in declaration order is reported, as the old per-line loop did.
+    """
+    match = compiled.combined.search(code)
+    if match is None:
+        return None
+
+    start = match.start()
+    if _OTHER_BREAK_RE.search(code, 0, start) is None:
+        # Plain "\n" line endings: count them in C instead of iterating.
+        line_num = code.count("\n", 0, start) + 1
+        line_start = code.rfind("\n", 0, start) + 1
+    else:
+        line_start = 0
+        line_num = 1
+        for line_break in _LINE_BREAK_RE.finditer(code, 0, start):
+            line_start = line_break.end()
+            line_num += 1
+    line_end = _LINE_BREAK_RE.search(code, match.end())
+    line = code[line_start:line_end.start() if line_end else len(code)]
+    for pattern, rule in compiled.rules:
+        if pattern.search(line):
+            return rule, line_num
+    return None
+
+
+def check_security_rules(code: str, language: str) -> None:
+    """
+    Scans the provided code against rudimentary security rules to prevent malicious execution.
+    Raises an HTTPException if malicious patterns are detected.
+    """
+    violation = find_violation(code, language)
+    if violation is not None:
+        rule, line_num = violation
+        raise HTTPException(
+            status_code=400,
+            detail=f"Security Violation: {rule['message']} (Line {line_num})"
+        )
 
 def sanitize_ai_prompt(prompt: str, max_length: int = 2000) -> str:
     """
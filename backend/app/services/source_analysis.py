@@ -0,0 +1,238 @@
+"""Parse-once structural analysis of Python submissions.
+
+The security scanner and the AI tester both need to know what a Python
+source contains: the scanner looks for forbidden imports and calls, the
+tester for the classes and functions its harness should call. This module
+parses the source once with ``ast``, collects both, and caches the result
+per code hash. Working on the syntax tree means text in comments and
+ordinary strings no longer trips the rules.
+"""
+
+from __future__ import annotations
+
+# Built-In Imports.
+import ast
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+# Local Imports.
+from app import metrics
+from app.cache import LRUCache
+
+# Rule ids match security_scanner.SECURITY_RULES["python"], whose messages
+# are reported.
+JAILBREAK_RULE: str = "python-jailbreak-imports"
+NETWORK_RULE: str = "python-network-access"
+DYNAMIC_EXECUTION_RULE: str = "python-dynamic-execution"
+
+FORBIDDEN_MODULES: Dict[str, str] = {
+    **dict.fromkeys(("os", "subprocess", "sys", "pty", "shlex", "commands"), JAILBREAK_RULE),
+    **dict.fromkeys(("socket", "requests", "urllib", "httplib", "ftp", "telnet", "xmlrpc"), NETWORK_RULE),
+}
+
+# Builtins that evaluate code or expose namespaces, flagged wherever they are
+# referenced (not just called), so ``run = eval; run(s)`` is caught too.
+FORBIDDEN_BUILTINS: Dict[str, str] = dict.fromkeys(
+    ("eval", "exec", "compile", "globals", "locals"), DYNAMIC_EXECUTION_RULE
+)
+
+# Names that only matter for escaping the sandbox. They are flagged as
+# names, attributes and string constants (``f.__globals__["__builtins__"]``).
+ESCAPE_NAMES: Tuple[str, ...] = ("__builtins__", "__import__")
+
+# The same builtins reached as attributes (``builtins.compile``) or imported
+# by name (``from builtins import exec as run``) are flagged on any receiver
+# except the module attributes in ALLOWED_ATTRIBUTES.
+FORBIDDEN_ATTRIBUTES: Dict[str, str] = FORBIDDEN_BUILTINS
+
+# Module -> attributes that share a forbidden name but are harmless. The
+# receiver must be a name bound only by ``import <module>``, so
+# ``import builtins as re; re.compile(...)`` is still flagged.
+ALLOWED_ATTRIBUTES: Dict[str, FrozenSet[str]] = {
+    "re": frozenset({"compile"}),
+    "regex": frozenset({"compile"}),
+}
+
+# (rule id, 1-based line number)
+Finding = Tuple[str, int]
+
+
+@dataclass(frozen=True)
+class PythonAnalysis:
+    """What a Python source defines and which rules it breaks.
+
+    Attributes:
+        parsed: False if the source is not valid Python; every other field
+            is then empty and callers fall back to text-based checks.
+        classes: Top-level class names, in source order.
+        methods: Method names per top-level class.
+        functions: Top-level function names, in source order.
+        imports: Top-level package of every module imported anywhere.
+        findings: Rule violations, ordered by line.
+    """
+
+    parsed: bool
+    classes: List[str] = field(default_factory=list)
+    methods: Dict[str, List[str]] = field(default_factory=dict)
+    functions: List[str] = field(default_factory=list)
+    imports: List[str] = field(default_factory=list)
+    findings: List[Finding] = field(default_factory=list)
+
+
+def _bound_names(tree: ast.AST) -> Dict[str, Set[str]]:
+    """Map every name bound in a module to what binds it.
+
+    Imports record the imported module; any other binding (assignment,
+    argument, ``def``, ``except ... as``, ``from ... import``) records "".
+    """
+    bindings: Dict[str, Set[str]] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    bindings.setdefault(alias.asname, set()).add(alias.name)
+                else:
+                    name = alias.name.split(".")[0]
+                    bindings.setdefault(name, set()).add(name)
+            continue
+        if isinstance(node, ast.ImportFrom):
+            names = [alias.asname or alias.name for alias in node.names]
+        elif isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+            names = [node.id]
+        elif isinstance(node, ast.arg):
+            names = [node.arg]
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names = [node.name]
+        elif isinstance(node, (ast.ExceptHandler, ast.MatchAs, ast.MatchStar)):
+            names = [node.name] if node.name else []
+        elif isinstance(node, ast.MatchMapping):
+            names = [node.rest] if node.rest else []
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            names = list(node.names)
+        else:
+            continue
+        for name in names:
+            bindings.setdefault(name, set()).add("")
+    return bindings
+
+
+def _allowed_receivers(tree: ast.AST) -> Dict[str, str]:
+    """Names that can only refer to a module listed in ALLOWED_ATTRIBUTES."""
+    allowed: Dict[str, str] = {}
+    for name, sources in _bound_names(tree).items():
+        if len(sources) == 1:
+            module = next(iter(sources))
+            if module in ALLOWED_ATTRIBUTES:
+                allowed[name] = module
+    return allowed
+
+
+class _FindingVisitor(ast.NodeVisitor):
+    """Collects imports and forbidden imports, names, attributes and calls."""
+
+    def __init__(self, allowed_receivers: Dict[str, str]) -> None:
+        self.findings: List[Finding] = []
+        self.imports: List[str] = []
+        self.allowed_receivers = allowed_receivers
+
+    def _is_allowed(self, module: str, attr: str) -> bool:
+        return attr in ALLOWED_ATTRIBUTES.get(module, frozenset())
+
+    def _flag(self, rule_id: str, node: ast.AST) -> None:
+        self.findings.append((rule_id, getattr(node, "lineno", 1)))
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.imports.append(alias.name.split(".")[0])
+            rule_id = FORBIDDEN_MODULES.get(alias.name.split(".")[0])
+            if rule_id:
+                self._flag(rule_id, node)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.level == 0 and node.module:
+            self.imports.append(node.module.split(".")[0])
+            rule_id = FORBIDDEN_MODULES.get(node.module.split(".")[0])
+            if rule_id:
+                self._flag(rule_id, node)
+        module = node.module if node.level == 0 and node.module else ""
+        for alias in node.names:
+            if alias.name in FORBIDDEN_ATTRIBUTES and not self._is_allowed(module, alias.name):
+                self._flag(FORBIDDEN_ATTRIBUTES[alias.name], node)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if node.id in ESCAPE_NAMES:
+            self._flag(JAILBREAK_RULE, node)
+        elif node.id in FORBIDDEN_BUILTINS:
+            self._flag(FORBIDDEN_BUILTINS[node.id], node)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if node.attr in ESCAPE_NAMES:
+            self._flag(JAILBREAK_RULE, node)
+        elif node.attr in FORBIDDEN_ATTRIBUTES and not (
+            isinstance(node.value, ast.Name)
+            and self._is_allowed(self.allowed_receivers.get(node.value.id, ""), node.attr)
+        ):
+            self._flag(FORBIDDEN_ATTRIBUTES[node.attr], node)
+        elif node.attr == "socket" and isinstance(node.value, ast.Name) and node.value.id == "socket":
+            self._flag(NETWORK_RULE, node)
+        self.generic_visit(node)
+
+    def visit_Constant(self, node: ast.Constant) -> None:
+        if isinstance(node.value, str) and any(name in node.value for name in ESCAPE_NAMES):
+            self._flag(JAILBREAK_RULE, node)
+
+
+def _analyze(code: str) -> PythonAnalysis:
+    """Parse and analyze a source (uncached)."""
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        # ValueError: source contains null bytes.
+        return PythonAnalysis(parsed=False)
+
+    classes: List[str] = []
+    methods: Dict[str, List[str]] = {}
+    functions: List[str] = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            classes.append(node.name)
+            methods[node.name] = [
+                item.name for item in node.body
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+            ]
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.append(node.name)
+
+    visitor = _FindingVisitor(_allowed_receivers(tree))
+    visitor.visit(tree)
+    return PythonAnalysis(
+        parsed=True,
+        classes=classes,
+        methods=methods,
+        functions=functions,
+        imports=list(dict.fromkeys(visitor.imports)),
+        findings=sorted(visitor.findings, key=lambda finding: finding[1]),
+    )
+
+
+# Analyses of recently seen sources; the same code is usually scanned and
+# AI-tested within seconds.
+_analysis_cache: LRUCache[str, PythonAnalysis] = LRUCache(maxsize=512)
+
+
+def analyze_python(code: str) -> PythonAnalysis:
+    """Return the (cached) analysis of a Python source.
+
+    Callers share the returned object and must not mutate it.
+    """
+    cache_key = hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+    cached = _analysis_cache.get(cache_key)
+    if cached is not None:
+        metrics.increment("source_analysis_cache_total", outcome="hit")
+        return cached
+    metrics.increment("source_analysis_cache_total", outcome="miss")
+
+    analysis = _analyze(code)
+    _analysis_cache.set(cache_key, analysis)
+    return analysis
@@ -0,0 +1,146 @@
+"""Pooled, time-bounded HTTP client for the Tavily search API.
+
+One keep-alive ``httpx.AsyncClient`` is shared by the whole process and
+closed by the app lifespan. Every request has explicit connect/read
+timeouts, is retried a bounded number of times with jittered exponential
+backoff on transport errors, 429 and 5xx, and is aborted once the response
+body exceeds a size limit. Latency is recorded in the ``tavily_request_seconds``
+histogram.
+
+Set ``TAVILY_BASE_URL`` (e.g. ``http://127.0.0.1:8765``) to point the client
+at a local stub server.
+"""
+
+from __future__ import annotations
+
+# Built-In Imports.
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, Optional
+
+# External Imports.
+import httpx
+
+# Local Imports.
+from app import metrics
+from app.config import settings
+
+# Statuses worth retrying: rate limiting and transient server errors.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+BACKOFF_BASE_SECONDS: float = 0.25
+BACKOFF_MAX_SECONDS: float = 4.0
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+class TavilyError(Exception):
+    """Raised when a Tavily request fails after all retries."""
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled Tavily client."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=settings.TAVILY_BASE_URL,
+            timeout=httpx.Timeout(settings.TAVILY_READ_TIMEOUT, connect=settings.TAVILY_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _client
+
+
+async def aclose() -> None:
+    """Close the pooled client (app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff delay for a retry attempt."""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+async def _post_once(path: str, payload: Dict[str, Any]) -> httpx.Response:
+    """Send one request, reading at most TAVILY_MAX_RESPONSE_BYTES of body."""
+    limit = settings.TAVILY_MAX_RESPONSE_BYTES
+    async with get_client().stream("POST", path, json=payload) as response:
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+            if len(body) > limit:
+                raise TavilyError(f"Tavily response exceeded {limit} bytes.")
+        # Keep status and headers; hand back the bounded body. aiter_bytes()
+        # has already decoded gzip/br, so drop the headers describing the
+        # encoded body or httpx would try to decode it again.
+        headers = response.headers.copy()
+        headers.pop("content-encoding", None)
+        headers.pop("content-length", None)
+        return httpx.Response(response.status_code, headers=headers, content=bytes(body))
+
+
+async def post(path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """POST to a Tavily endpoint and return the decoded JSON body.
+
+    Args:
+        path: Endpoint path, e.g. ``/search``.
+        payload: The JSON request body. ``api_key`` is added from settings.
+
+    Returns:
+        The parsed JSON response.
+
+    Raises:
+        TavilyError: If the key is missing, the response is too large or not
+            JSON, or the request still fails after TAVILY_MAX_RETRIES retries.
+    """
+    if not settings.TAVILY_API_KEY:
+        raise TavilyError("TAVILY_API_KEY is not set.")
+    payload = {"api_key": settings.TAVILY_API_KEY, **payload}
+
+    for attempt in range(settings.TAVILY_MAX_RETRIES + 1):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await _post_once(path, payload)
+            outcome = str(response.status_code)
+        except httpx.TransportError as e:
+            # Covers connect/read timeouts and dropped connections.
+            error: Exception = e
+            outcome = "timeout" if isinstance(e, httpx.TimeoutException) else "error"
+            response = None
+        finally:
+            metrics.observe("tavily_request_seconds", time.perf_counter() - started, endpoint=path)
+            metrics.increment("tavily_requests_total", endpoint=path, outcome=outcome)
+
+        if response is not None:
+            if response.status_code not in RETRY_STATUSES:
+                break
+            error = TavilyError(f"Tavily returned HTTP {response.status_code}.")
+        if attempt < settings.TAVILY_MAX_RETRIES:
+            await asyncio.sleep(_backoff(attempt))
+    else:
+        raise TavilyError(f"Tavily request to {path} failed: {type(error).__name__}: {error!s}") from error
+
+    if response.is_error:
+        raise TavilyError(f"Tavily returned HTTP {response.status_code}: {response.text[:200]}")
+    try:
+        return response.json()
+    except json.JSONDecodeError as e:
+        raise TavilyError("Tavily returned a non-JSON response.") from e
+
+
+async def search(query: str, **options: Any) -> Dict[str, Any]:
+    """Run a Tavily search.
+
+    Args:
+        query: The search query.
+        **options: Extra Tavily search parameters (``search_depth``,
+            ``include_raw_content``, ...).
+
+    Returns:
+        The Tavily search response (``results`` etc.).
+    """
+    return await post("/search", {"query": query, **options})
@@ -0,0 +1,64 @@
+"""Single-flight coalescing of identical in-flight async calls.
+
+When several requests ask for the same expensive result at the same time
+(e.g. a whole class running the same DSA search), only the first one calls
+upstream; the rest wait for and share its result. Nothing is cached once the
+call finishes — combine with a cache for that.
+"""
+
+# Built-In Imports.
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+# Local Imports.
+from app import metrics
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Coalesces concurrent calls that share a key into one upstream call.
+
+    The upstream call runs in its own task, so a caller that is cancelled
+    (e.g. the client disconnected) doesn't cancel it for the others. Every
+    caller receives the same result object, so callers must not mutate it.
+    Not thread-safe; intended for use from a single asyncio event loop.
+
+    Attributes:
+        name: Group name used as the metrics label.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._inflight: Dict[Hashable, "asyncio.Task[T]"] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return ``fn()``'s result, sharing it with concurrent callers of ``key``.
+
+        Args:
+            key: Identifies identical requests; normalize it before calling.
+            fn: Starts the upstream call. Only invoked if no call is in flight.
+
+        Returns:
+            The result of the (possibly shared) call. Exceptions are raised to
+            every waiting caller.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            metrics.increment("singleflight_calls_total", group=self.name, role="leader")
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            metrics.increment("singleflight_calls_total", group=self.name, role="coalesced")
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: "asyncio.Task[T]") -> None:
+        """Forget a finished call so the next request starts a fresh one."""
+        self._inflight.pop(key, None)
+        # Mark the exception as retrieved in case every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1,117 @@
+"""Micro-benchmark: commit+refresh versus INSERT ... RETURNING per write.
+
+Times the two ways the create routes can persist a row and read back its
+server defaults:
+
+    * ``legacy``: ``add()`` + ``commit()`` + ``refresh()`` (INSERT, COMMIT, SELECT)
+    * ``returning``: ``insert_returning()`` + ``commit()`` (INSERT ... RETURNING, COMMIT)
+
+Each iteration inserts one saved flash card for a dedicated bench user and
+the rows are deleted afterwards. Run it against the same (ideally remote,
+SSL) Postgres the API uses to see the real round-trip cost.
+
+Usage (from the ``backend`` directory):
+    python -m benchmarks.bench_insert_returning --writes 500
+"""
+
+# Built-In Imports.
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+# External Imports.
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Local Imports.
+from app.database import async_session, engine, insert_returning
+from app.models import SavedFlashCard, User
+
+BENCH_EMAIL: str = "bench-insert-returning@bench.local"
+
+
+async def _legacy_write(db: AsyncSession, user_id: int) -> SavedFlashCard:
+    """Persist a card the way the routes used to."""
+    card = SavedFlashCard(user_id=user_id, front="front", back="back")
+    db.add(card)
+    await db.commit()
+    await db.refresh(card)
+    return card
+
+
+async def _returning_write(db: AsyncSession, user_id: int) -> SavedFlashCard:
+    """Persist a card with the shared RETURNING helper."""
+    card = await insert_returning(db, SavedFlashCard, user_id=user_id, front="front", back="back")
+    await db.commit()
+    return card
+
+
+async def _time_writes(
+    write: Callable[[AsyncSession, int], Awaitable[SavedFlashCard]],
+    user_id: int,
+    writes: int,
+) -> List[float]:
+    """Return per-write latencies in milliseconds."""
+    latencies: List[float] = []
+    async with async_session() as db:
+        for _ in range(writes):
+            start = time.perf_counter()
+            card = await write(db, user_id)
+            assert card.created_at is not None
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _summary(latencies: List[float]) -> str:
+    """Format mean / p50 / p95 for one series."""
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return (
+        f"mean {statistics.fmean(ordered):7.3f} ms  "
+        f"p50 {statistics.median(ordered):7.3f} ms  p95 {p95:7.3f} ms"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Warm up the pool, time both strategies, and clean up."""
+    # The app engine echoes every statement; keep logging out of the timings.
+    engine.echo = False
+
+    async with async_session() as db:
+        user = (await db.execute(select(User).where(User.email == BENCH_EMAIL))).scalar_one_or_none()
+        if user is None:
+            user = await insert_returning(db, User, email=BENCH_EMAIL, hashed_password="x")
+            await db.commit()
+        user_id = user.id
+
+    try:
+        # Warm-up: open pooled connections and prime prepared statements.
+        await _time_writes(_legacy_write, user_id, 10)
+        await _time_writes(_returning_write, user_id, 10)
+
+        legacy = await _time_writes(_legacy_write, user_id, args.writes)
+        returning = await _time_writes(_returning_write, user_id, args.writes)
+    finally:
+        async with async_session() as db:
+            await db.execute(delete(SavedFlashCard).where(SavedFlashCard.user_id == user_id))
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await engine.dispose()
+
+    saved = statistics.fmean(legacy) - statistics.fmean(returning)
+    print(f"legacy    (commit + refresh): {_summary(legacy)}")
+    print(f"returning (INSERT RETURNING): {_summary(returning)}")
+    print(f"saved per write: {saved:.3f} ms ({saved / statistics.fmean(legacy):.1%})")
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse the benchmark command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=500, help="Timed writes per strategy.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(_parse_args()))
@@ -0,0 +1,227 @@
+"""Benchmark the per-user route queries with and without composite indexes.
+
+Seeds synthetic users, notes, attempts and saved flash cards at realistic
+volumes, then records ``EXPLAIN ANALYZE`` timings for every hot route query
+twice: once with the composite ``user_id`` indexes dropped and once with them
+rebuilt from the model definitions.
+
+The script drops and recreates indexes, so point it at a scratch database.
+
+Usage (from the ``backend`` directory):
+    python -m benchmarks.bench_route_queries --users 200 --attempts-per-user 400
+"""
+
+# Built-In Imports.
+import argparse
+import asyncio
+import json
+import statistics
+from typing import Any, Dict, List, Tuple
+
+# External Imports.
+from sqlalchemy import Index, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+# Local Imports.
+from app.config import settings
+from app.database import Base
+from app.models import Note, ProblemAttempt, SavedFlashCard
+
+EMAIL_DOMAIN: str = "bench.local"
+
+# The same statements the routes issue, keyed by route handler name.
+ROUTE_QUERIES: Dict[str, str] = {
+    "list_notes": (
+        "SELECT * FROM notes WHERE user_id = {user_id} ORDER BY updated_at DESC"
+    ),
+    "list_attempts": (
+        "SELECT * FROM problem_attempts WHERE user_id = {user_id} "
+        "ORDER BY created_at DESC"
+    ),
+    "get_personalized_flash_cards": (
+        "SELECT * FROM problem_attempts WHERE user_id = {user_id} "
+        "ORDER BY passed ASC, created_at DESC LIMIT 10"
+    ),
+    "get_saved_flash_cards": (
+        "SELECT * FROM saved_flashcards WHERE user_id = {user_id} "
+        "ORDER BY created_at DESC"
+    ),
+}
+
+SEED_STATEMENTS: List[str] = [
+    """
+    INSERT INTO users (email, hashed_password)
+    SELECT 'bench-' || u || '@{domain}', 'x'
+    FROM generate_series(1, :users) AS u
+    """,
+    """
+    INSERT INTO notes (title, content, user_id, created_at, updated_at)
+    SELECT
+        'Note ' || n,
+        jsonb_build_array(
+            jsonb_build_object('type', 'heading', 'content', jsonb_build_array(
+                jsonb_build_object('type', 'text', 'text', 'Note ' || n, 'styles', '{{}}'::jsonb))),
+            jsonb_build_object('type', 'paragraph', 'content', jsonb_build_array(
+                jsonb_build_object('type', 'text', 'text', repeat('lorem ipsum ', 40), 'styles', '{{}}'::jsonb)))
+        ),
+        usr.id,
+        now() - random() * interval '180 days',
+        now() - random() * interval '30 days'
+    FROM users usr, generate_series(1, :notes) AS n
+    WHERE usr.email LIKE 'bench-%@{domain}'
+    """,
+    """
+    INSERT INTO problem_attempts
+        (problem_title, problem_url, difficulty, code, language, stdout, stderr,
+         exit_code, test_results, passed, user_id, created_at)
+    SELECT
+        'Problem ' || (a % 300),
+        'https://leetcode.com/problems/problem-' || (a % 300),
+        (ARRAY['Easy', 'Medium', 'Hard'])[1 + a % 3],
+        repeat('def solve(nums):\\n    return sum(nums)\\n', 12),
+        'python',
+        '42',
+        CASE WHEN a % 3 = 0 THEN 'Traceback (most recent call last): ...' END,
+        CASE WHEN a % 3 = 0 THEN 1 ELSE 0 END,
+        '[]'::jsonb,
+        a % 3 <> 0,
+        usr.id,
+        now() - random() * interval '180 days'
+    FROM users usr, generate_series(1, :attempts) AS a
+    WHERE usr.email LIKE 'bench-%@{domain}'
+    """,
+    """
+    INSERT INTO saved_flashcards (front, back, problem_context, user_id, created_at)
+    SELECT
+        'What is the invariant in problem ' || c || '?',
+        repeat('Keep a running prefix sum. ', 8),
+        'Problem ' || c,
+        usr.id,
+        now() - random() * interval '180 days'
+    FROM users usr, generate_series(1, :cards) AS c
+    WHERE usr.email LIKE 'bench-%@{domain}'
+    """,
+]
+
+CLEANUP_STATEMENTS: List[str] = [
+    f"DELETE FROM {table} WHERE user_id IN "
+    "(SELECT id FROM users WHERE email LIKE 'bench-%@{domain}')"
+    for table in ("notes", "problem_attempts", "saved_flashcards")
+] + ["DELETE FROM users WHERE email LIKE 'bench-%@{domain}'"]
+
+
+def _composite_indexes() -> List[Index]:
+    """Return the composite user_id indexes declared on the models."""
+    return [
+        index
+        for model in (Note, ProblemAttempt, SavedFlashCard)
+        for index in model.__table__.indexes
+        if len(index.expressions) > 1
+    ]
+
+
+async def _seed(conn: AsyncConnection, args: argparse.Namespace) -> None:
+    """Insert the synthetic dataset for the bench users."""
+    params = {
+        "users": args.users,
+        "notes": args.notes_per_user,
+        "attempts": args.attempts_per_user,
+        "cards": args.cards_per_user,
+    }
+    for statement in SEED_STATEMENTS:
+        await conn.execute(text(statement.format(domain=EMAIL_DOMAIN)), params)
+
+
+async def _cleanup(conn: AsyncConnection) -> None:
+    """Remove every row created by the benchmark."""
+    for statement in CLEANUP_STATEMENTS:
+        await conn.execute(text(statement.format(domain=EMAIL_DOMAIN)))
+
+
+async def _explain(
+    conn: AsyncConnection, sql: str, runs: int
+) -> Tuple[float, str]:
+    """Run EXPLAIN ANALYZE several times.
+
+    Returns:
+        A tuple (median execution time in ms, top-level scan node type).
+    """
+    timings: List[float] = []
+    node_type = ""
+    for _ in range(runs):
+        result = await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"))
+        raw: Any = result.scalar_one()
+        plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+        timings.append(plan["Execution Time"])
+        node = plan["Plan"]
+        while node.get("Plans") and node["Node Type"] in ("Limit", "Sort"):
+            node = node["Plans"][0]
+        node_type = node["Node Type"]
+    return statistics.median(timings), node_type
+
+
+async def _measure(
+    conn: AsyncConnection, user_id: int, runs: int
+) -> Dict[str, Tuple[float, str]]:
+    """EXPLAIN ANALYZE every route query for one user."""
+    await conn.execute(text("ANALYZE notes, problem_attempts, saved_flashcards"))
+    return {
+        name: await _explain(conn, sql.format(user_id=user_id), runs)
+        for name, sql in ROUTE_QUERIES.items()
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Seed, measure without and with the indexes, and print a report."""
+    engine = create_async_engine(args.database_url or settings.DATABASE_URL)
+    indexes = _composite_indexes()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await _cleanup(conn)
+        await _seed(conn, args)
+
+    async with engine.begin() as conn:
+        user_id = (
+            await conn.execute(
+                text("SELECT id FROM users WHERE email = :email"),
+                {"email": f"bench-{args.users // 2 or 1}@{EMAIL_DOMAIN}"},
+            )
+        ).scalar_one()
+
+        for index in indexes:
+            await conn.run_sync(lambda sync_conn, i=index: i.drop(sync_conn, checkfirst=True))
+        before = await _measure(conn, user_id, args.runs)
+
+        for index in indexes:
+            await conn.run_sync(lambda sync_conn, i=index: i.create(sync_conn, checkfirst=True))
+        after = await _measure(conn, user_id, args.runs)
+
+    if not args.keep_data:
+        async with engine.begin() as conn:
+            await _cleanup(conn)
+    await engine.dispose()
+
+    header = f"{'query':<32}{'before ms':>12}{'after ms':>12}  plan (before -> after)"
+    print(header)
+    print("-" * len(header))
+    for name in ROUTE_QUERIES:
+        (before_ms, before_node), (after_ms, after_node) = before[name], after[name]
+        print(f"{name:<32}{before_ms:>12.3f}{after_ms:>12.3f}  {before_node} -> {after_node}")
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse the benchmark command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="", help="Defaults to settings.DATABASE_URL.")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--notes-per-user", type=int, default=50)
+    parser.add_argument("--attempts-per-user", type=int, default=400)
+    parser.add_argument("--cards-per-user", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=5, help="EXPLAIN ANALYZE runs per query.")
+    parser.add_argument("--keep-data", action="store_true", help="Do not delete seeded rows.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(_parse_args()))
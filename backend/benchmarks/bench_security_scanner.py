@@ -0,0 +1,152 @@
+"""Benchmark the security scanner on large sources.
+
+Compares the original per-line, per-rule ``re.search`` loop with the
+single-pass combined pattern in ``check_security_rules`` on synthetic
+sources that are clean (the common case, scanned to the end) or violate a
+rule on the last line. Both scanners are checked to report the same result.
+The current scanner (single pass for C++ and Go, the parsed syntax tree for
+Python) is timed with its caches cleared before every scan, and separately
+on cache hits.
+
+Usage (from the ``backend`` directory):
+    python -m benchmarks.bench_security_scanner --lines 10000 --repeat 20
+"""
+
+# Built-In Imports.
+import argparse
+import json
+import re
+import statistics
+import time
+from typing import Callable, Dict, List, Optional
+
+# External Imports.
+from fastapi import HTTPException
+
+# Local Imports.
+from app.services import security_scanner, source_analysis
+from app.services.security_scanner import SECURITY_RULES, check_security_rules
+
+# Representative lines per language; none of them trips a rule.
+CLEAN_LINES: Dict[str, List[str]] = {
+    "python": [
+        "class Solution:",
+        "    def two_sum(self, nums: List[int], target: int) -> List[int]:",
+        "        seen = {}  # value -> index",
+        "        for i, num in enumerate(nums):",
+        "            if target - num in seen:",
+        "                return [seen[target - num], i]",
+        "            seen[num] = i",
+        "        return []",
+    ],
+    "cpp": [
+        "#include <vector>",
+        "int solve(std::vector<int>& nums, int target) {",
+        "    std::unordered_map<int, int> seen;",
+        "    for (int i = 0; i < (int)nums.size(); ++i) {",
+        "        if (seen.count(target - nums[i])) return i;",
+        "        seen[nums[i]] = i;",
+        "    }",
+        "    return -1;",
+        "}",
+    ],
+    "go": [
+        "import \"fmt\"",
+        "func twoSum(nums []int, target int) []int {",
+        "    seen := map[int]int{}",
+        "    for i, n := range nums {",
+        "        if j, ok := seen[target-n]; ok { return []int{j, i} }",
+        "        seen[n] = i",
+        "    }",
+        "    return nil",
+        "}",
+    ],
+}
+
+VIOLATIONS: Dict[str, str] = {
+    "python": "eval(input())",
+    "cpp": "system(\"ls\");",
+    "go": "exec.Command(\"ls\")",
+}
+
+
+def legacy_check_security_rules(code: str, language: str) -> None:
+    """The scanner as it was before rules were precompiled: per line, per rule."""
+    lang = {"c": "cpp", "c++": "cpp", "golang": "go"}.get(language.lower(), language.lower())
+    for line_num, line in enumerate(code.splitlines(), start=1):
+        for rule in SECURITY_RULES.get(lang, []):
+            if re.search(rule["pattern"], line):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Security Violation: {rule['message']} (Line {line_num})"
+                )
+
+
+def uncached_check_security_rules(code: str, language: str) -> None:
+    """The current scanner with its result and analysis caches cleared first."""
+    security_scanner._scan_cache.clear()
+    source_analysis._analysis_cache.clear()
+    check_security_rules(code, language)
+
+
+def build_source(language: str, lines: int, violating: bool) -> str:
+    """Build a source of ``lines`` lines, optionally ending in a violation."""
+    body = CLEAN_LINES[language]
+    source = [body[i % len(body)] for i in range(lines)]
+    if violating:
+        source[-1] = VIOLATIONS[language]
+    return "\n".join(source)
+
+
+def run_scanner(scanner: Callable[[str, str], None], code: str, language: str) -> Optional[str]:
+    """Run a scanner and return its violation detail, if any."""
+    try:
+        scanner(code, language)
+    except HTTPException as e:
+        return e.detail
+    return None
+
+
+def time_scanner(scanner: Callable[[str, str], None], code: str, language: str, repeat: int) -> float:
+    """Return the median milliseconds per scan."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run_scanner(scanner, code, language)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=10_000, help="Lines per synthetic source.")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed scans per case.")
+    args = parser.parse_args()
+
+    report = []
+    for language in CLEAN_LINES:
+        for violating in (False, True):
+            code = build_source(language, args.lines, violating)
+            legacy = run_scanner(legacy_check_security_rules, code, language)
+            current = run_scanner(uncached_check_security_rules, code, language)
+            if legacy != current:
+                raise SystemExit(f"Mismatch for {language}: {legacy!r} != {current!r}")
+
+            legacy_ms = time_scanner(legacy_check_security_rules, code, language, args.repeat)
+            current_ms = time_scanner(uncached_check_security_rules, code, language, args.repeat)
+            cached_ms = time_scanner(check_security_rules, code, language, args.repeat)
+            report.append({
+                "language": language,
+                "source": "violation on last line" if violating else "clean",
+                "lines": args.lines,
+                "legacy_ms": round(legacy_ms, 3),
+                "single_pass_ms": round(current_ms, 3),
+                "speedup": round(legacy_ms / current_ms, 1) if current_ms else None,
+                "cache_hit_ms": round(cached_ms, 3),
+            })
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -23,9 +23,12 @@ from app.routes import (
     notes,
     attempts,
     flash_cards,
+    search,
+    metrics_routes,
 )
 from app.config import settings
 from app.limiter import limiter
+from app.services import attempt_writer, dsa_catalog, flash_card_service, llm, note_ingestion, tavily_client
 from slowapi.errors import RateLimitExceeded
 from slowapi import _rate_limit_exceeded_handler
 
@@ -37,8 +40,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     On startup:
         - Establishes a connection to the database.
         - Synchronizes SQLAlchemy metadata to create tables if they do not exist.
+        - Loads the DSA problem catalog into memory and starts its
+          periodic refresh.
+        - Starts the sweep that resumes problem ingestions left pending by
+          a stopped worker.
 
     On shutdown:
+        - Flushes attempts still queued by the judging endpoints.
+        - Stops the DSA catalog refresh.
+        - Cancels running problem ingestions (released for another worker) and
+          flash card updates (retried on next view).
+        - Closes the shared LLM and Tavily HTTP connection pools.
         - Disposes of the database engine and closes connection pools.
 
     Args:
@@ -47,10 +59,19 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # This runs on startup
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    await dsa_catalog.refresh()
+    dsa_catalog.start_refresher()
+    note_ingestion.start_sweeper()
 
     yield
 
     # This runs on shutdown
+    await attempt_writer.shutdown()
+    await dsa_catalog.shutdown()
+    await note_ingestion.shutdown()
+    await flash_card_service.shutdown()
+    await llm.aclose()
+    await tavily_client.aclose()
     await engine.dispose()
 
 
@@ -79,6 +100,8 @@ app.include_router(dsa_search_routes.router)
 app.include_router(notes.router, prefix="/api")
 app.include_router(attempts.router, prefix="/api")
 app.include_router(flash_cards.router, prefix="/api")
+app.include_router(search.router, prefix="/api")
+app.include_router(metrics_routes.router)
 
 
 @app.get("/")
@@ -0,0 +1,100 @@
+"""Tests for resuming problem ingestion after the worker that owned it died.
+
+The database is replaced by an in-memory note so the merge rules of
+``note_ingestion._save`` can be checked without Postgres.
+"""
+
+# Built-In Imports.
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+# Local Imports.
+from app.services import note_ingestion
+from app.services.problem_ingestion import header_blocks
+
+URL = "https://leetcode.com/problems/two-sum/"
+TITLE = "Two Sum"
+BODY = [{"type": "paragraph", "content": [{"type": "text", "text": "Given an array...", "styles": {}}]}]
+USER_EDIT = {"type": "paragraph", "content": [{"type": "text", "text": "my notes", "styles": {}}]}
+
+
+class FakeSession:
+    """Just enough of AsyncSession for resume_pending and _save."""
+
+    def __init__(self, note: SimpleNamespace) -> None:
+        self.note = note
+        self.loaded = False
+
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    async def execute(self, statement: Any) -> Any:
+        # The claiming UPDATE ... RETURNING of resume_pending.
+        row = SimpleNamespace(
+            id=self.note.id,
+            ingestion_base_version=self.note.ingestion_base_version,
+            ingestion_url=URL,
+            title=TITLE,
+        )
+        return SimpleNamespace(all=lambda: [row] if self.note.ingestion_status == "pending" else [])
+
+    async def get(self, model: Any, note_id: int) -> SimpleNamespace:
+        self.loaded = True
+        return self.note
+
+    async def commit(self) -> None:
+        # Only ORM flushes bump version_id_col; the claiming UPDATE does not.
+        if self.loaded:
+            self.note.version += 1
+
+    async def rollback(self) -> None:
+        return None
+
+
+def _pending_note(content: List[Dict[str, Any]], version: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=1,
+        content=content,
+        version=version,
+        ingestion_status="pending",
+        ingestion_base_version=note_ingestion.PLACEHOLDER_VERSION,
+    )
+
+
+def _resume(note: SimpleNamespace, monkeypatch: Any) -> None:
+    async def fetch_problem_details(url: str, title: str, refresh: bool = False) -> List[Dict[str, Any]]:
+        return [*header_blocks(url, title), *BODY]
+
+    monkeypatch.setattr(note_ingestion, "async_session", lambda: FakeSession(note))
+    monkeypatch.setattr(note_ingestion, "fetch_problem_details", fetch_problem_details)
+
+    async def run() -> None:
+        assert await note_ingestion.resume_pending() == 1
+        await asyncio.gather(*note_ingestion._tasks)
+
+    asyncio.run(run())
+
+
+def test_resume_keeps_edits_made_before_the_worker_died(monkeypatch: Any) -> None:
+    placeholder = note_ingestion.placeholder_blocks(URL, TITLE, "Fetching problem details...")
+    # The user edited the placeholder (version 1 -> 2), then the worker died.
+    note = _pending_note([*placeholder, USER_EDIT], version=note_ingestion.PLACEHOLDER_VERSION + 1)
+
+    _resume(note, monkeypatch)
+
+    assert note.ingestion_status == "complete"
+    assert note.content == [*placeholder, USER_EDIT, *BODY]
+
+
+def test_resume_replaces_an_untouched_placeholder(monkeypatch: Any) -> None:
+    placeholder = note_ingestion.placeholder_blocks(URL, TITLE, "Fetching problem details...")
+    note = _pending_note(placeholder, version=note_ingestion.PLACEHOLDER_VERSION)
+
+    _resume(note, monkeypatch)
+
+    assert note.ingestion_status == "complete"
+    assert note.content == [*header_blocks(URL, TITLE), *BODY]
@@ -0,0 +1,52 @@
+"""Regression tests for the Python security scan.
+
+Run from the ``backend`` directory: ``python -m pytest tests``.
+"""
+
+# External Imports.
+import pytest
+
+# Local Imports.
+from app.services.security_scanner import _scan, compile_rules, find_violation
+
+# Sources that reach compile/globals/locals/eval/exec without a bare call.
+BYPASSES = [
+    'import builtins, types; types.FunctionType(builtins.compile("im"+"port o"+"s; ...", "", "exec"), {})()',
+    "import builtins\nbuiltins.globals()",
+    "x = object()\nx.locals()",
+    "import builtins\nbuiltins.eval('1')",
+    "import builtins\nbuiltins.exec('1')",
+    "import builtins as re\nre.compile('1', '', 'eval')",
+    "import re\nimport builtins\nre = builtins\nre.compile('1', '', 'eval')",
+]
+
+ALLOWED = [
+    "import re\npattern = re.compile(r'\\d+')",
+    "import regex\npattern = regex.compile('a+')",
+    "# eval(input()) in a comment\nprint('exec(x)')",
+]
+
+
+@pytest.mark.parametrize("code", BYPASSES)
+def test_syntax_tree_scan_rejects_dynamic_execution(code: str) -> None:
+    violation = find_violation(code, "python")
+    assert violation is not None
+    assert violation[0]["id"] == "python-dynamic-execution"
+
+
+@pytest.mark.parametrize("code", BYPASSES)
+def test_text_scan_rejects_dynamic_execution(code: str) -> None:
+    violation = _scan(code, compile_rules("python"))
+    assert violation is not None
+    assert violation[0]["id"] == "python-dynamic-execution"
+
+
+def test_imported_builtin_alias_is_rejected() -> None:
+    violation = find_violation("from builtins import compile as c\nc('1', '', 'eval')", "python")
+    assert violation is not None
+    assert violation[0]["id"] == "python-dynamic-execution"
+
+
+@pytest.mark.parametrize("code", ALLOWED)
+def test_allowed_sources_pass(code: str) -> None:
+    assert find_violation(code, "python") is None
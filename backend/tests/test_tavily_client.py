@@ -0,0 +1,114 @@
+"""Tests for the Tavily client against a stub server.
+
+``TAVILY_BASE_URL`` points at a fake host served by ``httpx.MockTransport``,
+so no request leaves the process.
+"""
+
+# Built-In Imports.
+import asyncio
+import gzip
+import json
+from typing import Any, Callable, List, Tuple
+
+# External Imports.
+import httpx
+import pytest
+
+# Local Imports.
+from app.config import settings
+from app.services import tavily_client
+from app.services.tavily_client import TavilyError
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+STUB_URL = "http://tavily.stub"
+RESULTS = {"results": [{"title": "Two Sum", "url": "https://leetcode.com/problems/two-sum/"}]}
+
+
+@pytest.fixture
+def jitter(monkeypatch: pytest.MonkeyPatch) -> List[Tuple[float, float]]:
+    """Record each backoff's jitter range instead of waiting between retries."""
+    ranges: List[Tuple[float, float]] = []
+    monkeypatch.setattr(tavily_client.random, "uniform", lambda low, high: ranges.append((low, high)) or 0.0)
+    return ranges
+
+
+@pytest.fixture
+def stub(monkeypatch: pytest.MonkeyPatch, jitter: List[Tuple[float, float]]) -> Callable[[Handler], List[httpx.Request]]:
+    """Serve Tavily from a handler; returns the list of requests it received."""
+    monkeypatch.setattr(settings, "TAVILY_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "TAVILY_BASE_URL", STUB_URL)
+    monkeypatch.setattr(settings, "TAVILY_MAX_RETRIES", 2)
+
+    def serve(handler: Handler) -> List[httpx.Request]:
+        requests: List[httpx.Request] = []
+
+        def record(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return handler(request)
+
+        monkeypatch.setattr(
+            tavily_client,
+            "_client",
+            httpx.AsyncClient(base_url=settings.TAVILY_BASE_URL, transport=httpx.MockTransport(record)),
+        )
+        return requests
+
+    return serve
+
+
+def _search() -> Any:
+    return asyncio.run(tavily_client.search("two sum"))
+
+
+def test_retries_5xx_with_jittered_backoff(stub: Any, jitter: List[Tuple[float, float]]) -> None:
+    statuses = iter([503, 502])
+    requests = stub(lambda request: httpx.Response(next(statuses, 200), json=RESULTS))
+
+    assert _search() == RESULTS
+    assert len(requests) == 3
+    assert all(str(request.url) == f"{STUB_URL}/search" for request in requests)
+    assert json.loads(requests[0].content) == {"api_key": "test-key", "query": "two sum"}
+    # Full jitter: uniform over [0, base * 2**attempt].
+    assert jitter == [(0, tavily_client.BACKOFF_BASE_SECONDS), (0, tavily_client.BACKOFF_BASE_SECONDS * 2)]
+
+
+def test_gives_up_after_max_retries(stub: Any) -> None:
+    requests = stub(lambda request: httpx.Response(503))
+
+    with pytest.raises(TavilyError, match="HTTP 503"):
+        _search()
+    assert len(requests) == settings.TAVILY_MAX_RETRIES + 1
+
+
+def test_client_errors_are_not_retried(stub: Any) -> None:
+    requests = stub(lambda request: httpx.Response(401, json={"detail": "bad key"}))
+
+    with pytest.raises(TavilyError, match="HTTP 401"):
+        _search()
+    assert len(requests) == 1
+
+
+def test_response_size_limit(stub: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "TAVILY_MAX_RESPONSE_BYTES", 1000)
+    stub(lambda request: httpx.Response(200, json={"results": ["x" * 2000]}))
+
+    with pytest.raises(TavilyError, match="exceeded 1000 bytes"):
+        _search()
+
+
+def test_size_limit_applies_to_the_decoded_body(stub: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "TAVILY_MAX_RESPONSE_BYTES", 1000)
+    body = gzip.compress(json.dumps({"results": ["x" * 100_000]}).encode())
+    assert len(body) < 1000
+    stub(lambda request: httpx.Response(200, headers={"Content-Encoding": "gzip"}, content=body))
+
+    with pytest.raises(TavilyError, match="exceeded 1000 bytes"):
+        _search()
+
+
+def test_compressed_body_is_decoded_once(stub: Any) -> None:
+    body = gzip.compress(json.dumps(RESULTS).encode())
+    stub(lambda request: httpx.Response(200, headers={"Content-Encoding": "gzip"}, content=body))
+
+    assert _search() == RESULTS